@@ -1,8 +1,14 @@
-
 import numpy as np
+from scipy.fft import rfft, irfft, rfftfreq, next_fast_len
+from scipy.signal import sosfreqz
 
 from gmprocess.config import get_config
-from gmprocess.filtering import lowpass_filter_trace, highpass_filter_trace
+from gmprocess.filtering import butter_sos
+
+# Number of periods of the highpass corner by which the record is zero padded
+# in the frequency domain, so that the response of the filters and the
+# integrations does not wrap around onto the record.
+PAD_PERIODS = 10
 
 
 def adjust_highpass_corner(st, step_factor=1.5, maximum_freq=0.5,
@@ -23,6 +29,13 @@ def adjust_highpass_corner(st, step_factor=1.5, maximum_freq=0.5,
     corner is increased the multiplicative step factor until the criteria
     are met.
 
+    The trial corners are evaluated in the frequency domain: the lowpass
+    filtered record is computed once, and for every trial corner only the
+    highpass response and the (trapezoidal) double integration are applied
+    to its spectrum. The record is zero padded by PAD_PERIODS periods of the
+    trial corner, so that the result matches filtering and integrating in
+    the time domain.
+
     Args:
         st (StationStream):
             Stream of data.
@@ -40,6 +53,9 @@ def adjust_highpass_corner(st, step_factor=1.5, maximum_freq=0.5,
         StationStream.
 
     """
+    # Need to find the high/low pass filtering steps in the config
+    # to ensure that filtering here is done with the same options
+    hp_args, lp_args = _get_filter_args()
 
     for tr in st:
         if not tr.hasParameter('corner_frequencies'):
@@ -48,8 +64,16 @@ def adjust_highpass_corner(st, step_factor=1.5, maximum_freq=0.5,
         else:
             initial_corners = tr.getParameter('corner_frequencies')
             f_hp = initial_corners['highpass']
-            ok = __disp_checks(tr, max_final_displacement,
-                               max_displacment_ratio)
+            try:
+                spec = _DisplacementSpectrum(
+                    tr, initial_corners['lowpass'], **lp_args)
+                ok = _disp_checks(spec, f_hp, hp_args,
+                                  max_final_displacement,
+                                  max_displacment_ratio)
+            except ValueError as e:
+                tr.fail("adjust_highpass_corner failed with exception: %s"
+                        % e)
+                continue
             while not ok:
                 f_hp = step_factor * f_hp
                 if f_hp > maximum_freq:
@@ -58,16 +82,18 @@ def adjust_highpass_corner(st, step_factor=1.5, maximum_freq=0.5,
                     break
                 initial_corners['highpass'] = f_hp
                 tr.setParameter('corner_frequencies', initial_corners)
-                ok = __disp_checks(tr, max_final_displacement,
-                                   max_displacment_ratio)
+                ok = _disp_checks(spec, f_hp, hp_args,
+                                  max_final_displacement,
+                                  max_displacment_ratio)
     return st
 
 
-def __disp_checks(tr,
-                  max_final_displacement=0.025,
-                  max_displacment_ratio=0.2):
-    # Need to find the high/low pass filtering steps in the config
-    # to ensure that filtering here is done with the same options
+def _get_filter_args():
+    """Get the highpass and lowpass filter options from the config.
+
+    Returns:
+        tuple: Dictionaries of highpass and lowpass filter arguments.
+    """
     config = get_config()
     processing_steps = config['processing']
     ps_names = [list(ps.keys())[0] for ps in processing_steps]
@@ -75,23 +101,176 @@ def __disp_checks(tr,
     hp_args = processing_steps[ind]['highpass_filter']
     ind = int(np.where(np.array(ps_names) == 'lowpass_filter')[0][0])
     lp_args = processing_steps[ind]['lowpass_filter']
+    return hp_args, lp_args
+
+
+def _butter_response(freqs, corner, sampling_rate, btype, filter_order=5):
+    """Frequency response of the Butterworth filters in gmprocess.filtering.
+
+    The filter design is shared with the time domain filtering steps, so
+    that this response matches them.
+
+    Args:
+        freqs (ndarray):
+            Frequencies (Hz) at which to evaluate the response.
+        corner (float):
+            Corner frequency (Hz).
+        sampling_rate (float):
+            Sampling rate (Hz).
+        btype (str):
+            Either 'highpass' or 'lowpass'.
+        filter_order (int):
+            Filter order.
+
+    Returns:
+        ndarray: Complex frequency response of a single (causal) pass.
+    """
+    sos = butter_sos(filter_order, corner, sampling_rate, btype)
+    _, h = sosfreqz(sos, worN=freqs, fs=sampling_rate)
+    return h
+
+
+def _apply_filter(spectrum, response, npts, nfft, number_of_passes=2):
+    """Apply a filter to the spectrum of a zero padded record.
+
+    For two passes, the output of the forward pass is truncated to the
+    record length before the backward pass, as is done when filtering the
+    trace in the time domain with zerophase=True.
+
+    Args:
+        spectrum (ndarray):
+            Spectrum of the zero padded record.
+        response (ndarray):
+            Complex frequency response of a single pass.
+        npts (int):
+            Number of points in the record.
+        nfft (int):
+            Number of points in the zero padded record.
+        number_of_passes (int):
+            Number of passes.
+
+    Returns:
+        ndarray: Spectrum of the filtered record.
+    """
+    if number_of_passes == 1:
+        return spectrum * response
+    elif number_of_passes == 2:
+        forward = irfft(spectrum * response, nfft)
+        forward[npts:] = 0.0
+        return rfft(forward) * np.conj(response)
+    else:
+        raise ValueError("number_of_passes must be 1 or 2.")
+
+
+class _DisplacementSpectrum(object):
+    """Spectrum of a lowpass filtered trace, reused across highpass corners.
+    """
+
+    def __init__(self, tr, lowpass, filter_order=5, number_of_passes=2):
+        """
+        Args:
+            tr (StationTrace):
+                Trace of acceleration data.
+            lowpass (float):
+                Lowpass corner frequency (Hz).
+            filter_order (int):
+                Lowpass filter order.
+            number_of_passes (int):
+                Number of lowpass filter passes.
+        """
+        self.npts = tr.stats.npts
+        self.dt = tr.stats.delta
+        self.sampling_rate = tr.stats.sampling_rate
+
+        # Zero pad so that the filtered record does not wrap around
+        nfft = next_fast_len(2 * self.npts)
+        response = _butter_response(rfftfreq(nfft, self.dt), lowpass,
+                                    self.sampling_rate, 'lowpass',
+                                    filter_order)
+        self.lowpassed = irfft(_apply_filter(
+            rfft(tr.data, nfft), response, self.npts, nfft,
+            number_of_passes), nfft)[:self.npts]
+
+        # Spectra, frequencies, and integrators for each padded length
+        self._padded = {}
+
+    def _get_padded(self, highpass):
+        """Spectrum of the record zero padded for a highpass corner.
 
-    # Make a copy of the trace so we don't modify it in place with
-    # filtering or integration
-    trdis = tr.copy()
+        The record is padded by PAD_PERIODS periods of the corner (and at
+        least doubled in length), which is longer than the response of the
+        highpass filter and of the integrations.
+
+        Args:
+            highpass (float):
+                Highpass corner frequency (Hz).
+
+        Returns:
+            tuple: (nfft, frequencies, spectrum, integrator).
+        """
+        npad = int(np.ceil(PAD_PERIODS * self.sampling_rate / highpass))
+        nfft = next_fast_len(self.npts + max(self.npts, npad))
+        if nfft not in self._padded:
+            freqs = rfftfreq(nfft, self.dt)
+            spectrum = rfft(self.lowpassed, nfft)
+
+            # Frequency response of the trapezoidal rule used by
+            # Trace.integrate; the DC term is removed by the highpass filter.
+            omega_dt = 2 * np.pi * freqs * self.dt
+            integrator = np.zeros(len(freqs), dtype=complex)
+            integrator[1:] = -0.5j * self.dt / np.tan(0.5 * omega_dt[1:])
+            self._padded[nfft] = (freqs, spectrum, integrator)
+        return (nfft,) + self._padded[nfft]
+
+    def displacement(self, highpass, filter_order=5, number_of_passes=2):
+        """Filtered displacement time series for a trial highpass corner.
+
+        The result is equivalent to filtering and then calling
+        Trace.integrate twice, i.e., both velocity and displacement start at
+        zero.
+
+        Args:
+            highpass (float):
+                Highpass corner frequency (Hz).
+            filter_order (int):
+                Highpass filter order.
+            number_of_passes (int):
+                Number of highpass filter passes.
+
+        Returns:
+            ndarray: Displacement time series.
+        """
+        nfft, freqs, spectrum, integrator = self._get_padded(highpass)
+        response = _butter_response(
+            freqs, highpass, self.sampling_rate, 'highpass', filter_order)
+        vel_spec = integrator * _apply_filter(
+            spectrum, response, self.npts, nfft, number_of_passes)
+        disp = irfft(vel_spec * integrator, nfft)[:self.npts]
+
+        # Shift the periodic solutions to zero initial conditions
+        vel0 = _irfft_first(vel_spec, nfft)
+        disp -= disp[0] + vel0 * self.dt * np.arange(self.npts)
+        return disp
+
+
+def _irfft_first(spectrum, n):
+    """First sample of irfft(spectrum, n) without computing the inverse FFT.
+    """
+    total = spectrum[0].real + 2 * np.sum(spectrum[1:].real)
+    if n % 2 == 0:
+        total -= spectrum[-1].real
+    return total / n
 
-    # Filter
-    trdis = lowpass_filter_trace(trdis, **lp_args)
-    trdis = highpass_filter_trace(trdis, **hp_args)
 
-    # Integrate to displacment
-    trdis.integrate()
-    trdis.integrate()
+def _disp_checks(spec, f_hp, hp_args,
+                 max_final_displacement=0.025,
+                 max_displacment_ratio=0.2):
+    trdis = spec.displacement(f_hp, **hp_args)
 
     # Checks
     ok = True
-    max_displacment = np.max(np.abs(trdis.data))
-    final_displacement = np.abs(trdis.data[-1])
+    max_displacment = np.max(np.abs(trdis))
+    final_displacement = np.abs(trdis[-1])
     disp_ratio = final_displacement/max_displacment
 
     if final_displacement > max_final_displacement:
@@ -0,0 +1,429 @@
+#!/usr/bin/env python
+"""
+Benchmarks of the processing and metrics hot paths on synthetic events.
+
+The synthetic events do not need any network access, so that the benchmarks
+can be run offline and compared across commits.
+"""
+
+import copy
+import itertools
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pkg_resources
+from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.inventory import (Inventory, Network, Station, Channel, Site,
+                                  Response, ResponseStage,
+                                  InstrumentSensitivity)
+from scipy.signal import butter, sosfiltfilt
+
+from gmprocess._version import get_versions
+from gmprocess.config import get_config
+from gmprocess.event import ScalarEvent
+from gmprocess.io.asdf.stream_workspace import StreamWorkspace
+from gmprocess.io.read import read_data
+from gmprocess.metrics.metrics_controller import MetricsController
+from gmprocess.processing import process_streams
+from gmprocess.snr import compute_snr
+from gmprocess.stationstream import StationStream
+from gmprocess.stationtrace import StationTrace
+from gmprocess.streamcollection import StreamCollection
+from gmprocess.timing import StepTimer
+
+# Size parameters of each benchmark case
+SIZE_KEYS = ['stations', 'npts', 'sampling_rate', 'periods', 'imcs']
+
+# Timing results of each benchmark case
+RESULT_KEYS = ['wall_time', 'cpu_time', 'peak_rss_delta']
+
+# Instrument sensitivity of the synthetic accelerometers (counts per m/s^2)
+SENSITIVITY = 4e5
+
+# Channels of the synthetic accelerometers, with their azimuth and dip
+CHANNELS = [('HNE', 90.0, 0.0), ('HNN', 0.0, 0.0), ('HNZ', 0.0, -90.0)]
+
+# Readers that are benchmarked, with the testdata directories they read
+READER_DIRS = {
+    'bhrc': ['bhrc'],
+    'cosmos': ['cosmos'],
+    'cwb': ['cwb'],
+    'dmg': ['dmg'],
+    'esm': ['esm'],
+    'geonet': ['geonet'],
+    'knet': ['knet', 'kiknet'],
+    'nsmn': ['nsmn'],
+    'renadic': ['renadic'],
+    'smc': ['smc'],
+    'unam': ['unam'],
+    'usc': ['usc'],
+}
+
+P_VELOCITY = 6.0  # km/s
+S_VELOCITY = 3.5  # km/s
+KM_PER_DEGREE = 111.19
+
+
+def synthetic_event(magnitude=6.0):
+    """Event for the synthetic streams.
+
+    Args:
+        magnitude (float):
+            Magnitude of the event.
+
+    Returns:
+        ScalarEvent: Synthetic event.
+    """
+    event = ScalarEvent()
+    event.fromParams('synthetic', UTCDateTime('2020-01-01T00:00:00'),
+                     35.0, -118.0, 10.0, magnitude, 'Mw')
+    return event
+
+
+def synthetic_streams(event, stations=10, npts=12000, sampling_rate=100.0,
+                      seed=0):
+    """Synthetic three component accelerometer records of an event.
+
+    The records are band limited noise with P and S wave envelopes whose
+    arrival times and amplitudes depend on the hypocentral distance, stored
+    in raw counts with an inventory that holds the instrument sensitivity.
+
+    Args:
+        event (ScalarEvent):
+            Event that is recorded.
+        stations (int):
+            Number of stations.
+        npts (int):
+            Number of points in each record.
+        sampling_rate (float):
+            Sampling rate (Hz).
+        seed (int):
+            Seed of the random number generator.
+
+    Returns:
+        StreamCollection: Synthetic streams.
+    """
+    rng = np.random.RandomState(seed)
+    dt = 1.0 / sampling_rate
+    nyquist = 0.5 * sampling_rate
+    sos = butter(4, [0.1, min(20.0, 0.8 * nyquist)], btype='bandpass',
+                 fs=sampling_rate, output='sos')
+    duration = npts * dt
+
+    streams = []
+    for i in range(stations):
+        code = 'S%03i' % i
+        distance = rng.uniform(10.0, 150.0)
+        azimuth = rng.uniform(0.0, 2 * np.pi)
+        lat = event.latitude + distance * np.cos(azimuth) / KM_PER_DEGREE
+        lon = event.longitude + distance * np.sin(azimuth) / (
+            KM_PER_DEGREE * np.cos(np.radians(lat)))
+        hypo = np.sqrt(distance**2 + event.depth_km**2)
+        t_p = hypo / P_VELOCITY
+        t_s = hypo / S_VELOCITY
+
+        # A quarter of the record precedes the P arrival
+        starttime = event.time + t_p - 0.25 * duration
+        times = np.arange(npts) * dt + (starttime - event.time)
+        envelope = 0.2 * np.exp(-np.clip(times - t_p, 0, None) / 10.0)
+        envelope[times < t_p] = 0.0
+        x = np.clip(times - t_s, 0, None) / (2.0 + 0.05 * hypo)
+        envelope += x * np.exp(1.0 - x)
+        pga = 100.0 * 10**(0.5 * (event.magnitude - 6.0)) * 20.0 / (
+            hypo + 20.0)  # cm/s^2
+
+        inventory = _synthetic_inventory(code, lat, lon, sampling_rate)
+        traces = []
+        for channel, _, _ in CHANNELS:
+            noise = sosfiltfilt(sos, rng.standard_normal(npts))
+            noise /= np.std(noise)
+            acc = pga * (envelope + 0.002) * noise
+            counts = np.round(acc / 100.0 * SENSITIVITY).astype(np.int32)
+            header = {'network': 'XX', 'station': code, 'location': '',
+                      'channel': channel, 'starttime': starttime,
+                      'sampling_rate': sampling_rate, 'npts': npts}
+            traces.append(StationTrace(counts, header, inventory))
+        streams.append(StationStream(traces=traces))
+    return StreamCollection(streams)
+
+
+def _synthetic_inventory(code, lat, lon, sampling_rate):
+    """Inventory of a synthetic accelerometer station.
+    """
+    channels = []
+    for channel, azimuth, dip in CHANNELS:
+        sensitivity = InstrumentSensitivity(
+            value=SENSITIVITY, frequency=1.0, input_units='M/S**2',
+            output_units='COUNTS')
+        stage = ResponseStage(
+            stage_sequence_number=1, stage_gain=SENSITIVITY,
+            stage_gain_frequency=1.0, input_units='M/S**2',
+            output_units='COUNTS')
+        response = Response(instrument_sensitivity=sensitivity,
+                            response_stages=[stage])
+        channels.append(Channel(
+            code=channel, location_code='', latitude=lat, longitude=lon,
+            elevation=0.0, depth=0.0, azimuth=azimuth, dip=dip,
+            sample_rate=sampling_rate, response=response))
+    station = Station(code=code, latitude=lat, longitude=lon, elevation=0.0,
+                      channels=channels, site=Site(name=code))
+    return Inventory(networks=[Network('XX', stations=[station])],
+                     source='synthetic')
+
+
+def benchmark_config(periods=21, imcs=('channels', 'rotd50'), config=None):
+    """Configuration with the metrics of a benchmark case.
+
+    Args:
+        periods (int):
+            Number of SA periods, log spaced between 0.01 and 10 s.
+        imcs (list):
+            Intensity measure components.
+        config (dict):
+            Base configuration; the default config is used if None.
+
+    Returns:
+        dict: Configuration.
+    """
+    if config is None:
+        config = get_config()
+    config = copy.deepcopy(config)
+    metrics = config['metrics']
+    metrics['output_imts'] = ['PGA', 'PGV', 'SA']
+    metrics['output_imcs'] = list(imcs)
+    metrics['sa']['periods']['use_array'] = False
+    metrics['sa']['periods']['defined_periods'] = [
+        float('%.4g' % period) for period in np.logspace(-2, 1, periods)]
+    return config
+
+
+def run_case(stations=10, npts=12000, sampling_rate=100.0, periods=21,
+             imcs=('channels', 'rotd50'), config=None, seed=0):
+    """Time the processing and metrics hot paths for one synthetic event.
+
+    Args:
+        stations (int):
+            Number of stations.
+        npts (int):
+            Number of points in each record.
+        sampling_rate (float):
+            Sampling rate (Hz).
+        periods (int):
+            Number of SA periods.
+        imcs (list):
+            Intensity measure components.
+        config (dict):
+            Base configuration; the default config is used if None.
+        seed (int):
+            Seed of the random number generator.
+
+    Returns:
+        StepTimer: Timings; the step names are the names of the benchmarks.
+    """
+    config = benchmark_config(periods, imcs, config)
+    event = synthetic_event()
+    raw = synthetic_streams(event, stations, npts, sampling_rate, seed)
+    streams = synthetic_streams(event, stations, npts, sampling_rate, seed)
+
+    timer = StepTimer()
+    with timer.time('benchmark', '', 'process_streams'):
+        streams = process_streams(streams, event, config=config)
+
+    snr_conf = [step['compute_snr'] for step in config['processing']
+                if 'compute_snr' in step]
+    if len(snr_conf):
+        snr_args = dict(snr_conf[0], mag=event.magnitude)
+        with timer.time('benchmark', '', 'compute_snr'):
+            for st in streams:
+                compute_snr(st, **snr_args)
+
+    with timer.time('benchmark', '', 'MetricsController'):
+        for st in streams:
+            if st.passed:
+                MetricsController.from_config(st, config=config, event=event)
+
+    tdir = tempfile.mkdtemp()
+    try:
+        workspace = StreamWorkspace(os.path.join(tdir, 'workspace.h5'))
+        workspace.addEvent(event)
+        with timer.time('benchmark', '', 'addStreams'):
+            workspace.addStreams(event, raw, label='unprocessed')
+            workspace.addStreams(event, streams, label='processed')
+        with timer.time('benchmark', '', 'getStreams'):
+            workspace.getStreams(event.id, labels=['processed'])
+        with timer.time('benchmark', '', 'calcMetrics'):
+            workspace.calcMetrics(event.id, labels=['processed'],
+                                  config=config)
+        with timer.time('benchmark', '', 'getTables'):
+            workspace.getTables('processed')
+        workspace.close()
+    finally:
+        shutil.rmtree(tdir)
+    return timer
+
+
+def run_readers():
+    """Time each reader on the bundled testdata.
+
+    Returns:
+        StepTimer: Timings; the step names are 'read_<format>'.
+    """
+    testdata = pkg_resources.resource_filename(
+        'gmprocess', os.path.join('data', 'testdata'))
+    timer = StepTimer()
+    for read_format, dirs in READER_DIRS.items():
+        files = []
+        for tdir in dirs:
+            for root, _, fnames in os.walk(os.path.join(testdata, tdir)):
+                files += [os.path.join(root, fname) for fname in fnames
+                          if fname != 'event.json']
+        with timer.time('benchmark', '', 'read_%s' % read_format):
+            for fname in sorted(files):
+                try:
+                    read_data(fname, read_format=read_format)
+                except Exception as e:
+                    logging.debug('Could not read %s as %s: %s'
+                                  % (fname, read_format, e))
+    return timer
+
+
+def run_benchmarks(stations=(10,), npts=(12000,), sampling_rates=(100.0,),
+                   periods=(21,), imcs=(('channels', 'rotd50'),),
+                   repeat=1, readers=True, config=None, seed=0):
+    """Run the benchmarks for every combination of the size parameters.
+
+    Args:
+        stations (list):
+            Numbers of stations per event.
+        npts (list):
+            Numbers of points per record.
+        sampling_rates (list):
+            Sampling rates (Hz).
+        periods (list):
+            Numbers of SA periods.
+        imcs (list):
+            Lists of intensity measure components.
+        repeat (int):
+            Number of times each benchmark is run.
+        readers (bool):
+            Whether to also time the readers on the bundled testdata.
+        config (dict):
+            Base configuration; the default config is used if None.
+        seed (int):
+            Seed of the random number generator.
+
+    Returns:
+        list: Dictionaries with the benchmark name, the size parameters,
+        the repetition number, and the wall time (s), CPU time (s), and peak
+        RSS delta (MB).
+    """
+    results = []
+    cases = itertools.product(stations, npts, sampling_rates, periods, imcs)
+    for nsta, npt, sampling_rate, nper, case_imcs in cases:
+        sizes = dict(zip(SIZE_KEYS, [nsta, npt, sampling_rate, nper,
+                                     ','.join(case_imcs)]))
+        for i in range(repeat):
+            logging.info('Benchmark case %s, repetition %i' % (sizes, i))
+            timer = run_case(nsta, npt, sampling_rate, nper, case_imcs,
+                             config, seed)
+            results += _timer_results(timer, sizes, i)
+    if readers:
+        sizes = dict.fromkeys(SIZE_KEYS)
+        for i in range(repeat):
+            results += _timer_results(run_readers(), sizes, i)
+    return results
+
+
+def _timer_results(timer, sizes, repetition):
+    """Convert the records of a benchmark StepTimer into result dictionaries.
+    """
+    results = []
+    for _, _, name, wall, cpu, rss in timer.records:
+        result = {'benchmark': name}
+        result.update(sizes)
+        result['repeat'] = repetition
+        result.update(zip(RESULT_KEYS, [wall, cpu, rss]))
+        results.append(result)
+    return results
+
+
+def write_results(results, filename):
+    """Write benchmark results to a JSON file.
+
+    The file also records the gmprocess version and commit, and the Python
+    version and platform, so that results can be compared across commits.
+
+    Args:
+        results (list):
+            Results from run_benchmarks.
+        filename (str):
+            Path of the JSON file.
+    """
+    versions = get_versions()
+    metadata = {
+        'version': versions['version'],
+        'commit': versions['full-revisionid'],
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'date': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
+    with open(filename, 'wt') as f:
+        json.dump({'metadata': metadata, 'results': results}, f, indent=1,
+                  default=_json_default)
+
+
+def _json_default(value):
+    """Serialize the numpy scalars in the results.
+    """
+    return value.item()
+
+
+def read_results(filename):
+    """Read benchmark results from a JSON file (see write_results).
+
+    Args:
+        filename (str):
+            Path of the JSON file.
+
+    Returns:
+        tuple: Metadata dictionary and DataFrame of results.
+    """
+    with open(filename, 'rt') as f:
+        data = json.load(f)
+    df = pd.DataFrame(data['results'],
+                      columns=['benchmark'] + SIZE_KEYS + ['repeat'] +
+                      RESULT_KEYS)
+    return data['metadata'], df
+
+
+def compare_results(baseline, current):
+    """Compare the median wall times of two sets of benchmark results.
+
+    Args:
+        baseline (DataFrame):
+            Baseline results (see read_results).
+        current (DataFrame):
+            Current results.
+
+    Returns:
+        DataFrame: For each benchmark and size, the baseline and current
+        median wall times (s) and their ratio (current / baseline).
+    """
+    keys = ['benchmark'] + SIZE_KEYS
+
+    def medians(df):
+        df = df.copy()
+        df[SIZE_KEYS] = df[SIZE_KEYS].fillna('')
+        return df.groupby(keys, sort=False)['wall_time'].median()
+
+    df = pd.concat([medians(baseline), medians(current)], axis=1,
+                   keys=['baseline', 'current'], join='inner')
+    df['ratio'] = df['current'] / df['baseline']
+    return df.reset_index()
@@ -1,12 +1,16 @@
 #!/usr/bin/env python
 
 import os
+import copy
 import logging
 import yaml
-import pkg_resources
 
 from gmprocess.constants import CONFIG_FILE_TEST, CONFIG_FILE_PRODUCTION
 
+# Parsed config files, keyed by path, along with the modification time and
+# size of the file when it was parsed.
+_CONFIG_CACHE = {}
+
 
 def update_dict(target, source):
     """Merge values from source dictionary into target dictionary.
@@ -48,11 +52,46 @@ def merge_dicts(dicts):
     return target
 
 
+def read_config(config_file):
+    """Reads and validates a YAML config file.
+
+    The file is parsed once and the result is reused until the modification
+    time or size of the file change. Each call returns a new copy, so the
+    caller may modify it (e.g., with update_dict).
+
+    Args:
+        config_file (str):
+            Path to the config file.
+
+    Returns:
+        dictionary:
+            Configuration parameters.
+    Raises:
+        ValueError:
+            If the file does not contain a dictionary.
+    """
+    config_file = os.path.abspath(config_file)
+    stat = os.stat(config_file)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(config_file)
+    if cached is None or cached[0] != version:
+        with open(config_file, 'r') as f:
+            config = yaml.load(f, Loader=yaml.FullLoader)
+        if not isinstance(config, dict):
+            raise ValueError('Config file %s does not contain a dictionary.'
+                             % config_file)
+        cached = (version, config)
+        _CONFIG_CACHE[config_file] = cached
+    return copy.deepcopy(cached[1])
+
+
 def get_config(section=None):
     """Gets the user defined config and validates it.
 
     Notes:
-        If no config file is present, default parameters are used.
+        If no config file is present, default parameters are used. The
+        config file is only parsed again if it has changed (see
+        read_config).
 
     Args:
         section (str):
@@ -74,7 +113,7 @@ def get_config(section=None):
         file_to_use = CONFIG_FILE_PRODUCTION
 
     data_dir = os.path.abspath(
-        pkg_resources.resource_filename('gmprocess', 'data'))
+        os.path.join(os.path.dirname(__file__), 'data'))
     config_file = os.path.join(data_dir, file_to_use)
 
     if not os.path.isfile(config_file):
@@ -83,8 +122,7 @@ def get_config(section=None):
         logging.info(fmt % config_file)
         config = None
     else:
-        with open(config_file, 'r') as f:
-            config = yaml.load(f, Loader=yaml.FullLoader)
+        config = read_config(config_file)
 
     if section is not None:
         if section not in config:
@@ -1,3 +1,7 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.signal import iirfilter, sosfilt
 
 
 def highpass_filter(st, filter_order=5, number_of_passes=2):
@@ -15,11 +19,16 @@ def highpass_filter(st, filter_order=5, number_of_passes=2):
     Returns:
         StationStream: Filtered streams.
     """
+    _check_number_of_passes(number_of_passes)
     if not st.passed:
         return st
 
-    for tr in st:
-        tr = highpass_filter_trace(tr, filter_order, number_of_passes)
+    for traces in _group_traces(st, 'highpass'):
+        try:
+            _filter_traces(traces, 'highpass', filter_order, number_of_passes)
+        except Exception as e:
+            for tr in traces:
+                tr.fail("Highpass filter failed with excpetion: %s" % e)
 
     return st
 
@@ -39,31 +48,11 @@ def highpass_filter_trace(tr, filter_order=5, number_of_passes=2):
     Returns:
         StationTrace: Filtered trace.
     """
-    if number_of_passes == 1:
-        zerophase = False
-    elif number_of_passes == 2:
-        zerophase = True
-    else:
-        raise ValueError("number_of_passes must be 1 or 2.")
-
-    freq_dict = tr.getParameter('corner_frequencies')
-    freq = freq_dict['highpass']
+    _check_number_of_passes(number_of_passes)
     try:
-        tr.filter(type="highpass",
-                  freq=freq,
-                  corners=filter_order,
-                  zerophase=zerophase)
-        tr.setProvenance(
-            'highpass_filter',
-            {
-                'filter_type': 'Butterworth',
-                'filter_order': filter_order,
-                'number_of_passes': number_of_passes,
-                'corner_frequency': freq
-            }
-        )
+        _filter_traces([tr], 'highpass', filter_order, number_of_passes)
     except Exception as e:
-        tr.fail("Lowpass filter failed with excpetion: %s" % e)
+        tr.fail("Highpass filter failed with excpetion: %s" % e)
     return tr
 
 
@@ -82,11 +71,16 @@ def lowpass_filter(st, filter_order=5, number_of_passes=2):
     Returns:
         StationStream: Filtered streams.
     """
+    _check_number_of_passes(number_of_passes)
     if not st.passed:
         return st
 
-    for tr in st:
-        tr = lowpass_filter_trace(tr, filter_order, number_of_passes)
+    for traces in _group_traces(st, 'lowpass'):
+        try:
+            _filter_traces(traces, 'lowpass', filter_order, number_of_passes)
+        except Exception as e:
+            for tr in traces:
+                tr.fail("Lowpass filter failed with excpetion: %s" % e)
 
     return st
 
@@ -106,22 +100,105 @@ def lowpass_filter_trace(tr, filter_order=5, number_of_passes=2):
     Returns:
         StationTrace: Filtered trace.
     """
-    if number_of_passes == 1:
-        zerophase = False
-    elif number_of_passes == 2:
-        zerophase = True
-    else:
+    _check_number_of_passes(number_of_passes)
+    try:
+        _filter_traces([tr], 'lowpass', filter_order, number_of_passes)
+    except Exception as e:
+        tr.fail("Lowpass filter failed with excpetion: %s" % e)
+    return tr
+
+
+@lru_cache(maxsize=128)
+def butter_sos(filter_order, corner, sampling_rate, btype):
+    """
+    Second-order sections of a digital Butterworth filter.
+
+    The design is the same as the one used by obspy's Trace.filter. Designs
+    are cached because the same filter is typically applied to all of the
+    channels of a stream and to many streams.
+
+    Args:
+        filter_order (int):
+            Filter order.
+        corner (float):
+            Corner frequency (Hz).
+        sampling_rate (float):
+            Sampling rate (Hz).
+        btype (str):
+            Either 'highpass' or 'lowpass'.
+
+    Returns:
+        ndarray: Second-order sections. The array is shared between calls and
+        must not be modified.
+    """
+    fnorm = corner / (0.5 * sampling_rate)
+    if fnorm > 1:
+        if btype == 'highpass':
+            raise ValueError("Selected corner frequency is above Nyquist.")
+        fnorm = 1.0
+    sos = iirfilter(filter_order, fnorm, btype=btype, ftype='butter',
+                    output='sos')
+    return sos
+
+
+def _check_number_of_passes(number_of_passes):
+    if number_of_passes not in [1, 2]:
         raise ValueError("number_of_passes must be 1 or 2.")
 
-    freq_dict = tr.getParameter('corner_frequencies')
-    freq = freq_dict['lowpass']
-    try:
-        tr.filter(type="lowpass",
-                  freq=freq,
-                  corners=filter_order,
-                  zerophase=zerophase)
+
+def _group_traces(st, btype):
+    """
+    Group the traces of a stream that can be filtered together, i.e., the
+    traces with the same number of points, sampling rate, and corner
+    frequency.
+
+    Args:
+        st (StationStream):
+            Stream of data.
+        btype (str):
+            Either 'highpass' or 'lowpass'.
+
+    Returns:
+        list: Lists of StationTraces.
+    """
+    groups = {}
+    for tr in st:
+        freq = tr.getParameter('corner_frequencies')[btype]
+        key = (tr.stats.npts, tr.stats.sampling_rate, freq)
+        groups.setdefault(key, []).append(tr)
+    return list(groups.values())
+
+
+def _filter_traces(traces, btype, filter_order, number_of_passes):
+    """
+    Filter traces as the rows of a 2D array and record the filter in their
+    provenance.
+
+    Args:
+        traces (list):
+            List of StationTraces with the same number of points, sampling
+            rate, and corner frequency.
+        btype (str):
+            Either 'highpass' or 'lowpass'.
+        filter_order (int):
+            Filter order.
+        number_of_passes (int):
+            Number of passes.
+    """
+    freq = traces[0].getParameter('corner_frequencies')[btype]
+    sos = butter_sos(filter_order, freq, traces[0].stats.sampling_rate,
+                     btype)
+    data = np.array([tr.data for tr in traces], dtype=np.float64)
+    data = sosfilt(sos, data, axis=-1)
+    if number_of_passes == 2:
+        # Same as obspy's zerophase option: a second pass on the time-reversed
+        # output, without padding.
+        data = sosfilt(sos, data[:, ::-1], axis=-1)[:, ::-1]
+
+    for tr, trdata in zip(traces, data):
+        tr.data = np.ascontiguousarray(trdata)
         tr.setProvenance(
-            'lowpass_filter',
+            '%s_filter' % btype,
             {
                 'filter_type': 'Butterworth',
                 'filter_order': filter_order,
@@ -129,6 +206,3 @@ def lowpass_filter_trace(tr, filter_order=5, number_of_passes=2):
                 'corner_frequency': freq
             }
         )
-    except Exception as e:
-        tr.fail("Lowpass filter failed with excpetion: %s" % e)
-    return tr
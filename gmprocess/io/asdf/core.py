@@ -2,7 +2,7 @@
 import h5py
 
 # local imports
-from .stream_workspace import StreamWorkspace
+from gmprocess.io.utils import is_path
 
 TIMEPAT = '[0-9]{4}-[0-9]{2}-[0-9]{2}T'
 
@@ -14,8 +14,11 @@ def is_asdf(filename):
         filename (str): Path to candidate ASDF file.
 
     Returns:
-        bool: True if ASDF, False if not.
+        bool: True if ASDF, False if not (ASDF files are only read from a
+        path).
     """
+    if not is_path(filename):
+        return False
     try:
         f = h5py.File(filename, 'r')
         if 'AuxiliaryData' in f:
@@ -39,6 +42,9 @@ def read_asdf(filename, eventid=None, stations=None, label=None):
             List of StationStreams containing processing
             and channel metadata.
     """
+    # The workspace pulls in pyasdf and the rupture/mapping libraries, which
+    # only need to be loaded once a file is known to be ASDF.
+    from .stream_workspace import StreamWorkspace
     workspace = StreamWorkspace.open(filename)
     eventids = workspace.getEventIds()
     allstreams = []
@@ -55,7 +61,7 @@ def read_asdf(filename, eventid=None, stations=None, label=None):
     return allstreams
 
 
-def write_asdf(filename, streams, event, label=None):
+def write_asdf(filename, streams, event, label=None, seis_prov=True):
     """Write a number of streams (raw or processed) into an ASDF file.
 
     Args:
@@ -67,7 +73,12 @@ def write_asdf(filename, streams, event, label=None):
             Obspy event object or dict (see get_event_dict())
         label (str):
             Label to append to all streams being added to ASDF file.
+        seis_prov (bool):
+            Also write the processing history of processed streams as
+            SEIS-PROV documents, so that the file can be read by other ASDF
+            tools.
     """
+    from .stream_workspace import StreamWorkspace
     workspace = StreamWorkspace(filename)
-    workspace.addStreams(event, streams, label=label)
+    workspace.addStreams(event, streams, label=label, seis_prov=seis_prov)
     workspace.close()
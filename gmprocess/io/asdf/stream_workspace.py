@@ -19,12 +19,16 @@ from mapio.gmt import GMTGrid
 
 # local imports
 from gmprocess.stationtrace import (StationTrace, TIMEFMT_MS, NS_SEIS,
+                                    ACTIVITIES, get_agent_parameters,
+                                    _decode_prov_value,
                                     _get_person_agent, _get_software_agent)
 from gmprocess.stationstream import StationStream
 from gmprocess.streamcollection import StreamCollection
-from gmprocess.metrics.station_summary import StationSummary, XML_UNITS
+from gmprocess.metrics.station_summary import (
+    StationSummary, XML_UNITS, compute_event_station_metrics)
 from gmprocess.exception import GMProcessException
 from gmprocess.event import ScalarEvent
+from gmprocess.timing import StepTimer
 
 TIMEPAT = '[0-9]{4}-[0-9]{2}-[0-9]{2}T'
 EVENT_TABLE_COLUMNS = ['id', 'time', 'latitude',
@@ -239,9 +243,13 @@ class StreamWorkspace(object):
         """
         self.dataset.add_quakeml(event)
 
-    def addStreams(self, event, streams, label=None):
+    def addStreams(self, event, streams, label=None, seis_prov=False):
         """Add a sequence of StationStream objects to an ASDF file.
 
+        The processing history of each trace is stored in a compact JSON
+        form in the 'TraceProvenance' auxiliary data, and the software/user
+        information once per tag in the 'ProvenanceAgents' auxiliary data.
+
         Args:
             event (Event):
                 Obspy event object.
@@ -250,6 +258,9 @@ class StreamWorkspace(object):
             label (str):
                 Label to attach to stream sequence. Cannot contain an
                 underscore.
+            seis_prov (bool):
+                Also store the processing history of each trace as a
+                SEIS-PROV document in the provenance section of the file.
         """
         if label is not None:
             if '_' in label:
@@ -269,6 +280,7 @@ class StreamWorkspace(object):
         base_prov.add_namespace(*NS_SEIS)
         base_prov = _get_person_agent(base_prov)
         base_prov = _get_software_agent(base_prov)
+        software, person = get_agent_parameters(base_prov)
 
         for stream in streams:
             station = stream[0].stats['station']
@@ -289,13 +301,23 @@ class StreamWorkspace(object):
 
             # add processing provenance info from traces
             if level == 'processed':
-                provdocs = stream.getProvenanceDocuments(base_prov)
-                for provdoc, trace in zip(provdocs, stream):
-                    provname = format_nslct(trace.stats, tag)
-                    self.dataset.add_provenance_document(
-                        provdoc,
-                        name=provname
-                    )
+                if tag not in self._getProvenanceAgentTags():
+                    jsonstr = json.dumps({'software': software,
+                                          'user': person})
+                    self.insert_aux(jsonstr, 'ProvenanceAgents', tag)
+                for trace in stream:
+                    provpath = '/'.join([format_netsta(trace.stats),
+                                         format_nslct(trace.stats, tag)])
+                    self.insert_aux(trace.getProvenanceJSON(),
+                                    'TraceProvenance', provpath)
+                if seis_prov:
+                    provdocs = stream.getProvenanceDocuments(base_prov)
+                    for provdoc, trace in zip(provdocs, stream):
+                        provname = format_nslct(trace.stats, tag)
+                        self.dataset.add_provenance_document(
+                            provdoc,
+                            name=provname
+                        )
 
             # add processing parameters from streams
             jdict = {}
@@ -422,6 +444,13 @@ class StreamWorkspace(object):
             trace_auxholder = self.dataset.auxiliary_data.TraceProcessingParameters
         if 'StreamProcessingParameters' in self.dataset.auxiliary_data:
             stream_auxholder = self.dataset.auxiliary_data.StreamProcessingParameters
+        prov_auxholder = []
+        if 'TraceProvenance' in self.dataset.auxiliary_data:
+            prov_auxholder = self.dataset.auxiliary_data.TraceProvenance
+        # SEIS-PROV documents are only read for traces without the compact
+        # provenance records
+        provnames = set(self.dataset.provenance.list())
+        agents = {}
         streams = []
 
         if stations is None:
@@ -457,12 +486,22 @@ class StreamWorkspace(object):
 
                     # get the provenance information
                     provname = format_nslct(trace.stats, tag)
-                    if provname in self.dataset.provenance.list():
+                    top = format_netsta(trace.stats)
+                    if top in prov_auxholder and \
+                            provname in prov_auxholder[top]:
+                        trace.setProvenanceJSON(
+                            _aux_to_str(prov_auxholder[top][provname]))
+                        if tag not in agents:
+                            agents[tag] = self._getProvenanceAgents(tag)
+                        if agents[tag] is not None:
+                            trace.setParameter('software',
+                                               agents[tag]['software'])
+                            trace.setParameter('user', agents[tag]['user'])
+                    elif provname in provnames:
                         provdoc = self.dataset.provenance[provname]
                         trace.setProvenanceDocument(provdoc)
 
                     # get the trace processing parameters
-                    top = format_netsta(trace.stats)
                     trace_path = format_nslct(trace.stats, tag)
                     if top in trace_auxholder:
                         root_auxholder = trace_auxholder[top]
@@ -535,6 +574,31 @@ class StreamWorkspace(object):
                 stations.append(station)
         return stations
 
+    def _getProvenanceAgentTags(self):
+        """Get the tags with software/user provenance information.
+
+        Returns:
+            list: Tags in the 'ProvenanceAgents' auxiliary data.
+        """
+        if 'ProvenanceAgents' not in self.dataset.auxiliary_data:
+            return []
+        return self.dataset.auxiliary_data.ProvenanceAgents.list()
+
+    def _getProvenanceAgents(self, tag):
+        """Get the software/user provenance information for a tag.
+
+        Args:
+            tag (str): Waveform tag (eventid_label).
+
+        Returns:
+            dict: Dictionary with 'software' and 'user' dictionaries, or None
+            if the tag has no such information.
+        """
+        if tag not in self._getProvenanceAgentTags():
+            return None
+        auxarray = self.dataset.auxiliary_data.ProvenanceAgents[tag]
+        return json.loads(_aux_to_str(auxarray))
+
     def insert_aux(self, datastr, data_name, path):
         """Insert a string (usually json or xml) into Auxilliary array.
 
@@ -558,7 +622,8 @@ class StreamWorkspace(object):
 
     def calcMetrics(self, eventid, stations=None, labels=None, config=None,
                     streams=None, stream_label=None, rupture_file=None,
-                    calc_station_metrics=True, calc_waveform_metrics=True):
+                    calc_station_metrics=True, calc_waveform_metrics=True,
+                    timer=None):
         """
         Calculate waveform and/or station metrics for a set of waveforms.
         Args:
@@ -581,6 +646,10 @@ class StreamWorkspace(object):
                 Whether to calculate station metrics. Default is True.
             calc_waveform_metrics (bool):
                 Whether to calculate waveform metrics. Default is True.
+            timer (StepTimer):
+                Optional StepTimer that records the time and memory used by
+                each IMT/IMC step set for each stream, and by the station
+                metrics, under the 'metrics' stage.
         """
         if not self.hasEvent(eventid):
             fmt = 'No event matching %s found in workspace.'
@@ -589,6 +658,8 @@ class StreamWorkspace(object):
         if streams is None:
             streams = self.getStreams(eventid, stations=stations,
                                       labels=labels)
+        if timer is None:
+            timer = StepTimer()
 
         event = self.getEvent(eventid)
 
@@ -613,6 +684,7 @@ class StreamWorkspace(object):
                     vs30_grids[vs30_name]['grid_object'] = GMTGrid.load(
                         vs30_grids[vs30_name]['file'])
 
+        summaries = []
         for stream in streams:
             instrument = stream.get_id()
             logging.info('Calculating stream metrics for %s...' % instrument)
@@ -621,14 +693,36 @@ class StreamWorkspace(object):
                 summary = StationSummary.from_config(
                     stream, event=event, config=config,
                     calc_waveform_metrics=calc_waveform_metrics,
-                    calc_station_metrics=calc_station_metrics,
-                    rupture=rupture, vs30_grids=vs30_grids)
+                    calc_station_metrics=False, timer=timer)
             except Exception as pgme:
                 fmt = ('Could not create stream metrics for event %s,'
                        'instrument %s: "%s"')
                 logging.warning(fmt % (eventid, instrument, str(pgme)))
                 continue
+            summaries.append((stream, summary))
 
+        if calc_station_metrics:
+            # Compute the station metrics for all stations at once; if that
+            # fails, find out which stations are the problem.
+            try:
+                with timer.time('metrics', '', 'station_metrics'):
+                    compute_event_station_metrics(
+                        [summary for _, summary in summaries], event=event,
+                        rupture=rupture, vs30_grids=vs30_grids)
+            except Exception:
+                good_summaries = []
+                for stream, summary in summaries:
+                    try:
+                        summary.compute_station_metrics(rupture, vs30_grids)
+                        good_summaries.append((stream, summary))
+                    except Exception as pgme:
+                        fmt = ('Could not create stream metrics for event '
+                               '%s,instrument %s: "%s"')
+                        logging.warning(
+                            fmt % (eventid, stream.get_id(), str(pgme)))
+                summaries = good_summaries
+
+        for stream, summary in summaries:
             if calc_waveform_metrics and stream.passed:
                 xmlstr = summary.get_metric_xml()
                 if stream_label is not None:
@@ -649,6 +743,43 @@ class StreamWorkspace(object):
                 ])
                 self.insert_aux(xmlstr, 'StationMetrics', metricpath)
 
+    def setStepTimings(self, eventid, timer):
+        """Store the step timings for an event, replacing any existing ones.
+
+        Args:
+            eventid (str):
+                ID of event that the timings are for.
+            timer (StepTimer):
+                StepTimer containing the step records.
+        """
+        auxdata = self.dataset.auxiliary_data
+        if 'StepTimings' in auxdata and eventid in auxdata.StepTimings:
+            del auxdata.StepTimings[eventid]
+        self.insert_aux(json.dumps(timer.records), 'StepTimings', eventid)
+
+    def getStepTimings(self, eventid, summarize=False):
+        """Retrieve the step timings for an event.
+
+        Args:
+            eventid (str):
+                ID of event that the timings are for.
+            summarize (bool):
+                If True, aggregate the records over stations (see
+                StepTimer.summarize).
+
+        Returns:
+            DataFrame: Step records (see StepTimer.to_dataframe), or None if
+            there are no timings for the event.
+        """
+        auxdata = self.dataset.auxiliary_data
+        if 'StepTimings' not in auxdata or eventid not in auxdata.StepTimings:
+            return None
+        timer = StepTimer()
+        timer.records = json.loads(_aux_to_str(auxdata.StepTimings[eventid]))
+        if summarize:
+            return timer.summarize()
+        return timer.to_dataframe()
+
     def getTables(self, label, streams=None, stream_label=None):
         '''Retrieve dataframes containing event information and IMC/IMT metrics.
 
@@ -960,17 +1091,29 @@ class StreamWorkspace(object):
         cols = ['Label', 'UserID', 'UserName',
                 'UserEmail', 'Software', 'Version']
         df = pd.DataFrame(columns=cols, index=None)
-        labels = list(set([ptag.split('_')[-1] for ptag in provtags]))
         labeldict = {}
+        for tag in self._getProvenanceAgentTags():
+            labeldict[tag.split('_')[-1]] = tag
+        labels = list(set([ptag.split('_')[-1] for ptag in provtags]))
         for label in labels:
+            if label in labeldict:
+                continue
             for ptag in provtags:
                 if label in ptag:
                     labeldict[label] = ptag
         for label, ptag in labeldict.items():
             row = pd.Series(index=cols, dtype=object)
             row['Label'] = label
-            provdoc = self.dataset.provenance[ptag]
-            user, software = _get_agents(provdoc)
+            agents = self._getProvenanceAgents(ptag)
+            if agents is not None:
+                user = {'id': agents['user']['label'],
+                        'name': agents['user'].get('name', ''),
+                        'email': agents['user'].get('email', '')}
+                software = {'name': agents['software']['software_name'],
+                            'version': agents['software']['software_version']}
+            else:
+                provdoc = self.dataset.provenance[ptag]
+                user, software = _get_agents(provdoc)
             row['UserID'] = user['id']
             row['UserName'] = user['name']
             row['UserEmail'] = user['email']
@@ -1076,8 +1219,21 @@ class StreamWorkspace(object):
             labels = self.getLabels()
         cols = ['Record', 'Processing Step',
                 'Step Attribute', 'Attribute Value']
-        df_dicts = []
+
+        # compact provenance records, and SEIS-PROV documents for traces
+        # without them
+        records = {}
+        if 'TraceProvenance' in self.dataset.auxiliary_data:
+            prov_auxholder = self.dataset.auxiliary_data.TraceProvenance
+            for top in prov_auxholder.list():
+                for provname in prov_auxholder[top].list():
+                    records[provname] = prov_auxholder[top][provname]
         for provname in self.dataset.provenance.list():
+            if provname not in records:
+                records[provname] = None
+
+        df_dicts = []
+        for provname in sorted(records):
             has_station = False
             for station in stations:
                 if station in provname:
@@ -1091,6 +1247,24 @@ class StreamWorkspace(object):
             if not has_label or not has_station:
                 continue
 
+            if records[provname] is not None:
+                trace_records = json.loads(
+                    _aux_to_str(records[provname]),
+                    object_hook=_decode_prov_value)
+                for provid, attrs in trace_records:
+                    if provid not in ACTIVITIES:
+                        continue
+                    pstep = ACTIVITIES[provid]['label']
+                    # attributes are sorted, as in SEIS-PROV documents
+                    for attrkey in sorted(attrs):
+                        row = pd.Series(index=cols, dtype=object)
+                        row['Record'] = provname
+                        row['Processing Step'] = pstep
+                        row['Step Attribute'] = attrkey
+                        row['Attribute Value'] = attrs[attrkey]
+                        df_dicts.append(row)
+                continue
+
             provdoc = self.dataset.provenance[provname]
             serial = json.loads(provdoc.serialize())
             for activity, attrs in serial['activity'].items():
@@ -1133,6 +1307,12 @@ def _stringify_dict(indict):
     return indict
 
 
+def _aux_to_str(auxarray):
+    """Decode a string stored in an auxiliary data array (see insert_aux).
+    """
+    return auxarray.data[()].tobytes().decode('utf-8')
+
+
 def _get_id(event):
     eid = event.origins[0].resource_id.id
 
@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 
 # stdlib imports
-import os
 import re
 
 # third party imports
@@ -13,6 +12,7 @@ from obspy.core.utcdatetime import UTCDateTime
 from gmprocess.stationstream import StationStream
 from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
 from gmprocess.io.seedname import get_channel_name, get_units_type
+from gmprocess.io.utils import open_text, read_lines, get_source_file
 
 
 INTIMEFMT = '%Y/%m/%d %H:%M:%S'
@@ -34,14 +34,15 @@ LEVELS = {'VOL1DS': 'V1'}
 
 def is_bhrc(filename):
     try:
-        with open(filename, 'rt') as f:
+        with open_text(filename) as f:
             lines = [next(f) for x in range(TEXT_HDR_ROWS)]
 
         has_line1 = lines[0].startswith('* VOL')
         has_line7 = lines[6].startswith('COMP')
         if has_line1 and has_line7:
             return True
-    except UnicodeDecodeError:
+    except (UnicodeDecodeError, StopIteration):
+        # files shorter than a header are not BHRC files
         return False
     return False
 
@@ -50,18 +51,21 @@ def read_bhrc(filename):
     """Read the Iran BHRC strong motion data format.
 
     Args:
-        filename (str): path to BHRC data file.
+        filename (str, bytes, or file-like): path to BHRC data file, or
+            its contents.
 
     Returns:
         list: Sequence of one StationStream object containing 3
         StationTrace objects.
     """
-    header1, offset = _read_header_lines(filename, 0)
-    data1, offset = _read_data(filename, offset, header1)
-    header2, offset = _read_header_lines(filename, offset)
-    data2, offset = _read_data(filename, offset, header2)
-    header3, offset = _read_header_lines(filename, offset)
-    data3, offset = _read_data(filename, offset, header3)
+    lines = read_lines(filename)
+    source_file = get_source_file(filename)
+    header1, offset = _read_header_lines(lines, 0, source_file)
+    data1, offset = _read_data(lines, offset, header1)
+    header2, offset = _read_header_lines(lines, offset, source_file)
+    data2, offset = _read_data(lines, offset, header2)
+    header3, offset = _read_header_lines(lines, offset, source_file)
+    data3, offset = _read_data(lines, offset, header3)
     trace1 = StationTrace(data1, header1)
     trace2 = StationTrace(data2, header2)
     trace3 = StationTrace(data3, header3)
@@ -75,23 +79,22 @@ def read_bhrc(filename):
     return [stream]
 
 
-def _read_header_lines(filename, offset):
+def _read_header_lines(filelines, offset, source_file):
     """Read the header lines for each channel.
 
     Args:
-        filename (str):
-            Input BHRC file name.
+        filelines (list):
+            Lines of the BHRC file.
         offset (int):
             Number of lines to skip from the beginning of the file.
+        source_file (str):
+            Name of the BHRC file.
 
     Returns:
         tuple: (header dictionary containing Stats dictionary with
         extra sub-dicts, updated offset rows)
     """
-    with open(filename, 'rt') as f:
-        for _ in range(offset):
-            next(f)
-        lines = [next(f) for x in range(TEXT_HDR_ROWS)]
+    lines = filelines[offset:offset + TEXT_HDR_ROWS]
 
     offset += TEXT_HDR_ROWS
 
@@ -141,8 +144,7 @@ def _read_header_lines(filename, offset):
     standard['horizontal_orientation'] = angle
     standard['vertical_orientation'] = np.nan
     standard['comments'] = ''
-    head, tail = os.path.split(filename)
-    standard['source_file'] = tail or os.path.basename(head)
+    standard['source_file'] = source_file
 
     # this field can be used for instrument correction
     # when data is in counts
@@ -193,12 +195,12 @@ def _read_header_lines(filename, offset):
     return (header, offset)
 
 
-def _read_data(filename, offset, header):
+def _read_data(lines, offset, header):
     """Read acceleration data from BHRC file.
 
     Args:
-        filename (str):
-            BHRC strong motion filename.
+        lines (list):
+            Lines of the BHRC strong motion file.
         offset (int):
             Number of rows from the beginning of the file to skip.
         header (dict):
@@ -210,7 +212,7 @@ def _read_data(filename, offset, header):
     widths = [COLWIDTH] * COLS_PER_ROW
     npoints = header['npts']
     nrows = int(np.ceil(npoints / COLS_PER_ROW))
-    data = np.genfromtxt(filename, skip_header=offset,
+    data = np.genfromtxt(lines, skip_header=offset,
                          max_rows=nrows, filling_values=np.nan,
                          delimiter=widths)
     data = data.flatten()
@@ -5,7 +5,6 @@ from datetime import datetime
 import os
 import re
 import warnings
-import pkg_resources
 import logging
 
 # third party
@@ -19,6 +18,8 @@ from gmprocess.exception import GMProcessException
 from gmprocess.stationstream import StationStream
 from gmprocess.stationtrace import StationTrace, TIMEFMT, PROCESS_LEVELS
 from gmprocess.io.seedname import get_channel_name, get_units_type
+from gmprocess.io.utils import (open_text, read_lines, get_source_file,
+                                describe_source)
 
 MICRO_TO_VOLT = 1e6  # convert microvolts to volts
 MSEC_TO_SEC = 1 / 1000.0
@@ -29,7 +30,8 @@ VALID_MARKERS = [
     'RAW ACCELERATION COUNTS'
 ]
 
-code_file = pkg_resources.resource_filename('gmprocess', 'data/fdsn_codes.csv')
+code_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '..', '..', 'data', 'fdsn_codes.csv')
 
 CODES, SOURCES1, SOURCES2 = np.genfromtxt(
     code_file, skip_header=1, usecols=(0, 1, 2),
@@ -170,13 +172,15 @@ def is_cosmos(filename):
     """Check to see if file is a COSMOS V0/V1 strong motion file.
 
     Args:
-        filename (str): Path to possible COSMOS V0/V1 data file.
+        filename (str, bytes, or file-like): Path to possible COSMOS V0/V1
+            data file, or its contents.
     Returns:
         bool: True if COSMOS V0/V1, False otherwise.
     """
     logging.debug("Checking if format is cosmos.")
     try:
-        line = open(filename, 'rt').readline()
+        with open_text(filename) as f:
+            line = f.readline()
         for marker in VALID_MARKERS:
             if line.lower().find(marker.lower()) >= 0:
                 if line.lower().find('(format v') >= 0:
@@ -194,7 +198,8 @@ def read_cosmos(filename, **kwargs):
     This will be set to either "V1" or "V2".
 
     Args:
-        filename (str): Path to possible COSMOS V1/V2 data file.
+        filename (str, bytes, or file-like): Path to possible COSMOS V1/V2
+            data file, or its contents.
         kwargs (ref):
             valid_station_types (list): List of valid station types. See table
                 6  in the COSMOS strong motion data format documentation for
@@ -207,22 +212,24 @@ def read_cosmos(filename, **kwargs):
     logging.debug("Starting read_cosmos.")
     if not is_cosmos(filename):
         raise Exception(
-            '%s is not a valid COSMOS strong motion data file.' % filename)
+            '%s is not a valid COSMOS strong motion data file.'
+            % describe_source(filename))
     # get list of valid stations
     valid_station_types = kwargs.get('valid_station_types', None)
     # get list of valid stations
     location = kwargs.get('location', '')
 
-    # count the number of lines in the file
-    with open(filename) as f:
-        line_count = sum(1 for _ in f)
+    # read the file once, the channels are parsed from its lines
+    lines = read_lines(filename)
+    line_count = len(lines)
+    source_file = get_source_file(filename)
 
     # read as many channels as are present in the file
     line_offset = 0
     stream = StationStream([])
     while line_offset < line_count:
         trace, line_offset = _read_channel(
-            filename, line_offset, location=location)
+            lines, line_offset, source_file, location=location)
         # store the trace if the station type is in the valid_station_types
         # list or store the trace if there is no valid_station_types list
         if valid_station_types is not None:
@@ -234,34 +241,32 @@ def read_cosmos(filename, **kwargs):
     return [stream]
 
 
-def _read_channel(filename, line_offset, location=''):
+def _read_channel(filelines, line_offset, source_file, location=''):
     """Read channel data from COSMOS V1/V2 text file.
 
     Args:
-        filename (str): Input COSMOS V1/V2 filename.
+        filelines (list): Lines of the COSMOS V1/V2 file.
         line_offset (int): Line offset to beginning of channel text block.
+        source_file (str): Name of the COSMOS V1/V2 file.
 
     Returns:
         tuple: (obspy Trace, int line offset)
     """
     # read station, location, and process level from text header
-    with open(filename, 'rt') as f:
-        for _ in range(line_offset):
-            next(f)
-        lines = [next(f) for x in range(TEXT_HDR_ROWS)]
+    lines = filelines[line_offset:line_offset + TEXT_HDR_ROWS]
 
     # read in lines of integer data
     skiprows = line_offset + TEXT_HDR_ROWS
-    int_lines, int_data = _read_lines(skiprows, filename)
+    int_lines, int_data = _read_lines(skiprows, filelines)
     int_data = int_data.astype(np.int32)
 
     # read in lines of float data
     skiprows += int_lines + 1
-    flt_lines, flt_data = _read_lines(skiprows, filename)
+    flt_lines, flt_data = _read_lines(skiprows, filelines)
 
     # read in comment lines
     skiprows += flt_lines + 1
-    cmt_lines, cmt_data = _read_lines(skiprows, filename)
+    cmt_lines, cmt_data = _read_lines(skiprows, filelines)
     skiprows += cmt_lines + 1
 
     # according to the powers that defined the Network.Station.Channel.Location
@@ -269,11 +274,10 @@ def _read_channel(filename, line_offset, location=''):
     # including cosmos here, don't provide this.  We'll flag it as "--".
     hdr = _get_header_info(int_data, flt_data, lines,
                            cmt_data, location=location)
-    head, tail = os.path.split(filename)
-    hdr['standard']['source_file'] = tail or os.path.basename(head)
+    hdr['standard']['source_file'] = source_file
 
     # read in the data
-    nrows, data = _read_lines(skiprows, filename)
+    nrows, data = _read_lines(skiprows, filelines)
 
     # Check for "off-by-one" problem that sometimes occurs with cosmos data
     # Notes:
@@ -730,17 +734,17 @@ def _check_assign(value, unknown, default):
         return default
 
 
-def _read_lines(skip_rows, filename):
+def _read_lines(skip_rows, lines):
     """Read lines of comments and data exluding headers.
 
     Args:
         skip_rows (int): Number of rows to skip.
-        filename (str): Path to possible COSMOS V0/V1 data file.
+        lines (list): Lines of the COSMOS V0/V1 data file.
     Returns:
         array-like: List of comments or array of data.
     """
     # read the headers
-    header = np.genfromtxt(filename,
+    header = np.genfromtxt(lines,
                            skip_header=skip_rows - 1,
                            max_rows=1,
                            dtype='str')
@@ -755,10 +759,8 @@ def _read_lines(skip_rows, filename):
         num_lines = npts
 
         # read and store comment lines
-        with open(filename, 'rt') as f:
-            file = f.readlines()
         max_lines = skip_rows + num_lines
-        comment = [file[idx] for idx in range(skip_rows, max_lines)]
+        comment = [lines[idx] for idx in range(skip_rows, max_lines)]
         data_arr = comment
     else:
         # parse out the format of the data
@@ -771,7 +773,7 @@ def _read_lines(skip_rows, filename):
         widths = [fmt] * cols
 
         # read data
-        data_arr = np.genfromtxt(filename, skip_header=skip_rows,
+        data_arr = np.genfromtxt(lines, skip_header=skip_rows,
                                  max_rows=num_lines, dtype=np.float64,
                                  delimiter=widths).flatten()
     return num_lines, data_arr
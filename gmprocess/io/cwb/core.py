@@ -1,5 +1,4 @@
 # stdlib imports
-import os
 from collections import OrderedDict
 from datetime import datetime, timedelta
 import logging
@@ -12,6 +11,8 @@ from obspy.core.trace import Stats
 from gmprocess.io.seedname import get_channel_name, get_units_type
 from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
 from gmprocess.stationstream import StationStream
+from gmprocess.io.utils import (open_text, read_lines, get_source_file,
+                                describe_source)
 
 DATE_FMT = '%Y/%m/%d-%H:%M:%S.%f'
 
@@ -26,15 +27,15 @@ def is_cwb(filename):
     """Check to see if file is a Taiwan Central Weather Bureau strong motion file.
 
     Args:
-        filename (str): Path to possible CWB data file.
+        filename (str, bytes, or file-like): Path to possible CWB data
+            file, or its contents.
     Returns:
         bool: True if CWB, False otherwise.
     """
     logging.debug("Checking if format is cwb.")
     try:
-        f = open(filename, 'rt')
-        line = f.readline()
-        f.close()
+        with open_text(filename) as f:
+            line = f.readline()
         if line.startswith('#Earthquake Information'):
             return True
     except UnicodeDecodeError:
@@ -46,7 +47,8 @@ def read_cwb(filename, **kwargs):
     """Read Taiwan Central Weather Bureau strong motion file.
 
     Args:
-        filename (str): Path to possible CWB data file.
+        filename (str, bytes, or file-like): Path to possible CWB data
+            file, or its contents.
         kwargs (ref): Other arguments will be ignored.
 
     Returns:
@@ -56,19 +58,16 @@ def read_cwb(filename, **kwargs):
     logging.debug("Starting read_cwb.")
     if not is_cwb(filename):
         raise Exception('%s is not a valid CWB strong motion data file.'
-                        % filename)
-    f = open(filename, 'rt')
+                        % describe_source(filename))
+    lines = read_lines(filename)
     # according to the powers that defined the Network.Station.Channel.Location
     # "standard", Location is a two character field.  Most data providers,
     # including CWB here, don't provide this.  We'll flag it as "--".
-    data = np.genfromtxt(filename, skip_header=HDR_ROWS,
+    data = np.genfromtxt(lines, skip_header=HDR_ROWS,
                          delimiter=[COLWIDTH] * NCOLS)  # time, Z, NS, EW
 
-    hdr = _get_header_info(f, data)
-    f.close()
-
-    head, tail = os.path.split(filename)
-    hdr['standard']['source_file'] = tail or os.path.basename(head)
+    hdr = _get_header_info(lines, data)
+    hdr['standard']['source_file'] = get_source_file(filename)
 
     hdr_z = hdr.copy()
     hdr_z['channel'] = get_channel_name(
@@ -118,7 +117,7 @@ def read_cwb(filename, **kwargs):
     return [stream]
 
 
-def _get_header_info(file, data):
+def _get_header_info(lines, data):
     """Return stats structure from various headers.
 
     Output is a dictionary like this:
@@ -156,7 +155,7 @@ def _get_header_info(file, data):
         - dc_offset_h2 (float)
 
     Args:
-        file (TextIOWrapper): File object containing data
+        lines (list): Lines of the CWB file
         data (ndarray): Array of strong motion data
 
     Returns:
@@ -167,8 +166,7 @@ def _get_header_info(file, data):
     standard = {}
     format_specific = {}
     hdr['location'] = '--'
-    while True:
-        line = file.readline()
+    for line in lines:
         if line.startswith('#StationCode'):
             hdr['station'] = line.split(':')[1].strip()
             logging.debug("station: %s" % hdr['station'])
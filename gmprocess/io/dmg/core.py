@@ -5,7 +5,6 @@ import os
 from datetime import datetime, timedelta
 import re
 import logging
-import pkg_resources
 
 # third party
 from obspy.core.trace import Stats
@@ -19,7 +18,9 @@ from gmprocess.io.usc.core import is_usc
 from gmprocess.io.seedname import get_channel_name, get_units_type
 from gmprocess.stationtrace import StationTrace, TIMEFMT, PROCESS_LEVELS
 from gmprocess.stationstream import StationStream
-from gmprocess.io.utils import is_evenly_spaced, resample_uneven_trace
+from gmprocess.io.utils import (is_evenly_spaced, resample_uneven_trace,
+                                open_text, read_lines, get_source_file,
+                                describe_source)
 
 V1_TEXT_HDR_ROWS = 13
 V1_INT_HDR_ROWS = 7
@@ -48,7 +49,8 @@ DATE_PATTERNS = [
 
 TIME_MATCH = '[0-9]{2}:[0-9]{2}:..\.[0-9]{1}'
 
-code_file = pkg_resources.resource_filename('gmprocess', 'data/fdsn_codes.csv')
+code_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '..', '..', 'data', 'fdsn_codes.csv')
 
 
 CODES, SOURCES1, SOURCES2 = np.genfromtxt(
@@ -98,18 +100,18 @@ def is_dmg(filename):
         CSMIP is synonymous to as DMG in this reader.
 
     Args:
-        filename (str): Path to possible COSMOS V0/V1 data file.
+        filename (str, bytes, or file-like): Path to possible DMG data
+            file, or its contents.
 
     Returns:
         bool: True if DMG , False otherwise.
     """
     logging.debug("Checking if format is dmg.")
     try:
-        f = open(filename, 'rt')
-        first_line = f.readline().upper()
-        second_line = f.readline().upper()
-        third_line = f.readline().upper()
-        f.close()
+        with open_text(filename) as f:
+            first_line = f.readline().upper()
+            second_line = f.readline().upper()
+            third_line = f.readline().upper()
 
         # dmg/csmip both have the same markers so is_usc must be checked
         if first_line.find(V1_MARKER) >= 0 and not is_usc(filename):
@@ -134,7 +136,8 @@ def read_dmg(filename, **kwargs):
         CSMIP is synonymous to as DMG in this reader.
 
     Args:
-        filename (str): Path to possible DMG data file.
+        filename (str, bytes, or file-like): Path to possible DMG data
+            file, or its contents.
         kwargs (ref):
             units (str): String determining which timeseries is return. Valid
                     options include 'acc', 'vel', 'disp'. Default is 'acc'.
@@ -147,7 +150,8 @@ def read_dmg(filename, **kwargs):
     logging.debug("Starting read_dmg.")
     if not is_dmg(filename):
         raise Exception(
-            '%s is not a valid DMG strong motion data file.' % filename)
+            '%s is not a valid DMG strong motion data file.'
+            % describe_source(filename))
 
     # Check for units and location
     units = kwargs.get('units', 'acc')
@@ -156,8 +160,12 @@ def read_dmg(filename, **kwargs):
     if units not in UNITS:
         raise Exception('DMG: Not a valid choice of units.')
 
+    # Read the file once, the channels are parsed from its lines
+    lines = read_lines(filename)
+    source_file = get_source_file(filename)
+
     # Check for DMG format and determine volume type
-    line = open(filename, 'rt').readline()
+    line = lines[0]
     if is_dmg(filename):
         if line.lower().find('uncorrected') >= 0:
             reader = 'V1'
@@ -166,9 +174,7 @@ def read_dmg(filename, **kwargs):
         elif line.lower().find('response') >= 0:
             reader = 'V3'
 
-    # Count the number of lines in the file
-    with open(filename) as f:
-        line_count = sum(1 for _ in f)
+    line_count = len(lines)
 
     # Read as many channels as are present in the file
     line_offset = 0
@@ -176,12 +182,14 @@ def read_dmg(filename, **kwargs):
     while line_offset < line_count:
         if reader == 'V2':
             traces, line_offset = _read_volume_two(
-                filename, line_offset, location=location, units=units)
+                lines, line_offset, source_file, location=location,
+                units=units)
             if traces is not None:
                 trace_list += traces
         elif reader == 'V1':
             traces, line_offset = _read_volume_one(
-                filename, line_offset, location=location, units=units)
+                lines, line_offset, source_file, location=location,
+                units=units)
             if traces is not None:
                 trace_list += traces
         else:
@@ -197,35 +205,33 @@ def read_dmg(filename, **kwargs):
     return [stream]
 
 
-def _read_volume_one(filename, line_offset, location='', units='acc'):
+def _read_volume_one(filelines, line_offset, source_file, location='',
+                     units='acc'):
     """Read channel data from DMG Volume 1 text file.
 
     Args:
-        filename (str): Input DMG V1 filename.
+        filelines (list): Lines of the DMG V1 file.
         line_offset (int): Line offset to beginning of channel text block.
+        source_file (str): Name of the DMG V1 file.
         units (str): units to get
     Returns:
         tuple: (list of obspy Trace, int line offset)
     """
     # Parse the header portion of the file
-    try:
-        with open(filename, 'rt') as f:
-            for _ in range(line_offset):
-                next(f)
-            lines = [next(f) for x in range(V1_TEXT_HDR_ROWS)]
+    lines = filelines[line_offset:line_offset + V1_TEXT_HDR_ROWS]
     # Accounts for blank lines at end of files
-    except StopIteration:
+    if len(lines) < V1_TEXT_HDR_ROWS:
         return (None, 1 + line_offset)
 
     unit = _get_units(lines[11])
     # read in lines of integer data
     skip_rows = V1_TEXT_HDR_ROWS + line_offset
-    int_data = _read_lines(skip_rows, V1_INT_HDR_ROWS, V2_INT_FMT, filename)
+    int_data = _read_lines(skip_rows, V1_INT_HDR_ROWS, V2_INT_FMT, filelines)
     int_data = int_data[0:100].astype(np.int32)
 
     # read in lines of float data
     skip_rows += V1_INT_HDR_ROWS
-    flt_data = _read_lines(skip_rows, V1_REAL_HDR_ROWS, V2_REAL_FMT, filename)
+    flt_data = _read_lines(skip_rows, V1_REAL_HDR_ROWS, V2_REAL_FMT, filelines)
     skip_rows += V1_REAL_HDR_ROWS
 
     # according to the powers that defined the Network.Station.Channel.Location
@@ -235,22 +241,18 @@ def _read_volume_one(filename, line_offset, location='', units='acc'):
 
     hdr = _get_header_info_v1(
         int_data, flt_data, lines, 'V1', location=location)
-    head, tail = os.path.split(filename)
-    hdr['standard']['source_file'] = tail or os.path.basename(head)
+    hdr['standard']['source_file'] = source_file
 
     # sometimes (??) a line of text is inserted in between the float header and
     # the beginning of the data. Let's check for this...
-    with open(filename, 'rt') as f:
-        for _ in range(skip_rows):
-            next(f)
-        test_line = f.readline()
+    test_line = filelines[skip_rows] if skip_rows < len(filelines) else ''
 
     has_text = re.search('[A-Z]+|[a-z]+', test_line) is not None
     if has_text:
         skip_rows += 1
         widths = [9] * 8
         max_rows = int(np.ceil(hdr['npts'] / 8))
-        data = _read_lines(skip_rows, max_rows, widths, filename)
+        data = _read_lines(skip_rows, max_rows, widths, filelines)
         acc_data = data[:hdr['npts']]
         evenly_spaced = True
         # Sometimes, npts is incrrectly specified, leading to nans
@@ -263,7 +265,7 @@ def _read_volume_one(filename, line_offset, location='', units='acc'):
         # acceleration data is interleaved between time data
         max_rows = int(np.ceil(hdr['npts'] / 5))
         widths = [7] * 10
-        data = _read_lines(skip_rows, max_rows, widths, filename)
+        data = _read_lines(skip_rows, max_rows, widths, filelines)
         acc_data = data[1::2][:hdr['npts']]
         times = data[0::2][:hdr['npts']]
         evenly_spaced = is_evenly_spaced(times)
@@ -288,33 +290,31 @@ def _read_volume_one(filename, line_offset, location='', units='acc'):
     return (traces, new_offset)
 
 
-def _read_volume_two(filename, line_offset, location='', units='acc'):
+def _read_volume_two(filelines, line_offset, source_file, location='',
+                     units='acc'):
     """Read channel data from DMG text file.
 
     Args:
-        filename (str): Input DMG V2 filename.
+        filelines (list): Lines of the DMG V2 file.
         line_offset (int): Line offset to beginning of channel text block.
+        source_file (str): Name of the DMG V2 file.
         units (str): units to get
     Returns:
         tuple: (list of obspy Trace, int line offset)
     """
-    try:
-        with open(filename, 'rt') as f:
-            for _ in range(line_offset):
-                next(f)
-            lines = [next(f) for x in range(V2_TEXT_HDR_ROWS)]
+    lines = filelines[line_offset:line_offset + V2_TEXT_HDR_ROWS]
     # Accounts for blank lines at end of files
-    except StopIteration:
+    if len(lines) < V2_TEXT_HDR_ROWS:
         return (None, 1 + line_offset)
 
     # read in lines of integer data
     skip_rows = V2_TEXT_HDR_ROWS + line_offset
-    int_data = _read_lines(skip_rows, V2_INT_HDR_ROWS, V2_INT_FMT, filename)
+    int_data = _read_lines(skip_rows, V2_INT_HDR_ROWS, V2_INT_FMT, filelines)
     int_data = int_data[0:100].astype(np.int32)
 
     # read in lines of float data
     skip_rows += V2_INT_HDR_ROWS
-    flt_data = _read_lines(skip_rows, V2_REAL_HDR_ROWS, V2_REAL_FMT, filename)
+    flt_data = _read_lines(skip_rows, V2_REAL_HDR_ROWS, V2_REAL_FMT, filelines)
     flt_data = flt_data[:100]
     skip_rows += V2_REAL_HDR_ROWS
 
@@ -323,15 +323,14 @@ def _read_volume_two(filename, line_offset, location='', units='acc'):
     # including csmip/dmg here, don't always provide this.  We'll flag it as
     # "--".
     hdr = _get_header_info(int_data, flt_data, lines, 'V2', location=location)
-    head, tail = os.path.split(filename)
-    hdr['standard']['source_file'] = tail or os.path.basename(head)
+    hdr['standard']['source_file'] = source_file
 
     traces = []
     # read acceleration data
     if hdr['npts'] > 0:
         acc_rows, acc_fmt, unit = _get_data_format(
-            filename, skip_rows, hdr['npts'])
-        acc_data = _read_lines(skip_rows + 1, acc_rows, acc_fmt, filename)
+            filelines, skip_rows, hdr['npts'])
+        acc_data = _read_lines(skip_rows + 1, acc_rows, acc_fmt, filelines)
         acc_data = acc_data[:hdr['npts']]
         if unit in UNIT_CONVERSIONS:
             acc_data *= UNIT_CONVERSIONS[unit]
@@ -359,8 +358,8 @@ def _read_volume_two(filename, line_offset, location='', units='acc'):
     vel_hdr['npts'] = int_data[63]
     if vel_hdr['npts'] > 0:
         vel_rows, vel_fmt, unit = _get_data_format(
-            filename, skip_rows, vel_hdr['npts'])
-        vel_data = _read_lines(skip_rows + 1, vel_rows, vel_fmt, filename)
+            filelines, skip_rows, vel_hdr['npts'])
+        vel_data = _read_lines(skip_rows + 1, vel_rows, vel_fmt, filelines)
         vel_data = vel_data[:vel_hdr['npts']]
         skip_rows += int(vel_rows) + 1
 
@@ -370,8 +369,8 @@ def _read_volume_two(filename, line_offset, location='', units='acc'):
     disp_hdr['npts'] = int_data[65]
     if disp_hdr['npts'] > 0:
         disp_rows, disp_fmt, unit = _get_data_format(
-            filename, skip_rows, disp_hdr['npts'])
-        disp_data = _read_lines(skip_rows + 1, disp_rows, disp_fmt, filename)
+            filelines, skip_rows, disp_hdr['npts'])
+        disp_data = _read_lines(skip_rows + 1, disp_rows, disp_fmt, filelines)
         disp_data = disp_data[:disp_hdr['npts']]
         skip_rows += int(disp_rows) + 1
 
@@ -767,32 +766,32 @@ def _get_channel(angle, sampling_rate):
     return channel
 
 
-def _read_lines(skip_rows, max_rows, widths, filename):
+def _read_lines(skip_rows, max_rows, widths, lines):
     """Read lines of headers and.
 
     Args:
         skip_rows (int): Number of rows to skip.
-        filename (str): Path to possible DMG data file.
+        lines (list): Lines of the DMG data file.
     Returns:
         array-like: List of comments or array of data.
     """
-    data_arr = np.genfromtxt(filename, skip_header=skip_rows,
+    data_arr = np.genfromtxt(lines, skip_header=skip_rows,
                              max_rows=max_rows, dtype=np.float64,
                              delimiter=widths).flatten()
     return data_arr
 
 
-def _get_data_format(filename, skip_rows, npts):
+def _get_data_format(lines, skip_rows, npts):
     """Read data header and return the format.
 
     Args:
         skip_rows (int): Number of rows to skip.
-        filename (str): Path to possible DMG data file.
+        lines (list): Lines of the DMG data file.
         npts (int): Number of data points.
     Returns:
         tuple: (int number of rows, list list of widths).
     """
-    fmt_line = np.genfromtxt(filename, skip_header=skip_rows,
+    fmt_line = np.genfromtxt(lines, skip_header=skip_rows,
                              max_rows=1, dtype=str)
     fmt = fmt_line[-1]
     # Check for a format in header or use default
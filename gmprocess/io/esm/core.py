@@ -12,6 +12,8 @@ import numpy as np
 # local imports
 from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
 from gmprocess.stationstream import StationStream
+from gmprocess.io.utils import (is_path, read_lines, get_source_file,
+                                describe_source)
 
 TEXT_HDR_ROWS = 64
 # 20190728_160919.870
@@ -30,24 +32,22 @@ def is_esm(filename):
     """Check to see if file is an ESM strong motion file.
 
     Args:
-        filename (str): Path to possible ESM strong motion file.
+        filename (str, bytes, or file-like): Path to possible ESM strong
+            motion file, or its contents.
     Returns:
         bool: True if ESM, False otherwise.
     """
     logging.debug("Checking if format is esm.")
-    if not os.path.isfile(filename):
+    if is_path(filename) and not os.path.isfile(filename):
         return False
     try:
-        open(filename, 'rt').read(os.stat(filename).st_size)
+        lines = read_lines(filename)
     except UnicodeDecodeError:
         return False
-    try:
-        with open(filename, 'rt') as f:
-            lines = [next(f) for x in range(TEXT_HDR_ROWS)]
-            if lines[0].startswith(HDR1) and lines[1].startswith(HDR2):
-                return True
-    except Exception:
+    if len(lines) < TEXT_HDR_ROWS:
         return False
+    if lines[0].startswith(HDR1) and lines[1].startswith(HDR2):
+        return True
     return False
 
 
@@ -55,7 +55,8 @@ def read_esm(filename):
     """Read European ESM strong motion file.
 
     Args:
-        filename (str): Path to possible ESM data file.
+        filename (str, bytes, or file-like): Path to possible ESM data
+            file, or its contents.
         kwargs (ref): Other arguments will be ignored.
     Returns:
         Stream: Obspy Stream containing one channels of acceleration data
@@ -63,14 +64,14 @@ def read_esm(filename):
     """
     logging.debug("Starting read_esm.")
     if not is_esm(filename):
-        raise Exception('%s is not a valid ESM file' % filename)
+        raise Exception('%s is not a valid ESM file'
+                        % describe_source(filename))
 
     # Parse the header portion of the file
     header = {}
-    with open(filename, 'rt') as f:
-        lines = [next(f) for x in range(TEXT_HDR_ROWS)]
+    lines = read_lines(filename)
 
-    for line in lines:
+    for line in lines[:TEXT_HDR_ROWS]:
         parts = line.split(':')
         key = parts[0].strip()
         value = ':'.join(parts[1:]).strip()
@@ -94,8 +95,7 @@ def read_esm(filename):
     stats['starttime'] = datetime.strptime(stimestr, TIMEFMT)
 
     # fill in standard fields
-    head, tail = os.path.split(filename)
-    standard['source_file'] = tail or os.path.basename(head)
+    standard['source_file'] = get_source_file(filename)
     standard['source'] = SRC
     standard['source_format'] = FORMAT
     standard['horizontal_orientation'] = np.nan
@@ -133,7 +133,7 @@ def read_esm(filename):
     coordinates['elevation'] = float(header['STATION_ELEVATION_M'])
 
     # read in the data
-    data = np.genfromtxt(filename, skip_header=TEXT_HDR_ROWS)
+    data = np.genfromtxt(lines, skip_header=TEXT_HDR_ROWS)
 
     # create a Trace from the data and metadata
     stats['standard'] = standard
@@ -15,6 +15,7 @@ from gmprocess.stationtrace import StationTrace
 from gmprocess.stationstream import StationStream
 from gmprocess.io.seedname import get_channel_name, is_channel_north
 from gmprocess.config import get_config
+from gmprocess.io.utils import is_path
 
 IGNORE_FORMATS = ['KNET']
 EXCLUDE_PATTERNS = ['*.*.??.LN?']
@@ -84,10 +85,11 @@ def is_fdsn(filename):
     Args:
         filename (str): Path to possible Obspy format.
     Returns:
-        bool: True if obspy supported, otherwise False.
+        bool: True if obspy supported, otherwise False (the data are only
+        read from a path, next to their StationXML file).
     """
     logging.debug("Checking if format is Obspy.")
-    if not os.path.isfile(filename):
+    if not is_path(filename) or not os.path.isfile(filename):
         return False
     try:
         stream = read(filename)
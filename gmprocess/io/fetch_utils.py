@@ -3,34 +3,23 @@ import os.path
 import json
 import logging
 import warnings
-import glob
+from concurrent.futures import ProcessPoolExecutor
 
 # third party imports
-from obspy.geodetics.base import locations2degrees
-from obspy.taup import TauPyModel
-import matplotlib.pyplot as plt
-import matplotlib.lines as mlines
 import pandas as pd
-from openpyxl import load_workbook
 import yaml
-from h5py.h5py_warnings import H5pyDeprecationWarning
 import numpy as np
-from impactutils.mapping.city import Cities
-from impactutils.mapping.mercatormap import MercatorMap
-from impactutils.mapping.scalebar import draw_scale
-from cartopy import feature as cfeature
 
 # local imports
 from gmprocess.event import get_event_object
-from gmprocess.config import get_config, update_dict
-from gmprocess.stream import streams_to_dataframe
-from gmprocess.io.asdf.stream_workspace import StreamWorkspace
-from gmprocess.io.read_directory import directory_to_streams
-from gmprocess.io.global_fetcher import fetch_data
-from gmprocess.streamcollection import StreamCollection
+from gmprocess.config import get_config, update_dict, read_config
 from gmprocess.event import ScalarEvent
 from gmprocess.constants import RUPTURE_FILE
 
+# The event and config helpers in this module are used on every run of
+# gmprocess, so the fetchers, the workspace, and the mapping and plotting
+# libraries are imported by the functions that need them.
+
 TIMEFMT2 = '%Y-%m-%dT%H:%M:%S.%f'
 
 
@@ -66,6 +55,12 @@ def download(event, event_dir, config, directory):
             - StreamCollection: Raw data StationStreams.
             - str: Path to the rupture file.
     """
+    from h5py.h5py_warnings import H5pyDeprecationWarning
+    from gmprocess.io.asdf.stream_workspace import StreamWorkspace
+    from gmprocess.io.global_fetcher import fetch_data
+    from gmprocess.io.read_directory import directory_to_streams
+    from gmprocess.streamcollection import StreamCollection
+
     # Make raw directory
     rawdir = get_rawdir(event_dir)
 
@@ -91,13 +86,6 @@ def download(event, event_dir, config, directory):
         tcollection = StreamCollection(streams, **config['duplicate'])
         create_event_file(event, event_dir)
 
-    # Plot the raw waveforms
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore", category=UserWarning)
-        pngfiles = glob.glob(os.path.join(rawdir, '*.png'))
-        if not len(pngfiles):
-            plot_raw(rawdir, tcollection, event)
-
     # Create the workspace file and put the unprocessed waveforms in it
     workname = os.path.join(event_dir, 'workspace.hdf')
 
@@ -161,6 +149,13 @@ def parse_event_file(eventfile):
 
 
 def draw_stations_map(pstreams, event, event_dir):
+    import matplotlib.pyplot as plt
+    import matplotlib.lines as mlines
+    from cartopy import feature as cfeature
+    from impactutils.mapping.city import Cities
+    from impactutils.mapping.mercatormap import MercatorMap
+    from impactutils.mapping.scalebar import draw_scale
+
     # draw map of stations and cities and stuff
     lats = np.array([stream[0].stats.coordinates['latitude']
                      for stream in pstreams])
@@ -408,6 +403,9 @@ def save_shakemap_amps(processed, event, event_dir):
     Returns:
         str: Path to output amps spreadsheet.
     """
+    from openpyxl import load_workbook
+    from gmprocess.stream import streams_to_dataframe
+
     ampfile_name = None
     if processed.n_passed:
         dataframe = streams_to_dataframe(processed,
@@ -451,18 +449,22 @@ def update_config(custom_cfg_file):
     if not os.path.isfile(custom_cfg_file):
         return config
     try:
-        with open(custom_cfg_file, 'rt') as f:
-            custom_cfg = yaml.load(f, Loader=yaml.FullLoader)
-            update_dict(config, custom_cfg)
-    except yaml.parser.ParserError as pe:
+        custom_cfg = read_config(custom_cfg_file)
+    except (yaml.parser.ParserError, ValueError):
         return None
+    update_dict(config, custom_cfg)
 
     return config
 
 
-def plot_raw(rawdir, tcollection, event):
+def plot_raw(rawdir, tcollection, event, processes=None, model='iasp91',
+             cache_dir=None):
     """Make PNG plots of a collection of raw waveforms.
 
+    The P-wave arrival times are interpolated from a (cached) travel time
+    grid, the waveforms are decimated to their min/max envelope at about
+    the resolution of the plots, and the plots are rendered in parallel.
+
     Args:
         rawdir (str):
             Directory where PNG files should be saved.
@@ -470,55 +472,102 @@ def plot_raw(rawdir, tcollection, event):
             Sequence of streams.
         event (ScalarEvent):
             Event object.
+        processes (int):
+            Number of processes used to render the plots. Default is the
+            number of CPUs.
+        model (str):
+            Name of the TauPyModel used for the P-wave arrival times.
+        cache_dir (str):
+            Directory in which the travel time grids are cached. Default is
+            ~/.gmprocess/travel_times.
 
     """
-    model = TauPyModel(model="iasp91")
-    source_depth = event.depth_km
-    if source_depth < 0:
-        source_depth = 0
-    eqlat = event.latitude
-    eqlon = event.longitude
-    for stream in tcollection:
-        stlat = stream[0].stats.coordinates['latitude']
-        stlon = stream[0].stats.coordinates['longitude']
-        dist = float(locations2degrees(eqlat, eqlon, stlat, stlon))
-        try:
-            arrivals = model.get_travel_times(
-                source_depth_in_km=source_depth,
-                distance_in_degree=dist,
-                phase_list=['P', 'p', 'Pn'])
-            arrival = arrivals[0]
-            arrival_time = arrival.time
-        except Exception as e:
-            fmt = 'Exception "%s" generated by get_travel_times() dist=%.3f depth=%.1f'
-            logging.warning(fmt % (str(e), dist, source_depth))
-            arrival_time = 0.0
+    from obspy.geodetics.base import locations2degrees
+    from gmprocess.phase import interpolate_travel_times
+    from gmprocess.plot import decimate_minmax
+
+    if not len(tcollection):
+        return
+    lats = [stream[0].stats.coordinates['latitude'] for stream in tcollection]
+    lons = [stream[0].stats.coordinates['longitude']
+            for stream in tcollection]
+    dists = locations2degrees(event.latitude, event.longitude,
+                              np.array(lats), np.array(lons))
+    try:
+        arrival_times = interpolate_travel_times(
+            np.full(len(dists), event.depth_km), dists, model,
+            cache_dir=cache_dir, processes=processes)
+    except Exception as e:
+        logging.warning('Exception "%s" generated when computing travel '
+                        'times for the raw waveform plots.' % str(e))
+        arrival_times = np.full(len(dists), np.nan)
+    # Plot the arrival at the origin time when there is no P-wave arrival
+    arrival_times = np.nan_to_num(arrival_times)
+
+    jobs = []
+    for stream, arrival_time in zip(tcollection, arrival_times):
         ptime = arrival_time + (event.time - stream[0].stats.starttime)
         outfile = os.path.join(rawdir, '%s.png' % stream.get_id())
-
-        fig, axeslist = plt.subplots(nrows=3, ncols=1, figsize=(12, 6))
-        for ax, trace in zip(axeslist, stream):
-            ax.plot(trace.times(), trace.data, color='k')
-            ax.set_xlabel('seconds since start of trace')
-            ax.set_title('')
-            ax.axvline(ptime, color='r')
-            ax.set_xlim(left=0, right=trace.times()[-1])
+        traces = []
+        for trace in stream:
+            times = trace.times()
             legstr = '%s.%s.%s.%s' % (trace.stats.network,
                                       trace.stats.station,
                                       trace.stats.location,
                                       trace.stats.channel)
-            ax.legend(labels=[legstr], frameon=True, loc='upper left')
             tbefore = event.time + arrival_time < trace.stats.starttime + 1.0
             tafter = event.time + arrival_time > trace.stats.endtime - 1.0
-            if tbefore or tafter:
-                legstr = 'P arrival time %.1f seconds' % ptime
-                left, right = ax.get_xlim()
-                xloc = left + (right - left) / 20
-                bottom, top = ax.get_ylim()
-                yloc = bottom + (top - bottom) / 10
-                ax.text(xloc, yloc, legstr, color='r')
-        plt.savefig(outfile, bbox_inches='tight')
-        plt.close()
+            traces.append((legstr, times[-1], tbefore or tafter) +
+                          decimate_minmax(times, trace.data))
+        jobs.append((outfile, ptime, traces))
+
+    if processes is None:
+        processes = os.cpu_count()
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(
+                max_workers=min(processes, len(jobs))) as executor:
+            list(executor.map(_plot_raw_stream, jobs))
+    else:
+        for job in jobs:
+            _plot_raw_stream(job)
+
+
+def _plot_raw_stream(job):
+    """Render the raw waveform plot of one stream (see plot_raw).
+
+    The figure is drawn with the Agg canvas directly, so that no pyplot
+    state is shared between the worker processes.
+
+    Args:
+        job (tuple):
+            Output file, P-wave arrival time (seconds since the start of the
+            stream), and a list with, for each trace, the legend string,
+            the duration, whether the arrival is outside of the trace, and
+            the (decimated) times and data.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    outfile, ptime, traces = job
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)
+    axeslist = fig.subplots(nrows=3, ncols=1)
+    for ax, trace in zip(axeslist, traces):
+        legstr, duration, p_outside, times, data = trace
+        ax.plot(times, data, color='k')
+        ax.set_xlabel('seconds since start of trace')
+        ax.set_title('')
+        ax.axvline(ptime, color='r')
+        ax.set_xlim(left=0, right=duration)
+        ax.legend(labels=[legstr], frameon=True, loc='upper left')
+        if p_outside:
+            legstr = 'P arrival time %.1f seconds' % ptime
+            left, right = ax.get_xlim()
+            xloc = left + (right - left) / 20
+            bottom, top = ax.get_ylim()
+            yloc = bottom + (top - bottom) / 10
+            ax.text(xloc, yloc, legstr, color='r')
+    fig.savefig(outfile, bbox_inches='tight')
 
 
 def get_rupture_file(event_dir):
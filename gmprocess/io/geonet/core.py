@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 
 # stdlib imports
-import os
 from datetime import datetime
 import re
 import logging
@@ -12,6 +11,8 @@ import numpy as np
 
 # local imports
 from gmprocess.io.seedname import get_channel_name, get_units_type
+from gmprocess.io.utils import (open_text, read_lines, get_source_file,
+                                describe_source)
 from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
 from gmprocess.stationstream import StationStream
 
@@ -37,13 +38,15 @@ def is_geonet(filename):
     """Check to see if file is a New Zealand GNS V1 or V2 strong motion file.
 
     Args:
-        filename (str): Path to possible GNS V1/V2 data file.
+        filename (str, bytes, or file-like): Path to possible GNS V1/V2
+            data file, or its contents.
     Returns:
         bool: True if GNS V1/V2, False otherwise.
     """
     logging.debug("Checking if format is geonet.")
     try:
-        line = open(filename, 'rt').readline()
+        with open_text(filename) as f:
+            line = f.readline()
         if line.find('GNS Science') >= 0:
             c1 = line.find('Corrected accelerogram') >= 0
             c2 = line.find('Uncorrected accelerogram') >= 0
@@ -62,7 +65,8 @@ def read_geonet(filename, **kwargs):
     This will be set to either "V1" or "V2".
 
     Args:
-        filename (str): Path to possible GNS V1/V2 data file.
+        filename (str, bytes, or file-like): Path to possible GNS V1/V2
+            data file, or its contents.
         kwargs (ref): Other arguments will be ignored.
 
     Returns:
@@ -72,10 +76,12 @@ def read_geonet(filename, **kwargs):
     logging.debug("Starting read_geonet.")
     if not is_geonet(filename):
         raise Exception('%s is not a valid GEONET strong motion data file.'
-                        % filename)
-    trace1, offset1, _ = _read_channel(filename, 0)
-    trace2, offset2, _ = _read_channel(filename, offset1)
-    trace3, _, _ = _read_channel(filename, offset2)
+                        % describe_source(filename))
+    lines = read_lines(filename)
+    source_file = get_source_file(filename)
+    trace1, offset1, _ = _read_channel(lines, 0, source_file)
+    trace2, offset2, _ = _read_channel(lines, offset1, source_file)
+    trace3, _, _ = _read_channel(lines, offset2, source_file)
 
     # occasionally, geonet horizontal components are
     # identical.  To handle this, we'll set the second
@@ -108,20 +114,18 @@ def read_geonet(filename, **kwargs):
     return [stream]
 
 
-def _read_channel(filename, line_offset):
+def _read_channel(filelines, line_offset, source_file):
     """Read channel data from GNS V1 text file.
 
     Args:
-        filename (str): Input GNS V1 filename.
+        filelines (list): Lines of the GNS V1 file.
         line_offset (int): Line offset to beginning of channel text block.
+        source_file (str): Name of the GNS V1 file.
     Returns:
         tuple: (obspy Trace, int line offset)
     """
     # read station and location strings from text header
-    with open(filename, 'rt') as f:
-        for _ in range(line_offset):
-            next(f)
-        lines = [next(f) for x in range(TEXT_HDR_ROWS)]
+    lines = filelines[line_offset:line_offset + TEXT_HDR_ROWS]
 
     # this code supports V1 and V2 format files.  Which one is this?
     data_format = 'V2'
@@ -144,15 +148,14 @@ def _read_channel(filename, line_offset):
 
     # read floating point header array
     skip_header = line_offset + TEXT_HDR_ROWS
-    hdr_data = np.genfromtxt(filename, skip_header=skip_header,
+    hdr_data = np.genfromtxt(filelines, skip_header=skip_header,
                              max_rows=FP_HDR_ROWS)
 
     # parse header dictionary from float header array
     hdr = _read_header(hdr_data, station, name,
                        component, data_format,
                        instrument, resolution)
-    head, tail = os.path.split(filename)
-    hdr['standard']['source_file'] = tail or os.path.basename(head)
+    hdr['standard']['source_file'] = source_file
 
     # according to the powers that defined the Network.Station.Channel.Location
     # "standard", Location is a two character field.  Most data providers,
@@ -162,7 +165,7 @@ def _read_channel(filename, line_offset):
     skip_header2 = line_offset + TEXT_HDR_ROWS + FP_HDR_ROWS
     widths = [8] * COLS_PER_ROW
     nrows = int(np.ceil(hdr['npts'] / COLS_PER_ROW))
-    data = np.genfromtxt(filename, skip_header=skip_header2,
+    data = np.genfromtxt(filelines, skip_header=skip_header2,
                          max_rows=nrows, filling_values=np.nan,
                          delimiter=widths)
     data = data.flatten()
@@ -179,7 +182,7 @@ def _read_channel(filename, line_offset):
             nvel_rows2 = 0
         skip_header_vel = line_offset + TEXT_HDR_ROWS + FP_HDR_ROWS + nrows
         widths = [8] * COLS_PER_ROW
-        velocity = np.genfromtxt(filename, skip_header=skip_header_vel,
+        velocity = np.genfromtxt(filelines, skip_header=skip_header_vel,
                                  max_rows=nvel_rows, filling_values=np.nan,
                                  delimiter=widths)
         velocity = velocity.flatten()
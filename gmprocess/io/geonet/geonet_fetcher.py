@@ -211,8 +211,6 @@ class GeoNetFetcher(object):
             except ftplib.error_perm as msg:
                 raise Exception(msg)
 
-        # cd to the desired output folder
-        os.chdir(rawdir)
         datafiles = []
 
         # we cannot depend on the time given to us by the GeoNet catalog to match
@@ -244,7 +242,7 @@ class GeoNetFetcher(object):
                     if not ftpfile.endswith('V1A'):
 
                         continue
-                    localfile = os.path.join(os.getcwd(), ftpfile)
+                    localfile = os.path.join(rawdir, ftpfile)
                     if localfile in datafiles:
                         continue
                     datafiles.append(localfile)
@@ -1,14 +1,24 @@
 # stdlib imports
 import importlib
-import pkg_resources
 import inspect
 import os.path
 import logging
+import queue
+import threading
+from time import monotonic
 
 # local imports
 from .fetcher import DataFetcher
 from gmprocess.config import get_config
 
+# Default time (seconds) that a fetcher is given to retrieve its data; can
+# be set for each fetcher with the 'timeout' option of its config section.
+FETCH_TIMEOUT = 3600
+
+# Registry of the DataFetcher subclasses, built on the first call to
+# find_fetchers.
+_FETCHERS = None
+
 
 def fetch_data(time, lat, lon,
                depth, magnitude,
@@ -65,40 +75,114 @@ def fetch_data(time, lat, lon,
             continue
         xmin, xmax, ymin, ymax = fetchinst.BOUNDS
         if (xmin < lon < xmax) and (ymin < lat < ymax):
-            instances.append(fetchinst)
+            instances.append((fetchname, fetchinst))
 
     efmt = '%s M%.1f (%.4f,%.4f)'
     etpl = (time, magnitude, lat, lon)
     esummary = efmt % etpl
     streams = []
-    for fetcher in instances:
-        if 'FDSN' in str(fetcher):
-            tstreams = fetcher.retrieveData()
-            if len(streams):
-                streams = streams + tstreams
-            else:
-                streams = tstreams
-
-        else:
-            events = fetcher.getMatchingEvents(solve=True)
-            if not len(events):
-                msg = 'No event matching %s found by class %s'
-                logging.warn(msg % (esummary, str(fetcher)))
-                continue
-            tstreams = fetcher.retrieveData(events[0])
-            if len(streams):
-                streams = streams + tstreams
-            else:
-                streams = tstreams
-
-    if streams is None:
-        streams = []
+    if not len(instances):
+        return (streams, errors)
+
+    # The data centers are independent, so the fetchers run concurrently
+    # and the streams are merged as each one finishes. A fetcher that fails
+    # or runs past its timeout is skipped and reported with the errors. The
+    # fetchers run on daemon threads so that one that hangs is abandoned:
+    # its result is discarded and it does not keep the interpreter from
+    # exiting (the workers of a ThreadPoolExecutor are joined at exit).
+    fetch_config = config.get('fetchers', {})
+    results = queue.Queue()
+    pending = {}
+    for fetchname, fetchinst in instances:
+        pending[fetchname] = fetch_config.get(fetchname, {}).get(
+            'timeout', FETCH_TIMEOUT)
+        thread = threading.Thread(
+            target=_run_fetcher,
+            args=(fetchname, fetchinst, esummary, results),
+            name='fetcher-%s' % fetchname, daemon=True)
+        thread.start()
+    start = monotonic()
+    while pending:
+        remaining = min(pending.values()) - (monotonic() - start)
+        try:
+            fetchname, tstreams, error = results.get(
+                timeout=max(remaining, 0))
+        except queue.Empty:
+            fetchname = None
+        # results of fetchers that already timed out are ignored
+        if fetchname in pending:
+            del pending[fetchname]
+            if error is not None:
+                fmt = 'Fetcher %s failed to retrieve data, due to error\n "%s"'
+                msg = fmt % (fetchname, str(error))
+                logging.warn(msg)
+                errors.append(msg)
+            elif tstreams is not None and len(tstreams):
+                if len(streams):
+                    streams = streams + tstreams
+                else:
+                    streams = tstreams
+        elapsed = monotonic() - start
+        for fetchname, timeout in list(pending.items()):
+            if elapsed >= timeout:
+                del pending[fetchname]
+                msg = ('Fetcher %s did not finish within %s seconds, '
+                       'skipping its data.' % (fetchname, timeout))
+                logging.warn(msg)
+                errors.append(msg)
+
     return (streams, errors)
 
 
+def _run_fetcher(fetchname, fetcher, esummary, results):
+    """Retrieve the data of one fetcher and put it on the results queue.
+
+    Args:
+        fetchname (str):
+            Name of the fetcher class.
+        fetcher (DataFetcher):
+            Fetcher instance.
+        esummary (str):
+            Summary of the event for the log messages.
+        results (queue.Queue):
+            Queue that receives a (fetchname, streams, error) tuple, where
+            error is the exception raised by the fetcher, or None.
+    """
+    try:
+        results.put((fetchname, _retrieve_data(fetcher, esummary), None))
+    except Exception as e:
+        results.put((fetchname, None, e))
+
+
+def _retrieve_data(fetcher, esummary):
+    """Retrieve the data of one fetcher (see fetch_data).
+
+    Args:
+        fetcher (DataFetcher):
+            Fetcher instance.
+        esummary (str):
+            Summary of the event for the log messages.
+
+    Returns:
+        StreamCollection: Retrieved data, or None if the fetcher found no
+        matching event.
+    """
+    if 'FDSN' in str(fetcher):
+        return fetcher.retrieveData()
+    events = fetcher.getMatchingEvents(solve=True)
+    if not len(events):
+        msg = 'No event matching %s found by class %s'
+        logging.warn(msg % (esummary, str(fetcher)))
+        return None
+    return fetcher.retrieveData(events[0])
+
+
 def find_fetchers(lat, lon):
     """Create a dictionary of classname:class to be used in main().
 
+    The modules under gmprocess/io are only searched for fetchers on the
+    first call, later calls return a copy of the same registry.
+
     Args:
         lat (float): Origin latitude.
         lon (float): Origin longitude.
@@ -107,10 +191,20 @@ def find_fetchers(lat, lon):
         dict: Dictionary of classname:class where each class
             is a subclass of shakemap.coremods.base.CoreModule.
     """
+    global _FETCHERS
+    if _FETCHERS is None:
+        _FETCHERS = _gather_fetchers()
+    return dict(_FETCHERS)
+
+
+def _gather_fetchers():
+    """Import the modules under gmprocess/io and collect their fetchers.
 
+    Returns:
+        dict: Dictionary of classname:class of the DataFetcher subclasses.
+    """
     fetchers = {}
-    root = os.path.abspath(
-        pkg_resources.resource_filename('gmprocess', 'io'))
+    root = os.path.dirname(os.path.abspath(__file__))
     for (rootdir, dirs, files) in os.walk(root):
         if rootdir == root:
             continue
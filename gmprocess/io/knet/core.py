@@ -14,6 +14,8 @@ import numpy as np
 from gmprocess.io.seedname import get_channel_name, get_units_type
 from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
 from gmprocess.stationstream import StationStream
+from gmprocess.io.utils import (is_path, read_lines, get_source_file,
+                                describe_source)
 
 TEXT_HDR_ROWS = 17
 TIMEFMT = '%Y/%m/%d %H:%M:%S'
@@ -30,44 +32,55 @@ def is_knet(filename):
     """Check to see if file is a Japanese KNET strong motion file.
 
     Args:
-        filename (str): Path to possible GNS V1 data file.
+        filename (str, bytes, or file-like):
+            Path to possible KNET data file, or its contents as bytes or a
+            binary file-like object.
     Returns:
-        bool: True if GNS V1, False otherwise.
+        bool: True if KNET, False otherwise.
     """
     logging.debug("Checking if format is knet.")
-    if not os.path.isfile(filename):
-        return False
+    lines = _read_lines(filename)
+    return lines is not None and _is_knet_lines(lines)
+
+
+def _read_lines(filename):
+    # The lines of the file, or None if it is not a text file
+    if is_path(filename) and not os.path.isfile(filename):
+        return None
     try:
-        open(filename, 'rt').read(os.stat(filename).st_size)
+        return read_lines(filename)
     except UnicodeDecodeError:
-        return False
-    try:
-        with open(filename, 'rt') as f:
-            lines = [next(f) for x in range(TEXT_HDR_ROWS)]
-            if lines[0].startswith(HDR1) and lines[5].startswith(HDR2):
-                return True
-    except Exception:
-        return False
-    return False
+        return None
+
+
+def _is_knet_lines(lines):
+    return (len(lines) >= TEXT_HDR_ROWS and lines[0].startswith(HDR1)
+            and lines[5].startswith(HDR2))
 
 
 def read_knet(filename):
     """Read Japanese KNET strong motion file.
 
+    The file is read once, the header and the data are parsed from its
+    text.
+
     Args:
-        filename (str): Path to possible KNET data file.
+        filename (str, bytes, or file-like):
+            Path to possible KNET data file, or its contents as bytes or a
+            binary file-like object (e.g., a member of an archive).
         kwargs (ref): Other arguments will be ignored.
     Returns:
         Stream: Obspy Stream containing three channels of acceleration data
             (cm/s**2).
     """
     logging.debug("Starting read_knet.")
-    if not is_knet(filename):
-        raise Exception('%s is not a valid KNET file' % filename)
+    alllines = _read_lines(filename)
+    if alllines is None or not _is_knet_lines(alllines):
+        raise Exception('%s is not a valid KNET file' %
+                        describe_source(filename))
 
     # Parse the header portion of the file
-    with open(filename, 'rt') as f:
-        lines = [next(f) for x in range(TEXT_HDR_ROWS)]
+    lines = alllines[:TEXT_HDR_ROWS]
 
     hdr = {}
     coordinates = {}
@@ -145,15 +158,9 @@ def read_knet(filename):
     else:
         nrows = int(np.ceil(hdr['npts'] / COLS_PER_LINE))
         nrows2 = 0
-    data = np.genfromtxt(filename, skip_header=TEXT_HDR_ROWS,
-                         max_rows=nrows, filling_values=np.nan)
-    data = data.flatten()
-    if nrows2:
-        skip_header = TEXT_HDR_ROWS + nrows
-        data2 = np.genfromtxt(filename, skip_header=skip_header,
-                              max_rows=nrows2, filling_values=np.nan)
-        data = np.hstack((data, data2))
-        nrows += nrows2
+    nrows += nrows2
+    datalines = alllines[TEXT_HDR_ROWS:TEXT_HDR_ROWS + nrows]
+    data = np.fromstring(' '.join(datalines), sep=' ')
 
     # apply the correction factor we're given in the header
     data *= calib
@@ -177,8 +184,7 @@ def read_knet(filename):
     standard['units'] = 'acc'
     standard['source'] = SRC
     standard['source_format'] = 'knet'
-    head, tail = os.path.split(filename)
-    standard['source_file'] = tail or os.path.basename(head)
+    standard['source_file'] = get_source_file(filename)
 
     # this field can be used for instrument correction
     # when data is in counts
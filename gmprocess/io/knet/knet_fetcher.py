@@ -2,11 +2,9 @@
 from datetime import datetime, timedelta
 import re
 from collections import OrderedDict
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import os.path
 import tarfile
-import glob
-import shutil
 import logging
 import urllib
 
@@ -296,20 +294,11 @@ class KNETFetcher(DataFetcher):
         Returns:
             StreamCollection: StreamCollection object.
         """
-        rawdir = self.rawdir
-        if self.rawdir is None:
-            rawdir = tempfile.mkdtemp()
-        else:
-            if not os.path.isdir(rawdir):
-                os.makedirs(rawdir)
-
         cgi_value = event_dict['cgi_value']
         firstid = cgi_value.split(',')[0]
         dtime = event_dict['time']
         fname = dtime.strftime('%Y%m%d%H%M%S') + '.tar'
 
-        localfile = os.path.join(rawdir, fname)
-
         url = RETRIEVE_URL
         
         if stations == None:
@@ -322,57 +311,18 @@ class KNETFetcher(DataFetcher):
                    'datanames': '%s;alldata' % firstid,
                    'datakind': dkind }
 
-        logging.info('Downloading Japanese data into %s...' % localfile)
+        logging.info('Downloading Japanese data %s...' % fname)
         req = requests.get(url, params=payload,
-                           auth=(self.user, self.password))
+                           auth=(self.user, self.password), stream=True)
 
         if req.status_code != URL_ERROR_CODE:
             raise urllib.error.HTTPError(req.text)
-        else:
-            with open(localfile, 'wb') as f:
-                for chunk in req:
-                    f.write(chunk)
-        logging.info('Finished downloading into %s...' % localfile)
-
-        # open the tarball, extract the kiknet/knet gzipped tarballs
-        tar = tarfile.open(localfile)
-        names = tar.getnames()
-        tarballs = []
-        for name in names:
-            if 'img' in name:
-                continue
-            ppath = os.path.join(rawdir, name)
-            tarballs.append(ppath)
-            tar.extract(name, path=rawdir)
-        tar.close()
-
-        # remove the tar file we downloaded
-        os.remove(localfile)
-
-        subdirs = []
-        for tarball in tarballs:
-            tar = tarfile.open(tarball, mode='r:gz')
-            if 'kik' in tarball:
-                subdir = os.path.join(rawdir, 'kiknet')
-            else:
-                subdir = os.path.join(rawdir, 'knet')
-            subdirs.append(subdir)
-            tar.extractall(path=subdir)
-            tar.close()
-            os.remove(tarball)
-
-        streams = []
-        for subdir in subdirs:
-            gzfiles = glob.glob(os.path.join(subdir, '*.gz'))
-            for gzfile in gzfiles:
-                os.remove(gzfile)
-            datafiles = glob.glob(os.path.join(subdir, '*.*'))
-            for dfile in datafiles:
-                logging.info('Reading KNET/KikNet file %s...' % dfile)
-                streams += read_knet(dfile)
-
-        if self.rawdir is None:
-            shutil.rmtree(rawdir)
+
+        # The archive is read as it is downloaded, rather than being saved
+        # and extracted first.
+        req.raw.decode_content = True
+        streams = read_archive(req.raw, rawdir=self.rawdir)
+        logging.info('Finished reading %s...' % fname)
 
         # Japan gives us a LOT of data, much of which is not useful as it is
         # too far away. Use the following distance thresholds for different
@@ -398,3 +348,81 @@ class KNETFetcher(DataFetcher):
         stream_collection = StreamCollection(streams=newstreams,
                                              drop_non_free=self.drop_non_free)
         return stream_collection
+
+
+def read_archive(fileobj, rawdir=None):
+    """Read the KNET and KiK-net records in an archive from NIED.
+
+    The archive is a tar file containing gzipped tar files of the KNET
+    ('knt') and KiK-net ('kik') records. Both are read sequentially, so the
+    archive can be read as it is downloaded, and the records are parsed
+    from memory.
+
+    Args:
+        fileobj (file-like):
+            Binary file-like object with the archive.
+        rawdir (str):
+            Directory where the records are saved, in 'knet' and 'kiknet'
+            subdirectories. The files are written in the background while
+            the archive is read. If None, the records are not saved.
+
+    Returns:
+        list: StationStreams of the records.
+    """
+    streams = []
+    writer = None
+    if rawdir is not None:
+        writer = ThreadPoolExecutor(max_workers=1)
+    saved = []
+    try:
+        with tarfile.open(fileobj=fileobj, mode='r|') as tar:
+            for member in tar:
+                if 'img' in member.name or not member.isfile():
+                    continue
+                if 'kik' in member.name:
+                    subdir = 'kiknet'
+                else:
+                    subdir = 'knet'
+                tarball = tar.extractfile(member)
+                with tarfile.open(fileobj=tarball, mode='r|gz') as subtar:
+                    for record in subtar:
+                        if not record.isfile() or \
+                                record.name.endswith('.gz') or \
+                                '.' not in os.path.basename(record.name):
+                            continue
+                        data = subtar.extractfile(record).read()
+                        logging.info('Reading KNET/KikNet file %s...' %
+                                     record.name)
+                        for stream in read_knet(data):
+                            for trace in stream:
+                                trace.stats.standard.source_file = \
+                                    os.path.basename(record.name)
+                            streams.append(stream)
+                        if writer is not None:
+                            filename = os.path.join(
+                                rawdir, subdir, record.name)
+                            saved.append(
+                                writer.submit(_save_record, filename, data))
+    finally:
+        if writer is not None:
+            writer.shutdown(wait=True)
+    # Raise any error from saving the records
+    for future in saved:
+        future.result()
+    return streams
+
+
+def _save_record(filename, data):
+    """Write a record read from an archive (see read_archive).
+
+    Args:
+        filename (str):
+            Path to the file.
+        data (bytes):
+            Contents of the record.
+    """
+    dirname = os.path.dirname(filename)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname, exist_ok=True)
+    with open(filename, 'wb') as f:
+        f.write(data)
@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 
 # stdlib imports
-import os
 from datetime import datetime
 import re
 import copy
@@ -15,6 +14,7 @@ from scipy import constants
 from gmprocess.stationstream import StationStream
 from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
 from gmprocess.io.seedname import get_channel_name, get_units_type
+from gmprocess.io.utils import open_text, read_lines, get_source_file
 
 
 TIMEFMT = '%d/%m/%Y %H:%M:%S.%f'
@@ -44,7 +44,7 @@ ENCODING = 'ISO-8859-1'
 
 
 def is_nsmn(filename):
-    with open(filename, 'rt', encoding=ENCODING) as f:
+    with open_text(filename, encoding=ENCODING) as f:
         line = f.readline()
         if MARKER in line:
             return True
@@ -56,13 +56,15 @@ def read_nsmn(filename):
     """Read the Turkish NSMN strong motion data format.
 
     Args:
-        filename (str): path to NSMN data file.
+        filename (str, bytes, or file-like): path to NSMN data file, or
+            its contents.
 
     Returns:
         list: Sequence of one StationStream object containing 3
         StationTrace objects.
     """
-    header = _read_header(filename)
+    lines = read_lines(filename, encoding=ENCODING)
+    header = _read_header(lines, get_source_file(filename))
     header1 = copy.deepcopy(header)
     header2 = copy.deepcopy(header)
     header3 = copy.deepcopy(header)
@@ -85,9 +87,7 @@ def read_nsmn(filename):
     # three columns of NS, EW, UD
     # data = np.genfromtxt(filename, skip_header=TEXT_HDR_ROWS,
     #                      delimiter=[COLWIDTH] * NCOLS, encoding=ENCODING)
-    data = np.loadtxt(filename,
-                      skiprows=TEXT_HDR_ROWS,
-                      encoding=ENCODING)
+    data = np.loadtxt(lines, skiprows=TEXT_HDR_ROWS)
     data1 = data[:, 0]
     data2 = data[:, 1]
     data3 = data[:, 2]
@@ -102,63 +102,60 @@ def read_nsmn(filename):
     return [stream]
 
 
-def _read_header(filename):
+def _read_header(lines, source_file):
     header = {}
     standard = {}
     coords = {}
     format_specific = {}
-    with open(filename, 'rt', encoding=ENCODING) as f:
-        lines = [next(f) for x in range(TEXT_HDR_ROWS)]
-        # fill out the standard dictionary
-        standard['source'] = SOURCE
-        standard['source_format'] = SOURCE_FORMAT
-        standard['instrument'] = lines[9].split(':')[1].strip()
-        standard['sensor_serial_number'] = lines[10].split(':')[1].strip()
-        standard['process_level'] = PROCESS_LEVELS['V1']
-        standard['process_time'] = ''
-        standard['station_name'] = lines[1].split(':')[1].strip()
-        standard['structure_type'] = ''
-        standard['corner_frequency'] = np.nan
-        standard['units'] = 'acc'
-        standard['instrument_period'] = np.nan
-        standard['instrument_damping'] = np.nan
-        standard['horizontal_orientation'] = np.nan
-        standard['comments'] = ' '.join(lines[15:17]).replace('\n', '')
-        head, tail = os.path.split(filename)
-        standard['source_file'] = tail or os.path.basename(head)
-
-        # this field can be used for instrument correction
-        # when data is in counts
-        standard['instrument_sensitivity'] = np.nan
-
-        # fill out the stats stuff
-        stimestr = re.search(TIME_RE, lines[11]).group()
-        # 20/07/2017 22:30:58.000000 (GMT)
-        stime = datetime.strptime(stimestr, TIMEFMT)
-        header['starttime'] = stime
-        header['npts'] = int(lines[12].split(':')[1].strip())
-        header['delta'] = float(lines[13].split(':')[1].strip())
-        header['sampling_rate'] = 1 / header['delta']
-        header['duration'] = header['npts'] * header['delta']
-        header['channel'] = ''
-        header['station'] = lines[6].split(':')[1].strip()
-        header['location'] = '--'
-        header['network'] = NETWORK
-
-        coordstr = lines[7].split(':')[1].replace('-', '')
-        lat_str, lon_str = re.findall(FLOATRE, coordstr)
-        altparts = lines[8].split(':')
-        altitude = 0.0
-        if len(altparts) > 1 and len(altparts[1].strip()):
-            altitude = float(altparts[1].strip())
-        else:
-            logging.warn('Setting elevation to 0.0')
-        coords = {'latitude': float(lat_str),
-                  'longitude': float(lon_str),
-                  'elevation': altitude}
-
-        header['coordinates'] = coords
-        header['standard'] = standard
-        header['format_specific'] = format_specific
-
-        return header
+    # fill out the standard dictionary
+    standard['source'] = SOURCE
+    standard['source_format'] = SOURCE_FORMAT
+    standard['instrument'] = lines[9].split(':')[1].strip()
+    standard['sensor_serial_number'] = lines[10].split(':')[1].strip()
+    standard['process_level'] = PROCESS_LEVELS['V1']
+    standard['process_time'] = ''
+    standard['station_name'] = lines[1].split(':')[1].strip()
+    standard['structure_type'] = ''
+    standard['corner_frequency'] = np.nan
+    standard['units'] = 'acc'
+    standard['instrument_period'] = np.nan
+    standard['instrument_damping'] = np.nan
+    standard['horizontal_orientation'] = np.nan
+    standard['comments'] = ' '.join(lines[15:17]).replace('\n', '')
+    standard['source_file'] = source_file
+
+    # this field can be used for instrument correction
+    # when data is in counts
+    standard['instrument_sensitivity'] = np.nan
+
+    # fill out the stats stuff
+    stimestr = re.search(TIME_RE, lines[11]).group()
+    # 20/07/2017 22:30:58.000000 (GMT)
+    stime = datetime.strptime(stimestr, TIMEFMT)
+    header['starttime'] = stime
+    header['npts'] = int(lines[12].split(':')[1].strip())
+    header['delta'] = float(lines[13].split(':')[1].strip())
+    header['sampling_rate'] = 1 / header['delta']
+    header['duration'] = header['npts'] * header['delta']
+    header['channel'] = ''
+    header['station'] = lines[6].split(':')[1].strip()
+    header['location'] = '--'
+    header['network'] = NETWORK
+
+    coordstr = lines[7].split(':')[1].replace('-', '')
+    lat_str, lon_str = re.findall(FLOATRE, coordstr)
+    altparts = lines[8].split(':')
+    altitude = 0.0
+    if len(altparts) > 1 and len(altparts[1].strip()):
+        altitude = float(altparts[1].strip())
+    else:
+        logging.warn('Setting elevation to 0.0')
+    coords = {'latitude': float(lat_str),
+              'longitude': float(lon_str),
+              'elevation': altitude}
+
+    header['coordinates'] = coords
+    header['standard'] = standard
+    header['format_specific'] = format_specific
+
+    return header
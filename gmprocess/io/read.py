@@ -2,13 +2,13 @@
 import importlib
 import os.path
 import logging
-import pkg_resources
 
 # third party imports
 import numpy as np
 
 # local imports
 from gmprocess.exception import GMProcessException
+from gmprocess.io.utils import is_path, read_source, describe_source
 
 
 EXCLUDED = ['__pycache__']
@@ -18,16 +18,28 @@ def read_data(filename, read_format=None, **kwargs):
     """
     Read strong motion data from a file.
 
+    Besides a path, the data can be given as the contents of a file, e.g.,
+    a member of an archive or an HTTP response, as bytes (or a bytearray or
+    memoryview) or a binary file-like object. The contents are read once
+    and parsed from memory. The FDSN (which needs the accompanying
+    StationXML file) and ASDF formats can only be read from a path.
+
     Args:
-        filename (str): Path to file
+        filename (str, bytes, or file-like):
+            Path to file, or its contents.
         read_format (str): Format of file
 
     Returns:
         list: Sequence of obspy.core.stream.Streams read from file
     """
-    # Check if file exists
-    if not os.path.exists(filename):
-        raise GMProcessException('Not a file %r' % filename)
+    if is_path(filename):
+        # Check if file exists
+        if not os.path.exists(filename):
+            raise GMProcessException('Not a file %r' % filename)
+    else:
+        # Read a file-like object once, the format checks and the reader
+        # then parse the contents
+        filename = read_source(filename)
     # Get and validate format
     if read_format is None:
         read_format = _get_format(filename)
@@ -47,14 +59,14 @@ def _get_format(filename):
     Get the format of the file.
 
     Args:
-        filename (str): Path to file
+        filename (str or bytes-like): Path to file, or its contents.
 
     Returns:
         string: Format of file.
     """
     # Get the valid formats
     valid_formats = []
-    io_directory = pkg_resources.resource_filename('gmprocess', 'io')
+    io_directory = os.path.dirname(os.path.abspath(__file__))
     # Create valid list
     for module in os.listdir(io_directory):
         if module.find('.') < 0 and module not in EXCLUDED:
@@ -76,11 +88,13 @@ def _get_format(filename):
     elif len(formats) == 2 and 'gmobspy' in formats:
         return formats[formats != 'gmobspy'][0]
     elif len(formats) == 0:
-        raise GMProcessException('No format found for file %r.' % filename)
+        raise GMProcessException(
+            'No format found for file %r.' % describe_source(filename))
     else:
         raise GMProcessException(
             'Multiple formats passing: %r. Please retry file %r '
-            'with a specified format.' % (formats.tolist(), filename))
+            'with a specified format.' % (formats.tolist(),
+                                          describe_source(filename)))
 
 
 def _validate_format(filename, read_format):
@@ -88,7 +102,7 @@ def _validate_format(filename, read_format):
     Check if the specified format is valid. If not, get format.
 
     Args:
-        filename (str): Path to file
+        filename (str or bytes-like): Path to file, or its contents.
         read_format (str): Format of file
 
     Returns:
@@ -9,13 +9,12 @@ import logging
 # third party imports
 import numpy as np
 from scipy import constants
-import pandas as pd
-import pkg_resources
 
 # local
 from gmprocess.stationstream import StationStream
 from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
 from gmprocess.io.seedname import get_channel_name
+from gmprocess.io.utils import open_text, read_lines, get_source_file
 
 
 TIMEFMT = '%m/%d/%Y %H:%M:%S.%f'
@@ -54,8 +53,12 @@ G10_TO_GALS = 980 / 10.0
 
 
 def is_renadic(filename):
-    with open(filename, 'rt', encoding=ENCODING) as f:
-        lines = [next(f) for x in range(TEXT_HDR_ROWS)]
+    try:
+        with open_text(filename, encoding=ENCODING) as f:
+            lines = [next(f) for x in range(TEXT_HDR_ROWS)]
+    except StopIteration:
+        # files shorter than a header are not RENADIC files
+        return False
 
     if MARKER in lines[7]:
         return True
@@ -67,7 +70,8 @@ def read_renadic(filename):
     """Read the Chilean RENADIC strong motion data format.
 
     Args:
-        filename (str): path to RENADIC data file.
+        filename (str, bytes, or file-like): path to RENADIC data file, or
+            its contents.
 
     Returns:
         list: Sequence of one StationStream object containing 3
@@ -77,36 +81,37 @@ def read_renadic(filename):
     # but they did provide a PDF table with information about each station,
     # including structure type (free field or something else) and the
     # coordinates
-    data_dir = pkg_resources.resource_filename('gmprocess',
-                                               'data')
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '..', '..', 'data')
     tablefile = os.path.join(data_dir, 'station_coordinates.xlsx')
+    # pandas is only imported once a RENADIC file is actually read, as
+    # format detection loads every reader
+    import pandas as pd
     table = pd.read_excel(tablefile, engine="openpyxl")
 
-    with open(filename, 'rt', encoding=ENCODING) as f:
-        lines1 = [next(f) for x in range(TEXT_HDR_ROWS)]
-    header1 = _read_header(lines1, filename, table)
+    lines = read_lines(filename, encoding=ENCODING)
+    source_file = get_source_file(filename)
+
+    lines1 = lines[0:TEXT_HDR_ROWS]
+    header1 = _read_header(lines1, source_file, table)
     ndata_rows = int(np.ceil((header1['npts'] * 2) / NCOLS))
 
     skip_rows = TEXT_HDR_ROWS + INT_HEADER_ROWS + FLOAT_HEADER_ROWS
-    data1 = _read_data(filename, skip_rows, header1['npts'])
+    data1 = _read_data(lines, skip_rows, header1['npts'])
 
     skip_rows += ndata_rows + 1
-    with open(filename, 'rt', encoding=ENCODING) as f:
-        [next(f) for x in range(skip_rows)]
-        lines2 = [next(f) for x in range(TEXT_HDR_ROWS)]
+    lines2 = lines[skip_rows:skip_rows + TEXT_HDR_ROWS]
 
-    header2 = _read_header(lines2, filename, table)
+    header2 = _read_header(lines2, source_file, table)
     skip_rows += TEXT_HDR_ROWS + INT_HEADER_ROWS + FLOAT_HEADER_ROWS
-    data2 = _read_data(filename, skip_rows, header1['npts'])
+    data2 = _read_data(lines, skip_rows, header1['npts'])
 
     skip_rows += ndata_rows + 1
-    with open(filename, 'rt', encoding=ENCODING) as f:
-        [next(f) for x in range(skip_rows)]
-        lines3 = [next(f) for x in range(TEXT_HDR_ROWS)]
+    lines3 = lines[skip_rows:skip_rows + TEXT_HDR_ROWS]
 
-    header3 = _read_header(lines3, filename, table)
+    header3 = _read_header(lines3, source_file, table)
     skip_rows += TEXT_HDR_ROWS + INT_HEADER_ROWS + FLOAT_HEADER_ROWS
-    data3 = _read_data(filename, skip_rows, header1['npts'])
+    data3 = _read_data(lines, skip_rows, header1['npts'])
 
     trace1 = StationTrace(data=data1, header=header1)
     response = {'input_units': 'counts', 'output_units': 'cm/s^2'}
@@ -119,18 +124,16 @@ def read_renadic(filename):
     return [stream]
 
 
-def _read_data(filename, skip_rows, npts):
+def _read_data(lines, skip_rows, npts):
     floatrows = (npts * 2) / NCOLS
     introws = int(floatrows)
-    data = np.genfromtxt(filename, skip_header=skip_rows,
-                         max_rows=introws, delimiter=10 * [7],
-                         encoding=ENCODING)
+    data = np.genfromtxt(lines, skip_header=skip_rows,
+                         max_rows=introws, delimiter=10 * [7])
     data = data.flatten()
     if floatrows > introws:
-        data2 = np.genfromtxt(filename,
+        data2 = np.genfromtxt(lines,
                               skip_header=skip_rows + introws,
-                              max_rows=1, delimiter=10 * [7],
-                              encoding=ENCODING)
+                              max_rows=1, delimiter=10 * [7])
         data2 = data2.flatten()
         data = np.concatenate((data, data2))
     data = data[1::2]
@@ -139,7 +142,7 @@ def _read_data(filename, skip_rows, npts):
     return data
 
 
-def _read_header(lines, filename, table):
+def _read_header(lines, source_file, table):
     header = {}
     standard = {}
     coords = {}
@@ -181,8 +184,7 @@ def _read_header(lines, filename, table):
     standard['horizontal_orientation'] = np.nan
     standard['vertical_orientation'] = np.nan
     standard['comments'] = ' '.join(lines[11:13]).replace('\n', '')
-    head, tail = os.path.split(filename)
-    standard['source_file'] = tail or os.path.basename(head)
+    standard['source_file'] = source_file
 
     # this field can be used for instrument correction
     # when data is in counts
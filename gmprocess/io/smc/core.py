@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 
 # stdlib imports
-import os
 from datetime import datetime
 import logging
 
@@ -11,6 +10,8 @@ import numpy as np
 # local imports
 from gmprocess.exception import GMProcessException
 from gmprocess.io.seedname import get_channel_name, get_units_type
+from gmprocess.io.utils import (open_text, read_lines, get_source_file,
+                                describe_source)
 from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
 from gmprocess.stationstream import StationStream
 
@@ -115,13 +116,14 @@ def is_smc(filename):
     """Check to see if file is a SMC (corrected, in acc.) strong motion file.
 
     Args:
-        filename (str): Path to possible SMC corrected data file.
+        filename (str, bytes, or file-like): Path to possible SMC corrected
+            data file, or its contents.
     Returns:
         bool: True if SMC, False otherwise.
     """
     logging.debug("Checking if format is smc.")
     try:
-        with open(filename, 'rt') as f:
+        with open_text(filename) as f:
             lines = f.readlines()
             firstline = lines[0].strip()
             if firstline in VALID_HEADERS:
@@ -155,7 +157,8 @@ def read_smc(filename, **kwargs):
     """Read SMC strong motion file.
 
     Args:
-        filename (str): Path to possible SMC data file.
+        filename (str, bytes, or file-like): Path to possible SMC data
+            file, or its contents.
         kwargs (ref):
             any_structure (bool): Read data from any type of structure,
                 raise Exception if False and structure type is not free-field.
@@ -172,22 +175,23 @@ def read_smc(filename, **kwargs):
     location = kwargs.get('location', '')
 
     if not is_smc(filename):
-        raise Exception('%s is not a valid SMC file' % filename)
-
-    with open(filename, 'rt') as f:
-        line = f.readline().strip()
-        if 'DISPLACEMENT' in line:
-            raise GMProcessException('SMC: Diplacement records are not supported: '
-                                     '%s.' % filename)
-        elif 'VELOCITY' in line:
-            raise GMProcessException('SMC: Velocity records are not supported: '
-                                     '%s.' % filename)
-        elif line == "*":
-            raise GMProcessException('SMC: No record volume specified in file: '
-                                     '%s.' % filename)
+        raise Exception('%s is not a valid SMC file'
+                        % describe_source(filename))
+
+    lines = read_lines(filename)
+    line = lines[0].strip()
+    if 'DISPLACEMENT' in line:
+        raise GMProcessException('SMC: Diplacement records are not supported: '
+                                 '%s.' % describe_source(filename))
+    elif 'VELOCITY' in line:
+        raise GMProcessException('SMC: Velocity records are not supported: '
+                                 '%s.' % describe_source(filename))
+    elif line == "*":
+        raise GMProcessException('SMC: No record volume specified in file: '
+                                 '%s.' % describe_source(filename))
 
     stats, num_comments = _get_header_info(
-        filename, any_structure=any_structure,
+        lines, filename, any_structure=any_structure,
         accept_flagged=accept_flagged, location=location)
 
     skip = ASCII_HEADER_LINES + INTEGER_HEADER_LINES + \
@@ -195,13 +199,13 @@ def read_smc(filename, **kwargs):
 
     # read float data (8 columns per line)
     nrows = int(np.floor(stats['npts'] / DATA_COLUMNS))
-    data = np.genfromtxt(filename,
+    data = np.genfromtxt(lines,
                          max_rows=nrows,
                          skip_header=skip,
                          delimiter=FLOAT_DATA_WIDTHS)
     data = data.flatten()
     if stats['npts'] % DATA_COLUMNS:
-        lastrow = np.genfromtxt(filename, max_rows=1,
+        lastrow = np.genfromtxt(lines, max_rows=1,
                                 skip_header=skip + nrows,
                                 delimiter=FLOAT_DATA_WIDTHS)
         data = np.append(data, lastrow)
@@ -215,8 +219,8 @@ def read_smc(filename, **kwargs):
     return [stream]
 
 
-def _get_header_info(filename, any_structure=False, accept_flagged=False,
-                     location=''):
+def _get_header_info(lines, filename, any_structure=False,
+                     accept_flagged=False, location=''):
     """Return stats structure from various headers.
 
     Output is a dictionary like this:
@@ -273,8 +277,7 @@ def _get_header_info(filename, any_structure=False, accept_flagged=False,
     format_specific = {}
     coordinates = {}
     # read the ascii header lines
-    with open(filename) as f:
-        ascheader = [next(f).strip() for x in range(ASCII_HEADER_LINES)]
+    ascheader = [line.strip() for line in lines[0:ASCII_HEADER_LINES]]
 
     standard['process_level'] = PROCESS_LEVELS[VALID_HEADERS[ascheader[0]]]
     logging.debug("process_level: %s" % standard['process_level'])
@@ -306,7 +309,7 @@ def _get_header_info(filename, any_structure=False, accept_flagged=False,
 
     # read integer header data
 
-    intheader = np.genfromtxt(filename, dtype=np.int32,
+    intheader = np.genfromtxt(lines, dtype=np.int32,
                               max_rows=INTEGER_HEADER_LINES,
                               skip_header=ASCII_HEADER_LINES,
                               delimiter=INT_HEADER_WIDTHS)
@@ -325,7 +328,8 @@ def _get_header_info(filename, any_structure=False, accept_flagged=False,
             fmt = ('Could not find year in SMC file %s. Not present '
                    'in integer header and not parseable from line '
                    '4 of ASCII header. Error: "%s"')
-            raise GMProcessException(fmt % (filename, str(ve)))
+            raise GMProcessException(
+                fmt % (describe_source(filename), str(ve)))
 
     jday = intheader[0, 2]
     hour = intheader[0, 3]
@@ -394,7 +398,7 @@ def _get_header_info(filename, any_structure=False, accept_flagged=False,
     if problem_flag == 1:
         if not accept_flagged:
             fmt = 'SMC: Record found in file %s has a problem flag!'
-            raise GMProcessException(fmt % filename)
+            raise GMProcessException(fmt % describe_source(filename))
         else:
             logging.warning(
                 'SMC: Data contains a problem flag for network/station: '
@@ -408,7 +412,7 @@ def _get_header_info(filename, any_structure=False, accept_flagged=False,
     fmt = 'SMC: Record found in file %s is not a free-field sensor!'
     standard['structure_type'] = STRUCTURES[stype]
     if standard['structure_type'] == 'building' and not any_structure:
-        raise Exception(fmt % filename)
+        raise Exception(fmt % describe_source(filename))
 
     format_specific['building_floor'] = np.nan
     if intheader[3, 0] != missing_data:
@@ -432,7 +436,7 @@ def _get_header_info(filename, any_structure=False, accept_flagged=False,
     c1 = format_specific['bridge_transducer_location'].find('free field') == -1
     c2 = format_specific['dam_transducer_location'].find('free field') == -1
     if (c1 or c2) and not any_structure:
-        raise Exception(fmt % filename)
+        raise Exception(fmt % describe_source(filename))
 
     format_specific['construction_type'] = CONSTRUCTION_TYPES[4]
     if intheader[3, 4] != missing_data:
@@ -446,7 +450,7 @@ def _get_header_info(filename, any_structure=False, accept_flagged=False,
     # read float header data
     skip = ASCII_HEADER_LINES + INTEGER_HEADER_LINES
     floatheader = np.genfromtxt(
-        filename,
+        lines,
         max_rows=FLOAT_HEADER_LINES,
         skip_header=skip,
         delimiter=FLOAT_HEADER_WIDTHS)
@@ -512,18 +516,15 @@ def _get_header_info(filename, any_structure=False, accept_flagged=False,
     standard['instrument_sensitivity'] = np.nan
 
     # read in the comment lines
-    with open(filename) as f:
-        skip = ASCII_HEADER_LINES + INTEGER_HEADER_LINES + FLOAT_HEADER_LINES
-        _ = [next(f) for x in range(skip)]
-        standard['comments'] = [next(f).strip().lstrip('|')
-                                for x in range(num_comments)]
+    skip = ASCII_HEADER_LINES + INTEGER_HEADER_LINES + FLOAT_HEADER_LINES
+    standard['comments'] = [line.strip().lstrip('|')
+                            for line in lines[skip:skip + num_comments]]
 
     standard['comments'] = ' '.join(standard['comments'])
     stats['coordinates'] = coordinates
     stats['standard'] = standard
     stats['format_specific'] = format_specific
 
-    head, tail = os.path.split(filename)
-    stats['standard']['source_file'] = tail or os.path.basename(head)
+    stats['standard']['source_file'] = get_source_file(filename)
 
     return (stats, num_comments)
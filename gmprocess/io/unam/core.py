@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 
 # stdlib imports
-import os
 from datetime import datetime, timedelta
 import re
 
@@ -15,6 +14,7 @@ from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
 from gmprocess.io.seedname import (get_channel_name,
                                    get_units_type,
                                    is_channel_north)
+from gmprocess.io.utils import open_text, read_lines, get_source_file
 
 
 TIMEFMT1 = '%Y/%m/%d %H:%M:%S.%f'
@@ -47,7 +47,7 @@ MAX_TIME_DIFF = 10 * 60.0
 
 def is_unam(filename):
     try:
-        with open(filename, 'rt') as myfile:
+        with open_text(filename) as myfile:
             header = [next(myfile) for x in range(7)]
     except Exception:
         return False
@@ -61,16 +61,18 @@ def read_unam(filename):
     """Read the Mexican UNAM strong motion data format.
 
     Args:
-        filename (str): path to UNAM data file.
+        filename (str, bytes, or file-like): path to UNAM data file, or
+            its contents.
 
     Returns:
         list: Sequence of one StationStream object containing 3
         StationTrace objects.
     """
 
-    channels = _read_header(filename)
+    lines = read_lines(filename)
+    channels = _read_header(lines, get_source_file(filename))
     npts = channels[0]['npts']
-    all_data = np.genfromtxt(filename, skip_header=ALL_HEADERS, max_rows=npts)
+    all_data = np.genfromtxt(lines, skip_header=ALL_HEADERS, max_rows=npts)
     trace1 = StationTrace(data=all_data[:, 0], header=channels[0])
     trace2 = StationTrace(data=all_data[:, 1], header=channels[1])
     trace3 = StationTrace(data=all_data[:, 2], header=channels[2])
@@ -85,10 +87,9 @@ def read_unam(filename):
     return [stream]
 
 
-def _read_header(filename):
+def _read_header(lines, source_file):
     # read in first 88 lines
-    with open(filename, 'rt') as myfile:
-        header = [next(myfile) for x in range(HEADER_LINES)]
+    header = lines[0:HEADER_LINES]
 
     header_dict = {}
     lastkey = ''
@@ -285,16 +286,13 @@ def _read_header(filename):
     channels[1]['standard']['instrument_damping'] = dampings[1]
     channels[2]['standard']['instrument_damping'] = dampings[2]
 
-    with open(filename, 'rt') as myfile:
-        header = [next(myfile) for x in range(HEADER_PLUS_COMMENT)]
+    header = lines[0:HEADER_PLUS_COMMENT]
     clines = header[89:102]
     comments = ' '.join(clines).strip()
     channels[0]['standard']['comments'] = comments
     channels[1]['standard']['comments'] = comments
     channels[2]['standard']['comments'] = comments
 
-    head, tail = os.path.split(filename)
-    source_file = tail or os.path.basename(head)
     channels[0]['standard']['source_file'] = source_file
     channels[1]['standard']['source_file'] = source_file
     channels[2]['standard']['source_file'] = source_file
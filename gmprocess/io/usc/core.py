@@ -1,5 +1,4 @@
 # stdlib imports
-import os
 from datetime import datetime
 import logging
 
@@ -13,7 +12,9 @@ from gmprocess.exception import GMProcessException
 from gmprocess.io.seedname import get_channel_name, get_units_type
 from gmprocess.stationstream import StationStream
 from gmprocess.stationtrace import StationTrace, PROCESS_LEVELS
-from gmprocess.io.utils import is_evenly_spaced, resample_uneven_trace
+from gmprocess.io.utils import (is_evenly_spaced, resample_uneven_trace,
+                                open_text, read_lines, get_source_file,
+                                describe_source)
 
 VOLUMES = {
     'V1': {
@@ -38,7 +39,8 @@ def is_usc(filename, **kwargs):
     """Check to see if file is a USC strong motion file.
 
     Args:
-        filename (str): Path to possible USC V1 data file.
+        filename (str, bytes, or file-like): Path to possible USC V1 data
+            file, or its contents.
     Returns:
         bool: True if USC , False otherwise.
     """
@@ -49,7 +51,7 @@ def is_usc(filename, **kwargs):
     return_alternate = kwargs.get('return_alternate', False)
 
     try:
-        f = open(filename, 'rt')
+        f = open_text(filename)
         first_line = f.readline()
         if first_line.find('OF UNCORRECTED ACCELEROGRAM DATA OF') >= 0:
             volume = 'V1'
@@ -66,7 +68,8 @@ def is_usc(filename, **kwargs):
         elif first_line.find('RESPONSE') >= 0:
             raise GMProcessException(
                 'USC: Derived response spectra and fourier '
-                'amplitude spectra not supported: %s' % filename)
+                'amplitude spectra not supported: %s'
+                % describe_source(filename))
         else:
             f.close()
             return False
@@ -89,7 +92,7 @@ def is_usc(filename, **kwargs):
 
 def _check_header(start, stop, filename):
     passing = True
-    with open(filename, 'r') as f:
+    with open_text(filename) as f:
         counter = stop
         for i in range(start):
             f.readline()
@@ -106,7 +109,8 @@ def read_usc(filename, **kwargs):
     """Read USC V1 strong motion file.
 
     Args:
-        filename (str): Path to possible USC V1 data file.
+        filename (str, bytes, or file-like): Path to possible USC V1 data
+            file, or its contents.
         kwargs (ref): Ignored by this function.
     Returns:
         Stream: Obspy Stream containing three channels of acceleration data
@@ -115,13 +119,14 @@ def read_usc(filename, **kwargs):
     logging.debug("Starting read_usc.")
     valid, alternate = is_usc(filename, return_alternate=True)
     if not valid:
-        raise Exception('%s is not a valid USC file' % filename)
+        raise Exception('%s is not a valid USC file'
+                        % describe_source(filename))
     # Check for Location
     location = kwargs.get('location', '')
 
     f = None
     try:
-        f = open(filename, 'rt')
+        f = open_text(filename)
         first_line = f.readline()
     except:
         pass
@@ -142,20 +147,23 @@ def read_volume_one(filename, location='', alternate=False):
     """Read channel data from USC volume 1 text file.
 
     Args:
-        filename (str): Input DMG V1 filename.
+        filename (str, bytes, or file-like): Input DMG V1 filename, or its
+            contents.
     Returns:
         tuple: (list of obspy Trace, int line offset)
     """
     volume = VOLUMES['V1']
-    # count the number of lines in the file
-    with open(filename) as f:
-        line_count = sum(1 for _ in f)
+    # read the file once, the channels are parsed from its lines
+    lines = read_lines(filename)
+    line_count = len(lines)
+    source_file = get_source_file(filename)
     # read as many channels as are present in the file
     line_offset = 0
     stream = StationStream([])
     while line_offset < line_count:
         trace, line_offset = _read_channel(
-            filename, line_offset, volume, location=location, alternate=alternate)
+            lines, line_offset, volume, source_file, location=location,
+            alternate=alternate)
         # store the trace if the station type is in the valid_station_types
         # list or store the trace if there is no valid_station_types list
         if trace is not None:
@@ -164,13 +172,15 @@ def read_volume_one(filename, location='', alternate=False):
     return [stream]
 
 
-def _read_channel(filename, line_offset, volume, location='', alternate=False):
+def _read_channel(filelines, line_offset, volume, source_file, location='',
+                  alternate=False):
     """Read channel data from USC V1 text file.
 
     Args:
-        filename (str): Input USC V1 filename.
+        filelines (list): Lines of the USC V1 file.
         line_offset (int): Line offset to beginning of channel text block.
         volume (dictionary): Dictionary of formatting information
+        source_file (str): Name of the USC V1 file.
     Returns:
         tuple: (obspy Trace, int line offset)
     """
@@ -183,30 +193,26 @@ def _read_channel(filename, line_offset, volume, location='', alternate=False):
         int_fmt = volume['INT_FMT']
         data_cols = 10
     # Parse the header portion of the file
-    try:
-        with open(filename, 'rt') as f:
-            for _ in range(line_offset):
-                next(f)
-            lines = [next(f) for x in range(volume['TEXT_HDR_ROWS'])]
+    lines = filelines[line_offset:line_offset + volume['TEXT_HDR_ROWS']]
     # Accounts for blank lines at end of files
-    except StopIteration:
+    if len(lines) < volume['TEXT_HDR_ROWS']:
         return (None, 1 + line_offset)
     # read in lines of integer data
     skiprows = line_offset + volume['TEXT_HDR_ROWS']
-    int_data = np.genfromtxt(filename, skip_header=skiprows,
+    int_data = np.genfromtxt(filelines, skip_header=skiprows,
                              max_rows=int_rows, dtype=np.int32,
                              delimiter=int_fmt).flatten()
 
     # read in lines of float data
     skiprows += int_rows
-    flt_data = np.genfromtxt(filename, skip_header=skiprows,
+    flt_data = np.genfromtxt(filelines, skip_header=skiprows,
                              max_rows=volume['FLT_HDR_ROWS'], dtype=np.float64,
                              delimiter=volume['FLT_FMT']).flatten()
     hdr = _get_header_info(int_data, flt_data, lines, 'V1', location=location)
     skiprows += volume['FLT_HDR_ROWS']
     # read in the data
     nrows = int(np.floor(hdr['npts'] * 2 / data_cols))
-    all_data = np.genfromtxt(filename, skip_header=skiprows,
+    all_data = np.genfromtxt(filelines, skip_header=skiprows,
                              max_rows=nrows, dtype=np.float64,
                              delimiter=volume['COL_FMT'])
     data = all_data.flatten()[1::2]
@@ -225,8 +231,7 @@ def _read_channel(filename, line_offset, volume, location='', alternate=False):
             raise GMProcessException('USC: %s is not a supported unit.' % unit)
 
     # Put file name into dictionary
-    head, tail = os.path.split(filename)
-    hdr['standard']['source_file'] = tail or os.path.basename(head)
+    hdr['standard']['source_file'] = source_file
 
     trace = StationTrace(data.copy(), Stats(hdr.copy()))
     if not is_evenly_spaced(times):
@@ -1,3 +1,4 @@
+import io
 import os
 import zipfile
 import logging
@@ -11,6 +12,125 @@ CONFIG = get_config()
 DUPLICATE_MARKER = '1'
 
 
+def is_path(source):
+    """Check whether the source of a data file is a path.
+
+    The readers accept the path to a data file, or its contents as bytes
+    (or a bytearray or memoryview) or a binary file-like object.
+
+    Args:
+        source (str, bytes, or file-like):
+            Path to the file, or its contents.
+
+    Returns:
+        bool: True if source is a path.
+    """
+    return isinstance(source, (str, os.PathLike))
+
+
+def read_source(source):
+    """Read the contents of a data file.
+
+    A file-like object is returned to its initial position (if it is
+    seekable), so that the format checks can each read it.
+
+    Args:
+        source (str, bytes, or file-like):
+            Path to the file, or its contents as bytes (or a bytearray or
+            memoryview) or a binary file-like object.
+
+    Returns:
+        bytes: Contents of the file.
+    """
+    if is_path(source):
+        with open(source, 'rb') as f:
+            return f.read()
+    if hasattr(source, 'read'):
+        seekable = hasattr(source, 'seekable') and source.seekable()
+        if seekable:
+            position = source.tell()
+        content = source.read()
+        if seekable:
+            source.seek(position)
+        return bytes(content)
+    return bytes(source)
+
+
+def open_text(source, encoding=None):
+    """Open a data file in text mode.
+
+    Args:
+        source (str, bytes, or file-like):
+            Path to the file, or its contents as bytes (or a bytearray or
+            memoryview) or a binary file-like object.
+        encoding (str):
+            Encoding of the file. Default is the encoding used by open().
+
+    Returns:
+        file-like: Text file object, with the same lines as the file opened
+        with open().
+    """
+    if is_path(source):
+        return open(source, 'rt', encoding=encoding)
+    return io.TextIOWrapper(io.BytesIO(read_source(source)),
+                            encoding=encoding)
+
+
+def read_lines(source, encoding=None):
+    """Read the lines of a text data file.
+
+    The lines can be parsed in place of the file, np.genfromtxt and
+    np.loadtxt also accept a list of lines.
+
+    Args:
+        source (str, bytes, or file-like):
+            Path to the file, or its contents as bytes (or a bytearray or
+            memoryview) or a binary file-like object.
+        encoding (str):
+            Encoding of the file. Default is the encoding used by open().
+
+    Returns:
+        list: Lines of the file, including the line endings.
+
+    Raises:
+        UnicodeDecodeError: If the file cannot be decoded.
+    """
+    with open_text(source, encoding=encoding) as f:
+        return f.readlines()
+
+
+def get_source_file(source):
+    """Name of the file that is stored in the trace metadata.
+
+    Args:
+        source (str, bytes, or file-like):
+            Path to the file, or its contents.
+
+    Returns:
+        str: Base name of the file, or an empty string if the contents were
+        not read from a path.
+    """
+    if not is_path(source):
+        return ''
+    head, tail = os.path.split(source)
+    return tail or os.path.basename(head)
+
+
+def describe_source(source):
+    """Describe the source of a data file for messages.
+
+    Args:
+        source (str, bytes, or file-like):
+            Path to the file, or its contents.
+
+    Returns:
+        str: The path, or the type of the contents.
+    """
+    if is_path(source):
+        return str(source)
+    return '<%s>' % type(source).__name__
+
+
 def is_evenly_spaced(times, rtol=1e-6, atol=1e-8):
     """
     Checks whether times are evenly spaced.
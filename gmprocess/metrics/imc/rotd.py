@@ -28,7 +28,3 @@ class ROTD(IMC):
             'Combination2': 'null_combination',
             'Reduction': 'percentile'
         }
-
-        if imt.startswith('sa'):
-            self._steps['Transform2'] = 'null_transform'
-            self._steps['Transform3'] = 'oscillator'
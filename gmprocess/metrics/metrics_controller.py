@@ -15,6 +15,7 @@ from gmprocess.constants import GAL_TO_PCTG
 from gmprocess.metrics.exception import PGMException
 from gmprocess.metrics.gather import gather_pgms
 from gmprocess.stationstream import StationStream
+from gmprocess.timing import StepTimer
 from gmprocess.constants import METRICS_XML_FLOAT_STRING_FORMAT
 
 
@@ -41,7 +42,7 @@ class MetricsController(object):
     """
 
     def __init__(self, imts, imcs, timeseries, bandwidth=None, damping=None,
-                 event=None, smooth_type=None, allow_nans=None):
+                 event=None, smooth_type=None, allow_nans=None, timer=None):
         """
         Args:
             imts (list):
@@ -60,6 +61,9 @@ class MetricsController(object):
             smoothing (string):
                 Currently not used, as konno_ohmachi is the only smoothing
                 type.
+            timer (StepTimer):
+                Optional StepTimer that records the time and memory used by
+                each IMT/IMC step set, under the 'metrics' stage.
         """
         if not isinstance(imts, (list, np.ndarray)):
             imts = [imts]
@@ -81,6 +85,7 @@ class MetricsController(object):
         self.smooth_type = smooth_type
         self.bandwidth = bandwidth
         self.allow_nans = allow_nans
+        self.timer = StepTimer() if timer is None else timer
         if damping is None:
             self.damping = self.config['metrics']['sa']['damping']
         if smooth_type is None:
@@ -100,7 +105,7 @@ class MetricsController(object):
         self.pgms = self.execute_steps()
 
     @classmethod
-    def from_config(cls, timeseries, config=None, event=None):
+    def from_config(cls, timeseries, config=None, event=None, timer=None):
         """
         Create class instance from a config. Can be a custom config or the
         default config found in ~/.gmprocess/config.yml.
@@ -114,6 +119,9 @@ class MetricsController(object):
             event (ScalarEvent):
                 Defines the focal time, geographic location and magnitude of
                 an earthquake hypocenter. Default is None.
+            timer (StepTimer):
+                Optional StepTimer that records the time and memory used by
+                each IMT/IMC step set.
 
         Notes:
             Custom configs must be in the following format:
@@ -191,7 +199,7 @@ class MetricsController(object):
         allow_nans = metrics['fas']['allow_nans']
         controller = cls(imts, imcs, timeseries, bandwidth=bandwidth,
                          damping=damping, event=event, smooth_type=smoothing,
-                         allow_nans=allow_nans)
+                         allow_nans=allow_nans, timer=timer)
 
         return controller
 
@@ -302,114 +310,10 @@ class MetricsController(object):
         """
         # Initialize dictionary for storing the results
         result_dict = None
+        station = self.timeseries.get_id()
         for idx, imt_imc in enumerate(self.step_sets):
-            step_set = self.step_sets[imt_imc]
-            period = step_set['period']
-            percentile = step_set['percentile']
-            if period is not None:
-                period = float(period)
-            if percentile is not None:
-                percentile = float(percentile)
-
-            # paths
-            transform_path = 'gmprocess.metrics.transform.'
-            rotation_path = 'gmprocess.metrics.rotation.'
-            combination_path = 'gmprocess.metrics.combination.'
-            reduction_path = 'gmprocess.metrics.reduction.'
-            try:
-                # -------------------------------------------------------------
-                # Transform 1
-                t1_mod = importlib.import_module(
-                    transform_path + step_set['Transform1'])
-                t1_cls = self._get_subclass(inspect.getmembers(
-                    t1_mod, inspect.isclass), 'Transform')
-                t1 = t1_cls(
-                    self.timeseries, self.damping, period, self._times,
-                    self.max_period, self.allow_nans, self.bandwidth).result
-
-                # -------------------------------------------------------------
-                # Transform 2
-                t2_mod = importlib.import_module(
-                    transform_path + step_set['Transform2'])
-                t2_cls = self._get_subclass(inspect.getmembers(
-                    t2_mod, inspect.isclass), 'Transform')
-                t2 = t2_cls(
-                    t1, self.damping, period, self._times, self.max_period,
-                    self.allow_nans, self.bandwidth).result
-
-                # -------------------------------------------------------------
-                # Rotation
-                rot_mod = importlib.import_module(
-                    rotation_path + step_set['Rotation'])
-                rot_cls = self._get_subclass(inspect.getmembers(
-                    rot_mod, inspect.isclass), 'Rotation')
-                rot = rot_cls(t2, self.event).result
-
-                # -------------------------------------------------------------
-                # Transform 3
-                t3_mod = importlib.import_module(
-                    transform_path + step_set['Transform3'])
-                t3_cls = self._get_subclass(inspect.getmembers(
-                    t3_mod, inspect.isclass), 'Transform')
-                t3 = t3_cls(
-                    rot, self.damping, period, self._times, self.max_period,
-                    self.allow_nans, self.bandwidth).result
-
-                # -------------------------------------------------------------
-                # Combination 1
-                c1_mod = importlib.import_module(
-                    combination_path + step_set['Combination1'])
-                c1_cls = self._get_subclass(inspect.getmembers(
-                    c1_mod, inspect.isclass), 'Combination')
-                c1 = c1_cls(t3).result
-
-                # -------------------------------------------------------------
-                # Reduction
-
-                # * There is a problem here in that the percentile reduction
-                #   step is not compatible with anything other than the max
-                #   of either the time history or the oscillator.
-                # * I think real solution is to have two reduction steps
-                # * For now, I'm just going to disallow the percentile based
-                #   methods with duration to avoid the incompatibility.
-                # * Currently, the percentile reduction uses the length
-                #   of c1 to decide if it needs to take the max of the
-                #   data before applying the reduction.
-
-                red_mod = importlib.import_module(
-                    reduction_path + step_set['Reduction'])
-                red_cls = self._get_subclass(inspect.getmembers(
-                    red_mod, inspect.isclass), 'Reduction')
-                red = red_cls(c1, self.bandwidth, percentile,
-                              period, self.smooth_type).result
-
-                # -------------------------------------------------------------
-                # Combination 2
-                c2_mod = importlib.import_module(
-                    combination_path + step_set['Combination2'])
-                c2_cls = self._get_subclass(inspect.getmembers(
-                    c2_mod, inspect.isclass), 'Combination')
-                c2 = c2_cls(red).result
-            except Exception as e:
-                msg = ('Error in calculation of %r: %r.\nResult '
-                       'cell will be set to np.nan.' % (imt_imc, str(e)))
-                logging.warning(msg)
-                c2 = {'': np.nan}
-
-            # we don't want to have separate columns for 'HN1' and 'HNN' and
-            # 'BHN'. Instead we want all of these to be considered as simply
-            # the "first horizontal channel".
-            if 'channels' in imt_imc:
-                channel_names = list(c2.keys())
-                (self.channel_dict,
-                 reverse_dict) = _get_channel_dict(channel_names)
-                new_c2 = {}
-                for channel, value in c2.items():
-                    newchannel = reverse_dict[channel]
-                    new_c2[newchannel] = value
-            else:
-                new_c2 = c2.copy()
-            subdict = self._format(new_c2, step_set)
+            with self.timer.time('metrics', station, imt_imc):
+                subdict = self._execute_step_set(imt_imc)
 
             # Update the results dictionary
             if result_dict is None:
@@ -425,6 +329,125 @@ class MetricsController(object):
         else:
             return df.set_index(['IMT', 'IMC'])
 
+    def _execute_step_set(self, imt_imc):
+        """
+        Executes one set of steps.
+
+        Args:
+            imt_imc (str):
+                Key of the step set in the step_sets dictionary.
+
+        Returns:
+            dict: Formatted results (see _format).
+        """
+        step_set = self.step_sets[imt_imc]
+        period = step_set['period']
+        percentile = step_set['percentile']
+        if period is not None:
+            period = float(period)
+        if percentile is not None:
+            percentile = float(percentile)
+
+        # paths
+        transform_path = 'gmprocess.metrics.transform.'
+        rotation_path = 'gmprocess.metrics.rotation.'
+        combination_path = 'gmprocess.metrics.combination.'
+        reduction_path = 'gmprocess.metrics.reduction.'
+        try:
+            # -------------------------------------------------------------
+            # Transform 1
+            t1_mod = importlib.import_module(
+                transform_path + step_set['Transform1'])
+            t1_cls = self._get_subclass(inspect.getmembers(
+                t1_mod, inspect.isclass), 'Transform')
+            t1 = t1_cls(
+                self.timeseries, self.damping, period, self._times,
+                self.max_period, self.allow_nans, self.bandwidth).result
+
+            # -------------------------------------------------------------
+            # Transform 2
+            t2_mod = importlib.import_module(
+                transform_path + step_set['Transform2'])
+            t2_cls = self._get_subclass(inspect.getmembers(
+                t2_mod, inspect.isclass), 'Transform')
+            t2 = t2_cls(
+                t1, self.damping, period, self._times, self.max_period,
+                self.allow_nans, self.bandwidth).result
+
+            # -------------------------------------------------------------
+            # Rotation
+            rot_mod = importlib.import_module(
+                rotation_path + step_set['Rotation'])
+            rot_cls = self._get_subclass(inspect.getmembers(
+                rot_mod, inspect.isclass), 'Rotation')
+            rot = rot_cls(t2, self.event).result
+
+            # -------------------------------------------------------------
+            # Transform 3
+            t3_mod = importlib.import_module(
+                transform_path + step_set['Transform3'])
+            t3_cls = self._get_subclass(inspect.getmembers(
+                t3_mod, inspect.isclass), 'Transform')
+            t3 = t3_cls(
+                rot, self.damping, period, self._times, self.max_period,
+                self.allow_nans, self.bandwidth).result
+
+            # -------------------------------------------------------------
+            # Combination 1
+            c1_mod = importlib.import_module(
+                combination_path + step_set['Combination1'])
+            c1_cls = self._get_subclass(inspect.getmembers(
+                c1_mod, inspect.isclass), 'Combination')
+            c1 = c1_cls(t3).result
+
+            # -------------------------------------------------------------
+            # Reduction
+
+            # * There is a problem here in that the percentile reduction
+            #   step is not compatible with anything other than the max
+            #   of either the time history or the oscillator.
+            # * I think real solution is to have two reduction steps
+            # * For now, I'm just going to disallow the percentile based
+            #   methods with duration to avoid the incompatibility.
+            # * Currently, the percentile reduction uses the length
+            #   of c1 to decide if it needs to take the max of the
+            #   data before applying the reduction.
+
+            red_mod = importlib.import_module(
+                reduction_path + step_set['Reduction'])
+            red_cls = self._get_subclass(inspect.getmembers(
+                red_mod, inspect.isclass), 'Reduction')
+            red = red_cls(c1, self.bandwidth, percentile,
+                          period, self.smooth_type).result
+
+            # -------------------------------------------------------------
+            # Combination 2
+            c2_mod = importlib.import_module(
+                combination_path + step_set['Combination2'])
+            c2_cls = self._get_subclass(inspect.getmembers(
+                c2_mod, inspect.isclass), 'Combination')
+            c2 = c2_cls(red).result
+        except Exception as e:
+            msg = ('Error in calculation of %r: %r.\nResult '
+                   'cell will be set to np.nan.' % (imt_imc, str(e)))
+            logging.warning(msg)
+            c2 = {'': np.nan}
+
+        # we don't want to have separate columns for 'HN1' and 'HNN' and
+        # 'BHN'. Instead we want all of these to be considered as simply
+        # the "first horizontal channel".
+        if 'channels' in imt_imc:
+            channel_names = list(c2.keys())
+            (self.channel_dict,
+             reverse_dict) = _get_channel_dict(channel_names)
+            new_c2 = {}
+            for channel, value in c2.items():
+                newchannel = reverse_dict[channel]
+                new_c2[newchannel] = value
+        else:
+            new_c2 = c2.copy()
+        return self._format(new_c2, step_set)
+
     def validate_stream(self):
         """
         Validates that the input is a StationStream, the units are either
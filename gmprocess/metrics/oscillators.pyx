@@ -1,5 +1,8 @@
 # stdlib imports
 import warnings
+import weakref
+import zlib
+from collections import OrderedDict
 
 # third party imports
 import numpy as np
@@ -16,12 +19,24 @@ from obspy import read
 # local imports
 from gmprocess.constants import GAL_TO_PCTG
 
+# Number of traces whose upsampled data are kept for the short periods; the
+# metrics of a station are computed one period at a time for all of its
+# channels, so this only needs to cover the channels of one station.
+UPSAMPLE_CACHE_SIZE = 6
+
+# Upsampled data of the most recently used traces, keyed by the id of the
+# trace. Each entry holds a weak reference to the trace (the entry is dropped
+# when the trace is freed, so the cache does not outlive the metrics of a
+# station), a checksum of its data (to detect changes), its sample rate, and
+# the upsampled data for each factor.
+_upsampled = OrderedDict()
+
 cdef extern from "cfuncs.h":
     void calculate_spectrals_c(double *acc, int np, double dt,
                                double period, double damping, double *sacc,
                                double *svel, double *sdis);
 
-cpdef list calculate_spectrals(trace, period, damping):
+cpdef list calculate_spectrals(trace, period, damping, cache=True):
     """
     Returns a list of spectral responses for acceleration, velocity,
             and displacement.
@@ -29,6 +44,8 @@ cpdef list calculate_spectrals(trace, period, damping):
         trace (obspy Trace object): The trace to be acted upon
         period (float): Period in seconds.
         damping (float): Fraction of critical damping.
+        cache (bool): Reuse the upsampled data of the trace for the other
+            periods with the same resample factor. Default is True.
 
     Returns:
         list: List of spectral responses (np.ndarray).
@@ -53,15 +70,17 @@ cpdef list calculate_spectrals(trace, period, damping):
         new_dt = tlen / (new_np - 1)
         # The new sample rate
         new_sample_rate = 1.0 / new_dt
-        # Make a copy because resampling happens in place
-        trace = trace.copy()
-        # Resample the trace
-        trace.resample(new_sample_rate, window=None)
+        if cache:
+            data = _get_upsampled(trace, ns, new_sample_rate)
+        else:
+            data = _upsample(trace, new_sample_rate)
+    else:
+        data = trace.data
 
     cdef ndarray[double, ndim=1] spectral_acc = np.zeros(new_np)
     cdef ndarray[double, ndim=1] spectral_vel = np.zeros(new_np)
     cdef ndarray[double, ndim=1] spectral_dis = np.zeros(new_np)
-    cdef ndarray[double, ndim=1] acc = trace.data
+    cdef ndarray[double, ndim=1] acc = data
 
     calculate_spectrals_c(<double *>acc.data, new_np, new_dt,
                           period, damping,
@@ -72,6 +91,71 @@ cpdef list calculate_spectrals(trace, period, damping):
             new_sample_rate]
 
 
+def _upsample(trace, new_sample_rate):
+    """
+    Returns the data of a trace resampled (in the frequency domain) to a
+            higher sample rate.
+    Args:
+        trace (obspy Trace object): The trace to be resampled.
+        new_sample_rate (float): The new sample rate.
+
+    Returns:
+        np.ndarray: The resampled data.
+    """
+    # Resample a bare trace, because resampling happens in place and there
+    # is no need to copy the metadata
+    bare = Trace(data=trace.data,
+                 header={'sampling_rate': trace.stats.sampling_rate})
+    bare.resample(new_sample_rate, window=None)
+    return bare.data
+
+
+def _get_upsampled(trace, ns, new_sample_rate):
+    """
+    Returns the data of a trace upsampled by a factor, reusing the result
+            of a previous call for the same trace, data, and factor.
+    Args:
+        trace (obspy Trace object): The trace to be resampled.
+        ns (int): The resample factor.
+        new_sample_rate (float): The new sample rate.
+
+    Returns:
+        np.ndarray: The resampled data.
+    """
+    key = id(trace)
+    checksum = zlib.crc32(np.ascontiguousarray(trace.data).tobytes())
+    entry = _upsampled.pop(key, None)
+    if (entry is None or entry[0]() is not trace or entry[1] != checksum
+            or entry[2] != trace.stats.sampling_rate):
+        entry = (weakref.ref(trace, _drop_upsampled(key)), checksum,
+                 trace.stats.sampling_rate, {})
+    _upsampled[key] = entry
+    while len(_upsampled) > UPSAMPLE_CACHE_SIZE:
+        _upsampled.popitem(last=False)
+
+    upsampled = entry[3]
+    if ns not in upsampled:
+        upsampled[ns] = _upsample(trace, new_sample_rate)
+    return upsampled[ns]
+
+
+def _drop_upsampled(key):
+    """
+    Returns the callback that removes the cached upsampled data of a trace
+            once the trace is freed.
+    Args:
+        key (int): The id of the trace.
+
+    Returns:
+        function: Callback for weakref.ref.
+    """
+    def callback(ref):
+        entry = _upsampled.get(key)
+        if entry is not None and entry[0] is ref:
+            del _upsampled[key]
+    return callback
+
+
 def get_acceleration(stream, units='%%g'):
     """
     Returns a stream of acceleration with specified units.
@@ -143,7 +227,10 @@ def get_spectral(period, stream, damping=0.05, times=None):
                          'sampling_rate': 1.0 / (times[1] - times[0])
                         }
                 new_trace = Trace(data=rot_matrix[idy], header=stats)
-                sa_list = calculate_spectrals(new_trace, period, damping)
+                # The rotated traces are new for each period, so there is
+                # nothing to reuse
+                sa_list = calculate_spectrals(
+                    new_trace, period, damping, cache=False)
                 acc_sa = sa_list[0]
                 acc_sa *= GAL_TO_PCTG
                 rotated_spectrals.append(acc_sa)
@@ -1,3 +1,6 @@
+# stdlib imports
+import zlib
+
 # Third party imports
 import numpy as np
 from scipy import integrate
@@ -5,9 +8,112 @@ from scipy import integrate
 # Local imports
 from gmprocess.constants import GAL_TO_PCTG
 from gmprocess.metrics.reduction.reduction import Reduction
-from gmprocess.stationstream import StationStream
 from gmprocess.stationtrace import StationTrace
 
+# Name of the trace cache holding the Arias intensity curve
+ARIAS_CACHE = 'arias'
+
+
+def arias_intensity(trace):
+    """
+    Arias intensity curve of an acceleration trace.
+
+    The curve is computed once and stored in the trace cache, so that it is
+    shared by the Arias and duration reductions, the plots and the NNet
+    quality metrics, and it is saved with the other cached arrays in the
+    workspace. It is recomputed if the data (compared by checksum), the
+    sample interval or the number of processing steps of the trace have
+    changed, e.g., for a rotated copy of a trace.
+
+    Args:
+        trace (StationTrace):
+            Acceleration trace (cm/s/s).
+
+    Returns:
+        numpy.ndarray: Arias intensity (m/s) at each sample, starting at
+        zero.
+    """
+    cacheable = isinstance(trace, StationTrace)
+    if cacheable:
+        checksum = zlib.crc32(np.ascontiguousarray(trace.data).tobytes())
+        key = np.array([trace.stats.npts, trace.stats.delta,
+                        len(trace.provenance), checksum], dtype=float)
+        if trace.hasCached(ARIAS_CACHE):
+            cached = trace.getCached(ARIAS_CACHE)
+            if np.array_equal(cached.get('key'), key):
+                return cached['intensity']
+
+    # convert from cm/s/s to m/s/s
+    acc = trace.data * 0.01
+    integrated_acc2 = integrate.cumtrapz(acc * acc, dx=trace.stats.delta)
+    intensity = np.zeros(len(acc))
+    intensity[1:] = integrated_acc2 * np.pi * GAL_TO_PCTG / 2
+
+    if cacheable:
+        trace.setCached(ARIAS_CACHE, {'intensity': intensity, 'key': key})
+    return intensity
+
+
+def normalized_arias(trace):
+    """
+    Arias intensity curve of an acceleration trace normalized by its final
+    value (i.e., the Husid curve).
+
+    Args:
+        trace (StationTrace):
+            Acceleration trace (cm/s/s).
+
+    Returns:
+        numpy.ndarray: Normalized Arias intensity at each sample.
+    """
+    intensity = arias_intensity(trace)
+    return intensity / intensity[-1]
+
+
+def arias_index(trace, fraction):
+    """
+    Index of the sample at which the normalized Arias intensity is closest to
+    a fraction of the total (the first such sample in case of ties).
+
+    Args:
+        trace (StationTrace):
+            Acceleration trace (cm/s/s).
+        fraction (float):
+            Fraction (0 to 1) of the Arias intensity.
+
+    Returns:
+        int: Index of the sample.
+    """
+    normalized = normalized_arias(trace)
+    # The curve is non-decreasing, so the closest value is either the first
+    # one that is not below the fraction or the one before it.
+    idx = np.searchsorted(normalized, fraction)
+    if idx == 0:
+        return 0
+    if (idx == len(normalized)
+            or fraction - normalized[idx - 1] <= normalized[idx] - fraction):
+        return int(np.searchsorted(normalized, normalized[idx - 1]))
+    return int(idx)
+
+
+def arias_duration(trace, start, end):
+    """
+    Significant duration between two fractions of the Arias intensity.
+
+    Args:
+        trace (StationTrace):
+            Acceleration trace (cm/s/s).
+        start (float):
+            Fraction (0 to 1) of the Arias intensity at the start.
+        end (float):
+            Fraction (0 to 1) of the Arias intensity at the end.
+
+    Returns:
+        float: Duration (s).
+    """
+    return ((arias_index(trace, end) - arias_index(trace, start))
+            * trace.stats.delta)
+
 
 class Arias(Reduction):
     """Class for calculation of arias intensity."""
@@ -29,7 +135,6 @@ class Arias(Reduction):
         """
         super().__init__(reduction_data, bandwidth=None, percentile=None,
                          period=None, smoothing=None)
-        self.arias_stream = None
         self.result = self.get_arias()
 
     def get_arias(self):
@@ -40,22 +145,8 @@ class Arias(Reduction):
             arias_intensities: Dictionary of arias intensity for each channel.
         """
         arias_intensities = {}
-        arias_stream = StationStream([])
         for trace in self.reduction_data:
-            dt = trace.stats['delta']
-            # convert from cm/s/s to m/s/s
-            acc = trace.data * 0.01
-
-            # Calculate Arias Intensity
-            integrated_acc2 = integrate.cumtrapz(acc * acc, dx=dt)
-            arias_intensity = integrated_acc2 * np.pi * GAL_TO_PCTG / 2
-
-            # Create a copy of stats so we don't modify original data
-            stats = trace.stats.copy()
-            channel = stats.channel
-            stats.standard.units = 'vel'
-            stats.npts = len(arias_intensity)
-            arias_stream.append(StationTrace(arias_intensity, stats))
-            arias_intensities[channel] = np.abs(np.max(arias_intensity))
-        self.arias_stream = arias_stream
+            channel = trace.stats.channel
+            arias_intensities[channel] = np.abs(
+                np.max(arias_intensity(trace)))
         return arias_intensities
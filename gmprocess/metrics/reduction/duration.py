@@ -1,9 +1,8 @@
 # Third party imports
 import numpy as np
-from scipy import integrate
 
 # Local imports
-from gmprocess.constants import GAL_TO_PCTG
+from gmprocess.metrics.reduction.arias import arias_duration
 from gmprocess.metrics.reduction.reduction import Reduction
 
 # Hard code percentiles for duration now. Need to make this conigurable.
@@ -42,23 +41,8 @@ class Duration(Reduction):
         """
         durations = {}
         for trace in self.reduction_data:
-            dt = trace.stats['delta']
-            # convert from cm/s/s to m/s/s
-            acc = trace.data * 0.01
-            time = trace.times()
-
-            # Calculate Arias Intensity
-            integrated_acc2 = integrate.cumtrapz(acc * acc, dx=dt)
-            arias_intensity = integrated_acc2 * np.pi * GAL_TO_PCTG / 2
-
-            # Normalized AI
-            ai_norm = arias_intensity/np.max(arias_intensity)
-
-            ind0 = np.argmin(np.abs(ai_norm - P_START))
-            ind1 = np.argmin(np.abs(ai_norm - P_END))
-
-            dur595 = time[ind1] - time[ind0]
+            dur595 = arias_duration(trace, P_START, P_END)
             channel = trace.stats.channel
-            durations[channel] = np.abs(np.max(dur595))
+            durations[channel] = np.abs(dur595)
 
         return durations
@@ -38,6 +38,10 @@ class Percentile(Reduction):
         """
         Performs calculation of percentile.
 
+        The reduction data are either a stream, for which the percentile of
+        each channel is computed, or the (already reduced) values of a
+        rotation, such as the maximum at each angle.
+
         Returns:
             percentiles: Dictionary of percentiles for each channel.
         """
@@ -46,9 +50,6 @@ class Percentile(Reduction):
             for tr in self.reduction_data:
                 percentiles[tr.channel] = np.percentile(
                     tr.data, self.percentile)
-        elif len(self.reduction_data) == 1:
-            maximums = np.amax(np.abs(self.reduction_data[0]), 1)
-            percentiles[''] = np.percentile(maximums, self.percentile)
         else:
             percentiles[''] = np.percentile(
                 self.reduction_data, self.percentile)
@@ -29,8 +29,7 @@ class GMROTD(Rotation):
         """
         horizontals = self._get_horizontals()
         osc1, osc2 = horizontals[0].data, horizontals[1].data
-        osc1_rot, osc2_rot = self.rotate(osc1, osc2, combine=False)
-        osc1_max = np.amax(osc1_rot, 1)
-        osc2_max = np.amax(osc2_rot, 1)
+        osc1_max, osc2_max = self.rotated_maxima(
+            osc1, osc2, combine=False, absolute=False)
         rotd = np.sqrt(osc1_max * osc2_max)
         return rotd
@@ -4,6 +4,10 @@ import numpy as np
 # Local imports
 from gmprocess.metrics.exception import PGMException
 
+# Maximum number of samples of rotated components that are held in memory at
+# once by Rotation.rotated_maxima (8 MB of doubles per component).
+ROTATION_BLOCK_SIZE = 2 ** 20
+
 
 class Rotation(object):
     """Base class for rotation calculations."""
@@ -208,3 +212,76 @@ class Rotation(object):
             osc1_rot = td1 * cos_deg + td2 * sin_deg
             osc2_rot = -td1 * sin_deg + td2 * cos_deg
             return osc1_rot, osc2_rot
+
+    def rotated_maxima(self, tr1, tr2, combine=False, delta=1.0,
+                       absolute=True):
+        """
+        Finds the maximum of the rotated components at each degree.
+
+        The result is the same as taking the maximum of each row of the
+        matrices returned by rotate, but the rotated components are computed
+        in blocks of angles (and of samples, for long records) of at most
+        ROTATION_BLOCK_SIZE samples, so that the memory used does not depend
+        on the length of the record.
+
+        Args:
+            tr1 (numpy.ndarray):
+                Data of trace 1 of strong motion data.
+            tr2 (numpy.ndarray):
+                Data of trace 2 of strong motion data.
+            combine (bool):
+                Whether rotated traces should be combined. Default is False.
+            delta (float):
+                Delta degrees which will determine the number of angles.
+                Default is 1.0
+            absolute (bool):
+                Whether to find the maximum of the absolute values.
+                Default is True.
+
+        Returns:
+            numpy.ndarray or tuple: Maximum at each degree, for the rotated
+            trace (combine=True) or for each of the two orthogonal rotated
+            traces (combine=False).
+        """
+        if combine:
+            max_deg = 180
+        else:
+            max_deg = 90
+
+        num_rows = int(max_deg * (1.0 / delta) + 1)
+        degrees = np.deg2rad(np.linspace(
+            0, max_deg, num_rows)).reshape((-1, 1))
+        cos_deg = np.cos(degrees)
+        sin_deg = np.sin(degrees)
+
+        td1 = np.reshape(tr1, (1, -1))
+        td2 = np.reshape(tr2, (1, -1))
+        npts = td1.shape[1]
+        if npts == 0:
+            raise PGMException('Rotation: Traces have no data.')
+        angle_block = max(1, min(num_rows, ROTATION_BLOCK_SIZE // npts))
+        time_block = max(1, ROTATION_BLOCK_SIZE // angle_block)
+
+        osc1_max = np.full(num_rows, -np.inf)
+        osc2_max = np.full(num_rows, -np.inf)
+        for start in range(0, num_rows, angle_block):
+            rows = slice(start, start + angle_block)
+            cos_block = cos_deg[rows]
+            sin_block = sin_deg[rows]
+            for tstart in range(0, npts, time_block):
+                d1 = td1[:, tstart:tstart + time_block]
+                d2 = td2[:, tstart:tstart + time_block]
+                osc1_rot = d1 * cos_block + d2 * sin_block
+                if absolute:
+                    np.abs(osc1_rot, out=osc1_rot)
+                np.maximum(osc1_max[rows], np.amax(osc1_rot, 1),
+                           out=osc1_max[rows])
+                if not combine:
+                    osc2_rot = -d1 * sin_block + d2 * cos_block
+                    if absolute:
+                        np.abs(osc2_rot, out=osc2_rot)
+                    np.maximum(osc2_max[rows], np.amax(osc2_rot, 1),
+                               out=osc2_max[rows])
+        if combine:
+            return osc1_max
+        return osc1_max, osc2_max
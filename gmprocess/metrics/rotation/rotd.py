@@ -22,9 +22,10 @@ class Rotd(Rotation):
         Performs GMROTD rotation.
 
         Returns:
-            rotd: numpy.ndarray of the rotated and combined traces.
+            rotd: numpy.ndarray of the maximum absolute value of the rotated
+            and combined traces at each degree.
         """
         horizontals = self._get_horizontals()
         osc1, osc2 = horizontals[0].data, horizontals[1].data
-        rotd = [self.rotate(osc1, osc2, combine=True)]
+        rotd = self.rotated_maxima(osc1, osc2, combine=True)
         return rotd
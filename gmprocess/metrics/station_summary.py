@@ -8,7 +8,7 @@ import numpy as np
 import pandas as pd
 from obspy.core.stream import Stream
 from obspy.geodetics.base import gps2dist_azimuth
-from openquake.hazardlib.geo.geodetic import distance
+from openquake.hazardlib.geo.geodetic import distance, geodetic_distance
 from impactutils.rupture.point_rupture import PointRupture
 
 # local imports
@@ -141,7 +141,7 @@ class StationSummary(object):
     @classmethod
     def from_config(cls, stream, config=None, event=None,
                     calc_waveform_metrics=True, calc_station_metrics=True,
-                    rupture=None, vs30_grids=None):
+                    rupture=None, vs30_grids=None, timer=None):
         """
         Args:
             stream (obspy.core.stream.Stream): Strong motion timeseries
@@ -158,6 +158,9 @@ class StationSummary(object):
             vs30_grids (dict):
                 A dictionary containing the vs30 grid files, names, and
                 descriptions (see config).
+            timer (StepTimer):
+                Optional StepTimer that records the time and memory used by
+                each IMT/IMC step set.
         Note:
             Assumes a processed stream with units of gal (1 cm/s^2).
             No processing is done by this class.
@@ -179,7 +182,7 @@ class StationSummary(object):
 
         if stream.passed and calc_waveform_metrics:
             metrics = MetricsController.from_config(
-                stream, config=config, event=event)
+                stream, config=config, event=event, timer=timer)
 
             station.channel_dict = metrics.channel_dict.copy()
 
@@ -247,7 +250,8 @@ class StationSummary(object):
     def from_stream(cls, stream, components, imts, event=None,
                     damping=None, smoothing=None, bandwidth=None,
                     allow_nans=None, config=None, calc_waveform_metrics=True,
-                    calc_station_metrics=True, rupture=None, vs30_grids=None):
+                    calc_station_metrics=True, rupture=None, vs30_grids=None,
+                    timer=None):
         """
         Args:
             stream (obspy.core.stream.Stream): Strong motion timeseries
@@ -270,6 +274,9 @@ class StationSummary(object):
             vs30_grids (dict):
                 A dictionary containing the vs30 grid files, names, and
                 descriptions (see config).
+            timer (StepTimer):
+                Optional StepTimer that records the time and memory used by
+                each IMT/IMC step set.
         Note:
             Assumes a processed stream with units of gal (1 cm/s^2).
             No processing is done by this class.
@@ -300,7 +307,7 @@ class StationSummary(object):
             metrics = MetricsController(
                 imts, components, stream, bandwidth=bandwidth,
                 allow_nans=allow_nans, damping=damping, event=event,
-                smooth_type=smoothing)
+                smooth_type=smoothing, timer=timer)
             station.channel_dict = metrics.channel_dict.copy()
             pgms = metrics.pgms
 
@@ -589,70 +596,8 @@ class StationSummary(object):
                 A dictionary containing the vs30 grid files, names, and
                 descriptions (see config).
         """
-        lat, lon = self.coordinates
-        elev = self.elevation
-        if self.event is not None:
-            event = self.event
-            dist, baz, _ = gps2dist_azimuth(lat, lon, event.latitude,
-                                            event.longitude)
-            self._distances['epicentral'] = dist / M_PER_KM
-            self._back_azimuth = baz
-            if event.depth is not None:
-                self._distances['hypocentral'] = distance(
-                    lon, lat, -elev / M_PER_KM, event.longitude,
-                    event.latitude, event.depth / M_PER_KM)
-
-        if rupture is not None:
-            lon = np.array([lon])
-            lat = np.array([lat])
-            elev = np.array([ELEVATION_FOR_DISTANCE_CALCS])
-
-            rrup, rrup_var = rupture.computeRrup(lon, lat, elev)
-            rjb, rjb_var = rupture.computeRjb(lon, lat, elev)
-            gc2_dict = rupture.computeGC2(lon, lat, elev)
-
-            if not isinstance(rupture, PointRupture):
-                rrup_var = np.full_like(rrup, np.nan)
-                rjb_var = np.full_like(rjb, np.nan)
-
-                # If we don't have a point rupture, then back azimuth needs
-                # to be calculated to the closest point on the rupture
-                dists = []
-                bazs = []
-                for quad in rupture._quadrilaterals:
-                    P0, P1, P2, P3 = quad
-                    for point in [P0, P1]:
-                        dist, az, baz = gps2dist_azimuth(
-                            point.y, point.x, lat, lon)
-                        dists.append(dist)
-                        bazs.append(baz)
-                self._back_azimuth = bazs[np.argmin(dists)]
-            else:
-                gc2_dict = {x: [np.nan] for x in gc2_dict}
-
-            self._distances.update({
-                'rupture': rrup[0],
-                'rupture_var': rrup_var[0],
-                'joyner_boore': rjb[0],
-                'joyner_boore_var': rjb_var[0],
-                'gc2_rx': gc2_dict['rx'][0],
-                'gc2_ry': gc2_dict['ry'][0],
-                'gc2_ry0': gc2_dict['ry0'][0],
-                'gc2_U': gc2_dict['U'][0],
-                'gc2_T': gc2_dict['T'][0]})
-
-        if vs30_grids is not None:
-            for vs30_name in vs30_grids.keys():
-                self._vs30[vs30_name] = {
-                    'value':
-                        vs30_grids[vs30_name]['grid_object'].getValue(
-                            lat, lon),
-                    'column_header':
-                        vs30_grids[vs30_name]['column_header'],
-                    'readme_entry':
-                        vs30_grids[vs30_name]['readme_entry'],
-                    'units':
-                        vs30_grids[vs30_name]['units']}
+        compute_event_station_metrics(
+            [self], event=self.event, rupture=rupture, vs30_grids=vs30_grids)
 
     def get_metric_xml(self):
         """Return XML for waveform metrics as defined for our ASDF implementation.
@@ -779,3 +724,117 @@ class StationSummary(object):
                 data.append(value)
         series = pd.Series(data, index)
         return series
+
+
+def compute_event_station_metrics(summaries, event=None, rupture=None,
+                                  vs30_grids=None):
+    """
+    Computes station metrics (distances, vs30, back azimuth) for the
+    StationSummaries of all of the stations that recorded an event.
+
+    The rupture and hypocentral distances and the vs30 values are computed
+    for all stations with one call each.
+
+    Args:
+        summaries (list):
+            List of StationSummary objects.
+        event (ScalarEvent):
+            Object containing latitude, longitude, depth, and magnitude.
+        rupture (PointRupture or QuadRupture):
+            impactutils rupture object. Default is None.
+        vs30_grids (dict):
+            A dictionary containing the vs30 grid files, names, and
+            descriptions (see config).
+    """
+    if not len(summaries):
+        return
+    lats = np.array([summary.coordinates[0] for summary in summaries])
+    lons = np.array([summary.coordinates[1] for summary in summaries])
+    elevs = np.array([summary.elevation for summary in summaries])
+
+    if event is not None:
+        for summary, lat, lon in zip(summaries, lats, lons):
+            dist, baz, _ = gps2dist_azimuth(lat, lon, event.latitude,
+                                            event.longitude)
+            summary._distances['epicentral'] = dist / M_PER_KM
+            summary._back_azimuth = baz
+        if event.depth is not None:
+            hypo_dists = distance(
+                lons, lats, -elevs / M_PER_KM, event.longitude,
+                event.latitude, event.depth / M_PER_KM)
+            for summary, hypo_dist in zip(summaries, hypo_dists):
+                summary._distances['hypocentral'] = hypo_dist
+
+    if rupture is not None:
+        elev = np.full_like(lons, ELEVATION_FOR_DISTANCE_CALCS)
+
+        rrup, rrup_var = rupture.computeRrup(lons, lats, elev)
+        rjb, rjb_var = rupture.computeRjb(lons, lats, elev)
+
+        if not isinstance(rupture, PointRupture):
+            # GC2 uses a projection that spans the sites and the rupture, so
+            # it is computed for each site on its own to not depend on the
+            # other sites.
+            gc2_dicts = [rupture.computeGC2(lons[i:i + 1], lats[i:i + 1],
+                                            elev[i:i + 1])
+                         for i in range(len(lons))]
+            gc2_dict = {x: np.concatenate([gd[x] for gd in gc2_dicts])
+                        for x in gc2_dicts[0]}
+            rrup_var = np.full_like(rrup, np.nan)
+            rjb_var = np.full_like(rjb, np.nan)
+
+            # If we don't have a point rupture, then back azimuth needs
+            # to be calculated to the closest point on the rupture
+            points = []
+            for quad in rupture._quadrilaterals:
+                P0, P1, P2, P3 = quad
+                points.extend([P0, P1])
+            point_lons = np.array([point.x for point in points])
+            point_lats = np.array([point.y for point in points])
+
+            # Spherical distances differ from the ellipsoidal ones by much
+            # less than 1%, so the closest point must be among these
+            # candidates.
+            sph_dists = geodetic_distance(
+                point_lons[np.newaxis, :], point_lats[np.newaxis, :],
+                lons[:, np.newaxis], lats[:, np.newaxis])
+            for summary, lat, lon, sph_dist in zip(
+                    summaries, lats, lons, sph_dists):
+                candidates = np.where(
+                    sph_dist <= 1.01 * np.min(sph_dist) + 0.001)[0]
+                dists = []
+                bazs = []
+                for point in [points[i] for i in candidates]:
+                    dist, az, baz = gps2dist_azimuth(
+                        point.y, point.x, lat, lon)
+                    dists.append(dist)
+                    bazs.append(baz)
+                summary._back_azimuth = bazs[np.argmin(dists)]
+        else:
+            gc2_dict = {x: np.full_like(lons, np.nan)
+                        for x in ['rx', 'ry', 'ry0', 'U', 'T']}
+
+        for i, summary in enumerate(summaries):
+            summary._distances.update({
+                'rupture': rrup[i],
+                'rupture_var': rrup_var[i],
+                'joyner_boore': rjb[i],
+                'joyner_boore_var': rjb_var[i],
+                'gc2_rx': gc2_dict['rx'][i],
+                'gc2_ry': gc2_dict['ry'][i],
+                'gc2_ry0': gc2_dict['ry0'][i],
+                'gc2_U': gc2_dict['U'][i],
+                'gc2_T': gc2_dict['T'][i]})
+
+    if vs30_grids is not None:
+        for vs30_name in vs30_grids.keys():
+            values = vs30_grids[vs30_name]['grid_object'].getValue(lats, lons)
+            for summary, value in zip(summaries, values):
+                summary._vs30[vs30_name] = {
+                    'value': value,
+                    'column_header':
+                        vs30_grids[vs30_name]['column_header'],
+                    'readme_entry':
+                        vs30_grids[vs30_name]['readme_entry'],
+                    'units':
+                        vs30_grids[vs30_name]['units']}
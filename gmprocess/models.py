@@ -1,9 +1,9 @@
 import os
-import yaml
 import pkg_resources
 from importlib import import_module
 
 from gmprocess.constants import MODULE_FILE
+from gmprocess.config import read_config
 
 
 def load_model(model):
@@ -18,8 +18,7 @@ def load_model(model):
     """
     mod_file = pkg_resources.resource_filename(
         'gmprocess', os.path.join('data', MODULE_FILE))
-    with open(mod_file, 'r') as f:
-        mods = yaml.load(f, Loader=yaml.FullLoader)
+    mods = read_config(mod_file)
 
     # Import module
     cname, mpath = mods['modules'][model]
@@ -1,11 +1,27 @@
 import csv
 import numpy as np
-import copy
+from functools import lru_cache
 from scipy.integrate import cumtrapz
 import pkg_resources
 import os
 import logging
 
+from gmprocess.stationstream import StationStream
+from gmprocess.metrics.reduction.arias import normalized_arias
+
+# Columns of the quality metrics vector that are deskewed with a logarithm
+DESKEW_LOG_COLUMNS = [0, 1, 11, 15, 16]
+
+# Exponents used to deskew the other columns of the quality metrics vector
+# (column 17 is deskewed with -1/x**1.2 for both models)
+DESKEW_POWERS = {
+    'Cant': {2: -.2, 3: .12, 4: .16, 5: .48, 6: .37, 7: .25, 8: .23, 9: .05,
+             10: -.06, 12: .05, 13: .08, 14: .1, 18: .33, 19: .43},
+    'CantWell': {2: -.2, 3: .05, 4: .05, 5: .3, 6: .37, 7: .1, 8: .23,
+                 9: .2, 10: -.06, 12: .05, 13: .08, 14: .05, 18: .33,
+                 19: .43}
+}
+
 
 def isNumber(s):
     '''
@@ -67,15 +83,12 @@ def sigmoid(v_input):
     Performs a sigmoid operation on the input (1/(e(-x)+1))
 
     Args:
-        v_input (float): a number defined on R (real)
+        v_input (np.array): numbers defined on R (real)
 
     Returns:
-        float: sigmoid result (a number between 0 and 1)
+        np.array: sigmoid result (numbers between 0 and 1)
     '''
-    v_act = []
-    for x in v_input:
-        v_act.append(1./(1+np.exp(-x)))
-    return v_act
+    return 1. / (1 + np.exp(-np.asarray(v_input)))
 
 
 def tanh(v_input):
@@ -83,15 +96,12 @@ def tanh(v_input):
     Performs a hyperbolic tangent operation on the input (2/(e(2x)+1))
 
     Args:
-        v_input (float) a number defined on R (real)
+        v_input (np.array): numbers defined on R (real)
 
     Returns:
-        float: tanh result (a number between -1 and 1)
+        np.array: tanh result (numbers between -1 and 1)
     '''
-    v_act = []
-    for x in v_input:
-        v_act.append(np.tanh(x))
-    return v_act
+    return np.tanh(v_input)
 
 
 class neuralNet():
@@ -181,23 +191,24 @@ class neuralNet():
         Args:
             v_input (list or np.array): list or numpy array of the inputs
             (must be all numerical). Size must be equal to the NN input layer
-            size.
+            size, or the array may have one row of inputs per record to
+            evaluate them all at once.
 
         Returns:
-            v_inter (np.array): numpy array containing the results.
+            v_inter (np.array): numpy array containing the results, with one
+            row per record.
         '''
         v_inter = np.array([])
         # Transform input if required
-        if isinstance(v_input, list):
-            v_input = np.asarray(v_input)
+        v_input = np.asarray(v_input, dtype=float)
 
         # First layer
         if self.activation_H1 == 'sigmoid':
-            v_inter = sigmoid(np.dot(v_input.T, self.w_H1) + self.b_H1)
+            v_inter = sigmoid(np.dot(v_input, self.w_H1) + self.b_H1)
         elif self.activation_H1 == 'tanh':
-            v_inter = tanh(np.dot(v_input.T, self.w_H1) + self.b_H1)
+            v_inter = tanh(np.dot(v_input, self.w_H1) + self.b_H1)
         else:
-            v_inter = np.dot(v_input.T, self.w_H1) + self.b_H1
+            v_inter = np.dot(v_input, self.w_H1) + self.b_H1
 
         # If second layer exist
         if self.n_neuron_H2 != -1:
@@ -225,85 +236,24 @@ def deskewData(data, model_name):
     quality metrics vector. Depending on the selected model.
 
     Args:
-        data (list of floats): 20 quality metrics computed as described in the
-        paper
+        data (list of floats or np.array): 20 quality metrics computed as
+        described in the paper, or an array with one row of quality metrics
+        per record
         model_name (string): name of the selected model. Available 'Cant' and
         'CantWell' as described in the paper
 
     Returns:
-        list of float: processed (deskewed) data
-    '''
-    if model_name == 'Cant':
-        for i in range(len(data)):
-            if i == 0 or i == 1 or i == 11 or i == 15 or i == 16:
-                data[i] = np.log(data[i])
-            elif i == 17:
-                data[i] = -1.0/data[i]**1.2
-            elif i == 2:
-                data[i] = data[i]**(-.2)
-            elif i == 10:
-                data[i] = data[i]**(-.06)
-            elif i == 19:
-                data[i] = data[i]**.43
-            elif i == 7:
-                data[i] = data[i]**.25
-            elif i == 8:
-                data[i] = data[i]**.23
-            elif i == 9:
-                data[i] = data[i]**.05
-            elif i == 18:
-                data[i] = data[i]**.33
-            elif i == 3:
-                data[i] = data[i]**(.12)
-            elif i == 5:
-                data[i] = data[i]**(.48)
-            elif i == 6:
-                data[i] = data[i]**(.37)
-            elif i == 12:
-                data[i] = data[i]**.05
-            elif i == 13:
-                data[i] = data[i]**.08
-            elif i == 4:
-                data[i] = data[i]**(.16)
-            elif i == 14:
-                data[i] = data[i]**(.1)
-        return data
-
-    elif model_name == 'CantWell':
-        for i in range(len(data)):
-            if i == 0 or i == 1 or i == 11 or i == 15 or i == 16:
-                data[i] = np.log(data[i])
-            elif i == 17:
-                data[i] = -1.0/data[i]**1.2
-            elif i == 2:
-                data[i] = data[i]**(-.2)
-            elif i == 10:
-                data[i] = data[i]**(-.06)
-            elif i == 19:
-                data[i] = data[i]**.43
-            elif i == 7:
-                data[i] = data[i]**.1
-            elif i == 8:
-                data[i] = data[i]**.23
-            elif i == 9:
-                data[i] = data[i]**.2
-            elif i == 18:
-                data[i] = data[i]**.33
-            elif i == 3:
-                data[i] = data[i]**(.05)
-            elif i == 5:
-                data[i] = data[i]**(.3)
-            elif i == 6:
-                data[i] = data[i]**(.37)
-            elif i == 12:
-                data[i] = data[i]**.05
-            elif i == 13:
-                data[i] = data[i]**.08
-            elif i == 4:
-                data[i] = data[i]**(.05)
-            elif i == 14:
-                data[i] = data[i]**(.05)
-        return data
+        np.array: processed (deskewed) data
+    '''
+    if model_name not in DESKEW_POWERS:
+        return None
+    data = np.array(data, dtype=float)
+    columns, powers = zip(*sorted(DESKEW_POWERS[model_name].items()))
+    columns = list(columns)
+    data[..., columns] = data[..., columns] ** np.array(powers)
+    data[..., DESKEW_LOG_COLUMNS] = np.log(data[..., DESKEW_LOG_COLUMNS])
+    data[..., 17] = -1.0 / data[..., 17]**1.2
+    return data
 
 
 def standardizeData(data, mu, sigma):
@@ -311,18 +261,16 @@ def standardizeData(data, mu, sigma):
     Performs a standardization operation on the given data ((X-mu)/sigma)
 
     Args:
-        data (list of float): data to standardize (size represents the
-        dimensionality of the data and not the number of point to standardize)
+        data (list of float or np.array): data to standardize (size
+        represents the dimensionality of the data); may also be an array
+        with one row per point to standardize
         mu (list of float): means
         sigma (list of float): standard deviation
 
     Returns:
-        list o float: standardized data
+        np.array: standardized data
     '''
-    for i in range(len(data)):
-        data[i] = (data[i]-mu[i])/sigma[i]
-
-    return data
+    return (np.asarray(data) - np.asarray(mu)) / np.asarray(sigma)
 
 
 def decorrelateData(data, M):
@@ -332,15 +280,14 @@ def decorrelateData(data, M):
 
     Args:
         data (np.array): numpy array containing the data to be decorrelated
-        (size = N).
+        (size = N, or K x N for K records).
         M (np.array): decorrelation matrix (size NxN)
 
     Returns:
-        list of float containing the decorrelated data
+        list of float containing the decorrelated data (a list of lists for
+        K records)
     '''
-    M = np.array(M)
-    data = M.dot(data)
-    data = np.transpose(data)
+    data = np.dot(data, np.asarray(M).T)
 
     return data.tolist()
 
@@ -351,22 +298,16 @@ def preprocessQualityMetrics(qm, model_name):
     (i.e. deskews, standardizes and decorrelates the quality metrics)
 
     Args:
-        qm (list of float): quality metrics estimated according to the paper
+        qm (list of float or np.array): quality metrics estimated according
+        to the paper, or an array with one row of quality metrics per record
         model_name (string): name of the used model for processing. Available:
         'Cant' and 'CantWell'.
 
     Returns:
-        list of float containing the pre-processed quality metrics.
+        list of float containing the pre-processed quality metrics (a list of
+        lists for several records).
     '''
-    # Building dir path from model name
-    data_path = os.path.join('data', 'nn_qa')
-    data_path = os.path.join(data_path, model_name)
-    data_path = pkg_resources.resource_filename('gmprocess', data_path)
-
-    # Get resource from the correct dir
-    M = loadCSV(os.path.join(data_path, 'M.csv'))
-    csv_dir = os.path.join(data_path, 'mu_sigma.csv')
-    [mu, sigma] = loadCSV(csv_dir)
+    M, mu, sigma = loadPreprocessing(model_name)
 
     # Deskew, standardize and decorrelate data
     qm = deskewData(qm, model_name)
@@ -376,6 +317,48 @@ def preprocessQualityMetrics(qm, model_name):
     return qm
 
 
+@lru_cache(maxsize=None)
+def loadPreprocessing(model_name):
+    '''
+    Load the standardization and decorrelation parameters of a model. The
+    parameters are read once per process and cached.
+
+    Args:
+        model_name (string): name of the model ('Cant' or 'CantWell').
+
+    Returns:
+        tuple of np.array: decorrelation matrix, means and standard
+        deviations. The arrays are shared and must not be modified.
+    '''
+    data_path = os.path.join('data', 'nn_qa', model_name)
+    data_path = pkg_resources.resource_filename('gmprocess', data_path)
+    M = np.array(loadCSV(os.path.join(data_path, 'M.csv')))
+    mu, sigma = np.array(loadCSV(os.path.join(data_path, 'mu_sigma.csv')))
+    for array in [M, mu, sigma]:
+        array.flags.writeable = False
+    return M, mu, sigma
+
+
+@lru_cache(maxsize=None)
+def loadModel(model_name):
+    '''
+    Load the neural network of a model. The network is read once per process
+    and cached.
+
+    Args:
+        model_name (string): name of the model ('Cant' or 'CantWell').
+
+    Returns:
+        neuralNet: the populated neural network, which is shared and must not
+        be modified.
+    '''
+    nn_path = os.path.join('data', 'nn_qa', model_name)
+    nn_path = pkg_resources.resource_filename('gmprocess', nn_path)
+    NN = neuralNet()
+    NN.loadNN(nn_path)
+    return NN
+
+
 def get_husid(acceleration, time_vector):
     """
     Returns the Husid vector, defined as int{acceleration ** 2.}
@@ -401,10 +384,9 @@ def getFreqIndex(ft_freq, lower, upper):
     Returns:
         int, int: the indices bounding the range
     '''
-    lower_indices = [i for i, x in enumerate(ft_freq) if x > lower]
-    upper_indices = [i for i, x in enumerate(ft_freq) if x < upper]
-    lower_index = min(lower_indices)
-    upper_index = max(upper_indices)
+    ft_freq = np.asarray(ft_freq)
+    lower_index = np.flatnonzero(ft_freq > lower)[0]
+    upper_index = np.flatnonzero(ft_freq < upper)[-1]
     return lower_index, upper_index
 
 
@@ -419,8 +401,7 @@ def getHusidIndex(husid, threshold):
     Returns:
         int: the index of the latest value below the threshold
     '''
-    husid_indices = [i for i, x in enumerate(husid) if x > threshold]
-    husid_index = min(husid_indices)
+    husid_index = np.flatnonzero(np.asarray(husid) > threshold)[0]
     return husid_index
 
 
@@ -469,11 +450,16 @@ def getClassificationMetrics(tr, p_pick, delta_t):
     Compute the quality metrics as in Bellagamba et al. (2019). More details
     in the paper.
 
+    The two horizontal components are stacked and processed together as 2D
+    arrays (one row per component).
+
     WARNINGS: - Acceleration untis changed into g at the beginning!
               - Vertical component is not used!
 
     Args:
         tr (list of list of float): each list contains an horizontal trace
+        (the normalized Arias intensities are computed from the traces
+        unless they are given as 'arias_comp1' and 'arias_comp2')
         p_pick (float): estimated P-wave arrival time (in seconds) from the
         start of the record
         delta_t (float): time step used in the record in seconds (decimal)
@@ -486,29 +472,16 @@ def getClassificationMetrics(tr, p_pick, delta_t):
     #    Vertical component not used!!!    #
     ########################################
 
-    # Extract data from dictionary
-    # First horizontal comp
-    acc_comp1 = np.asarray(tr['acc_comp1'])/981.
-    ft1_freq = np.asarray(tr['ft1_freq'])
-    ft1 = np.asarray(tr['ft1'])/981.
-    smooth_ft1 = np.asarray(tr['smooth_ft1'])/981.
+    # Extract data from dictionary, one row per horizontal component
+    def stack(name):
+        return np.vstack([np.asarray(tr[name % 1]), np.asarray(tr[name % 2])])
+
+    acc = stack('acc_comp%i') / 981.
+    smooth_ft = stack('smooth_ft%i') / 981.
+    smooth_ft_pe = stack('smooth_ft%i_pe') / 981.
     smooth_ft1_freq = np.asarray(tr['smooth_ft1_freq'])
-    ft1_pe = np.asarray(tr['ft1_pe'])/981.
-    ft1_freq_pe = np.asarray(tr['ft1_freq_pe'])
-    smooth_ft1_pe = np.asarray(tr['smooth_ft1_pe'])/981.
-    snr1 = np.asarray(tr['snr1'])
     snr1_freq = np.asarray(tr['snr1_freq'])
 
-    # Second horizontal comp
-    acc_comp2 = np.asarray(tr['acc_comp2'])/981.
-    ft2_freq = np.asarray(tr['ft2_freq'])
-    ft2 = np.asarray(tr['ft2'])/981.
-    smooth_ft2 = np.asarray(tr['smooth_ft2'])/981.
-    ft2_pe = np.asarray(tr['ft2_pe'])/981.
-    ft2_freq_pe = np.asarray(tr['ft2_freq_pe'])
-    smooth_ft2_pe = np.asarray(tr['smooth_ft2_pe'])/981.
-    snr2 = np.asarray(tr['snr2'])
-
     # Sample rate
     sample_rate = 1./delta_t
 
@@ -516,189 +489,103 @@ def getClassificationMetrics(tr, p_pick, delta_t):
     index_p_arrival = int(np.floor(np.multiply(p_pick, sample_rate)))
 
     # recreate a time vector
-    t = np.arange(len(acc_comp1))*delta_t
-
-    # set up a copy of accelerations for plotting later (they get changed
-    # by window/taper in the ft step)
-    acc1 = copy.deepcopy(acc_comp1)
-    acc2 = copy.deepcopy(acc_comp2)
+    t = np.arange(acc.shape[1])*delta_t
 
-    # calculate husid and Arias intensities
-    husid1, AI1, Arias1, husid_index1_5, husid_index1_75, husid_index1_95 = \
-        calculateHusid(acc1, t)
-    husid2, AI2, Arias2, husid_index2_5, husid_index2_75, husid_index2_95 = \
-        calculateHusid(acc2, t)
+    # normalized Arias intensities, if they are not given
+    if 'arias_comp1' in tr:
+        AI = stack('arias_comp%i')
+    else:
+        husid = np.hstack([np.zeros((2, 1)),
+                           cumtrapz(acc ** 2., t, axis=-1)])
+        AI = husid / np.max(husid, axis=-1, keepdims=True)
+    husid_index_5 = np.argmax(AI > 0.05, axis=-1)
+    husid_index_75 = np.argmax(AI > 0.75, axis=-1)
+    husid_index_95 = np.argmax(AI > 0.95, axis=-1)
 
     # calculate max amplitudes of acc time series, final is geomean
-    PGA1 = np.max(np.abs(acc1))
-    PGA2 = np.max(np.abs(acc2))
-    amp1_pe = max(abs(acc1[0:index_p_arrival]))
-    amp2_pe = max(abs(acc2[0:index_p_arrival]))
+    abs_acc = np.abs(acc)
+    PGA1, PGA2 = np.max(abs_acc, axis=-1)
+    amp1_pe, amp2_pe = np.max(abs_acc[:, 0:index_p_arrival], axis=-1)
     PGA = np.sqrt(PGA1*PGA2)
     PN = np.sqrt(amp1_pe*amp2_pe)
-    PN_average = np.sqrt(np.average(abs(acc1[0:index_p_arrival])) *
-                         np.average(abs(acc2[0:index_p_arrival])))
+    PN_average = np.sqrt(np.prod(np.mean(
+        abs_acc[:, 0:index_p_arrival], axis=-1)))
     PNPGA = PN/PGA
 
     # calculate effective head and tail lengths
     tail_duration = min([5.0, 0.1*t[-1]])
     tail_length = int(tail_duration * sample_rate)
-    tail_average1 = np.mean(abs(acc1[-tail_length:]))
-    tail_average2 = np.mean(abs(acc2[-tail_length:]))
-    if PGA1 != 0 and PGA2 != 0:
-        tail_ratio1 = tail_average1 / PGA1
-        tail_ratio2 = tail_average2 / PGA2
-        tail_ratio = np.sqrt(tail_ratio1*tail_ratio2)
-        tailnoise_ratio = tail_ratio / PN_average
-    else:
-        logging.debug('PGA1 or PGA2 is 0')
-        tail_ratio1 = 1.0
-        tail_ratio2 = 1.0
-        tail_ratio = 1.0
-
+    tail_average1, tail_average2 = np.mean(
+        abs_acc[:, -tail_length:], axis=-1)
     mtail_duration = min([2.0, 0.1*t[-1]])
     mtail_length = int(mtail_duration * sample_rate)
-    mtail_max1 = np.max(abs(acc1[-mtail_length:]))
-    mtail_max2 = np.max(abs(acc2[-mtail_length:]))
-    if PGA1 != 0 and PGA2 != 0:
-        mtail_ratio1 = mtail_max1 / PGA1
-        mtail_ratio2 = mtail_max2 / PGA2
-        mtail_ratio = np.sqrt(mtail_ratio1*mtail_ratio2)
-        mtailnoise_ratio = mtail_ratio / PN
-    else:
-        logging.debug('PGA1 or PGA2 is 0')
-        mtail_ratio1 = 1.0
-        mtail_ratio2 = 1.0
-        mtail_ratio = 1.0
-
+    mtail_max1, mtail_max2 = np.max(abs_acc[:, -mtail_length:], axis=-1)
     head_duration = 1.0
     head_length = int(head_duration * sample_rate)
-    head_average1 = np.max(abs(acc1[0:head_length]))
-    head_average2 = np.max(abs(acc2[0:head_length]))
+    head_average1, head_average2 = np.max(
+        abs_acc[:, 0:head_length], axis=-1)
     if PGA1 != 0 and PGA2 != 0:
-        head_ratio1 = head_average1 / PGA1
-        head_ratio2 = head_average2 / PGA2
-        head_ratio = np.sqrt(head_ratio1*head_ratio2)
+        tail_ratio = np.sqrt((tail_average1 / PGA1) *
+                             (tail_average2 / PGA2))
+        mtail_ratio = np.sqrt((mtail_max1 / PGA1) * (mtail_max2 / PGA2))
+        head_ratio = np.sqrt((head_average1 / PGA1) *
+                             (head_average2 / PGA2))
     else:
         logging.debug('PGA1 or PGA2 is 0')
-        head_ratio1 = 1.0
-        head_ratio2 = 1.0
+        tail_ratio = 1.0
+        mtail_ratio = 1.0
         head_ratio = 1.0
-
-    # bracketed durations between 10%, 20%, 30%, 40% and 50% of PGA
-    # first get all vector indices where abs max acc is greater than or
-    # equal, and less than or equal to x*PGA
-    hindex1_10 = [i for (i, a) in enumerate(acc1)
-                  if np.abs(a) >= (0.10*np.max(np.abs(acc1)))]
-    hindex2_10 = [i for (i, a) in enumerate(acc2)
-                  if np.abs(a) >= (0.10*np.max(np.abs(acc2)))]
-    hindex1_20 = [i for (i, a) in enumerate(acc1)
-                  if np.abs(a) >= (0.20*np.max(np.abs(acc1)))]
-    hindex2_20 = [i for (i, a) in enumerate(acc2)
-                  if np.abs(a) >= (0.20*np.max(np.abs(acc2)))]
-
-    # get bracketed duration (from last and first time the index is exceeded)
-    if len(hindex1_10) != 0 and len(hindex2_10) != 0:
-        bracketedPGA_10 = np.sqrt(((max(hindex1_10)-min(hindex1_10))*delta_t) *
-                                  ((max(hindex2_10)-min(hindex2_10))*delta_t))
-    else:
-        bracketedPGA_10 = 9999.0
-
-    if len(hindex1_20) != 0 and len(hindex2_20) != 0:
-        bracketedPGA_20 = np.sqrt(((max(hindex1_20)-min(hindex1_20))*delta_t) *
-                                  ((max(hindex2_20)-min(hindex2_20))*delta_t))
-    else:
-        bracketedPGA_20 = 9999.0
-
-    bracketedPGA_10_20 = bracketedPGA_10/bracketedPGA_20
+    tailnoise_ratio = tail_ratio / PN_average
+    mtailnoise_ratio = mtail_ratio / PN
+
+    # bracketed durations between 10% and 20% of PGA, from the first and last
+    # time that the absolute acceleration is greater than or equal to x*PGA
+    npts = acc.shape[1]
+    PGAs = np.array([[PGA1], [PGA2]])
+    bracketed = []
+    for fraction in [0.10, 0.20]:
+        exceeded = abs_acc >= fraction * PGAs
+        first = np.argmax(exceeded, axis=-1)
+        last = npts - 1 - np.argmax(exceeded[:, ::-1], axis=-1)
+        durations = (last - first) * delta_t
+        bracketed.append(np.sqrt(durations[0] * durations[1]))
+    bracketedPGA_10_20 = bracketed[0] / bracketed[1]
 
     # calculate Ds575 and Ds595
-    Ds575 = np.sqrt(((husid_index1_75-husid_index1_5)*delta_t) *
-                    ((husid_index2_75-husid_index2_5)*delta_t))
-    Ds595 = np.sqrt(((husid_index1_95-husid_index1_5)*delta_t) *
-                    ((husid_index2_95-husid_index2_5)*delta_t))
+    Ds575 = np.sqrt(np.prod((husid_index_75 - husid_index_5) * delta_t))
+    Ds595 = np.sqrt(np.prod((husid_index_95 - husid_index_5) * delta_t))
 
     # geomean of fourier spectra
-    smooth_ftgm = np.sqrt(np.multiply(abs(smooth_ft1), abs(smooth_ft2)))
-    smooth_ftgm_pe = np.sqrt(np.multiply(abs(smooth_ft1_pe),
-                                         abs(smooth_ft2_pe)))
+    smooth_ftgm = np.sqrt(np.abs(smooth_ft[0]) * np.abs(smooth_ft[1]))
+    smooth_ftgm_pe = np.sqrt(np.abs(smooth_ft_pe[0]) *
+                             np.abs(smooth_ft_pe[1]))
 
     # snr metrics - min, max and averages
     lower_index, upper_index = getFreqIndex(smooth_ft1_freq, 0.1, 20)
     snrgm = np.divide(smooth_ftgm, smooth_ftgm_pe)
-    snr_min = min(snrgm[lower_index:upper_index])
-    snr_max = max(snrgm)
-
-    lower_index_average, upper_index_average = getFreqIndex(snr1_freq, 0.1, 10)
-    snr_average = (np.trapz(
-        snrgm[lower_index_average:upper_index_average],
-        snr1_freq[lower_index_average:upper_index_average]) /
-        (snr1_freq[upper_index_average]-snr1_freq[lower_index_average]))
-
-    lower_index_average, upper_index_average = getFreqIndex(
-        snr1_freq, 0.1, 0.5)
-    ft_a1 = (np.trapz(
-        smooth_ftgm[lower_index_average:upper_index_average],
-        snr1_freq[lower_index_average:upper_index_average]) /
-        (snr1_freq[upper_index_average]-snr1_freq[lower_index_average]))
-    snr_a1 = (np.trapz(
-        snrgm[lower_index_average:upper_index_average],
-        snr1_freq[lower_index_average:upper_index_average]) /
-        (snr1_freq[upper_index_average]-snr1_freq[lower_index_average]))
-
-    lower_index_average, upper_index_average = getFreqIndex(
-        snr1_freq, 0.5, 1.0)
-    ft_a2 = (np.trapz(
-        smooth_ftgm[lower_index_average:upper_index_average],
-        snr1_freq[lower_index_average:upper_index_average]) /
-        (snr1_freq[upper_index_average]-snr1_freq[lower_index_average]))
-    snr_a2 = (np.trapz(
-        snrgm[lower_index_average:upper_index_average],
-        snr1_freq[lower_index_average:upper_index_average]) /
-        (snr1_freq[upper_index_average]-snr1_freq[lower_index_average]))
-
-    lower_index_average, upper_index_average = getFreqIndex(
-        snr1_freq, 1.0, 2.0)
-    snr_a3 = (np.trapz(
-        snrgm[lower_index_average:upper_index_average],
-        snr1_freq[lower_index_average:upper_index_average]) /
-        (snr1_freq[upper_index_average]-snr1_freq[lower_index_average]))
-
-    lower_index_average, upper_index_average = getFreqIndex(
-        snr1_freq, 2.0, 5.0)
-    snr_a4 = (np.trapz(
-        snrgm[lower_index_average:upper_index_average],
-        snr1_freq[lower_index_average:upper_index_average]) /
-        (snr1_freq[upper_index_average]-snr1_freq[lower_index_average]))
-
-    lower_index_average, upper_index_average = getFreqIndex(
-        snr1_freq, 5.0, 10.0)
-    snr_a5 = (np.trapz(
-        snrgm[lower_index_average:upper_index_average],
-        snr1_freq[lower_index_average:upper_index_average]) /
-        (snr1_freq[upper_index_average]-snr1_freq[lower_index_average]))
-
+    snr_min = _sequence_min(snrgm[lower_index:upper_index])
+    snr_max = _sequence_max(snrgm)
+
+    # averages of the snr (and of the geomean spectrum, for the first two
+    # bands) over frequency bands, sharing the frequency index lookups
+    averages = [_band_average(
+        np.vstack([snrgm, smooth_ftgm]), snr1_freq, lower, upper)
+        for lower, upper in [(0.1, 10.0), (0.1, 0.5), (0.5, 1.0), (1.0, 2.0),
+                             (2.0, 5.0), (5.0, 10.0)]]
+    snr_average = averages[0][0]
+    snr_a1, ft_a1 = averages[1]
+    snr_a2, ft_a2 = averages[2]
+    snr_a3 = averages[3][0]
+    snr_a4 = averages[4][0]
+    snr_a5 = averages[5][0]
     ft_a1_a2 = ft_a1 / ft_a2
 
     # calculate lf to max signal ratios
-    signal1_max = np.max(smooth_ft1)
-    lf1 = (np.trapz(
-        smooth_ft1[0:lower_index],
-        smooth_ft1_freq[0:lower_index]) /
-        (smooth_ft1_freq[lower_index]-smooth_ft1_freq[0]))
-    lf1_pe = (np.trapz(
-        smooth_ft1_pe[0:lower_index],
-        smooth_ft1_freq[0:lower_index]) /
-        (smooth_ft1_freq[lower_index]-smooth_ft1_freq[0]))
-
-    signal2_max = max(smooth_ft2)
-    lf2 = (np.trapz(
-        smooth_ft2[0:lower_index],
-        smooth_ft1_freq[0:lower_index]) /
-        (smooth_ft1_freq[lower_index]-smooth_ft1_freq[0]))
-    lf2_pe = (np.trapz(
-        smooth_ft2_pe[0:lower_index],
-        smooth_ft1_freq[0:lower_index]) /
+    signal1_max = np.max(smooth_ft[0])
+    signal2_max = _sequence_max(smooth_ft[1])
+    lf1, lf2, lf1_pe, lf2_pe = (np.trapz(
+        np.vstack([smooth_ft, smooth_ft_pe])[:, 0:lower_index],
+        smooth_ft1_freq[0:lower_index], axis=-1) /
         (smooth_ft1_freq[lower_index]-smooth_ft1_freq[0]))
 
     signal_ratio_max = max([lf1/signal1_max, lf2/signal2_max])
@@ -726,6 +613,36 @@ def getClassificationMetrics(tr, p_pick, delta_t):
             Ds595]
 
 
+def _band_average(values, freq, lower, upper):
+    '''
+    Average of the rows of values over a frequency band, using the
+    trapezoidal rule.
+    '''
+    lower_index, upper_index = getFreqIndex(freq, lower, upper)
+    return (np.trapz(values[:, lower_index:upper_index],
+                     freq[lower_index:upper_index], axis=-1) /
+            (freq[upper_index] - freq[lower_index]))
+
+
+def _sequence_max(values):
+    '''
+    Maximum of an array with the same NaN handling as the builtin max: NaNs
+    are skipped, unless the first value is NaN.
+    '''
+    if np.isnan(values[0]):
+        return values[0]
+    return np.nanmax(values)
+
+
+def _sequence_min(values):
+    '''
+    Minimum of an array with the same NaN handling as the builtin min.
+    '''
+    if np.isnan(values[0]):
+        return values[0]
+    return np.nanmin(values)
+
+
 def computeQualityMetrics(st):
     '''
     Get the 2 horizontal components and format the P-wave arrival time before
@@ -759,6 +676,11 @@ def computeQualityMetrics(st):
             str_i = 'acc_comp' + ind[i]
             tr[str_i] = tr_i.data
 
+            # Normalized Arias intensity (Husid curve), shared with the
+            # Arias and duration metrics through the trace cache
+            str_i = 'arias_comp' + ind[i]
+            tr[str_i] = normalized_arias(tr_i)
+
             # Fourier spectrum
             str_i = 'ft' + ind[i]
             tr[str_i] = tr_i.getCached('signal_spectrum')['spec']
@@ -832,8 +754,12 @@ def NNet_QA(st, acceptance_threshold, model_name):
         acceptance_threshold = 0.5 or 0.6
         model_name = 'CantWell'
 
+    A StreamCollection may be given instead of a single stream, in which case
+    the quality metrics of all of the streams are preprocessed and evaluated
+    by the neural network at once.
+
     Args:
-        st (list of traces):
+        st (StationStream or StreamCollection):
             The ground motion record to analyze. Should contain at least 2
             orthogonal  horizontal traces.
         acceptance_threshold (float):
@@ -845,77 +771,83 @@ def NNet_QA(st, acceptance_threshold, model_name):
         st: stream of traces tagged with quality scores and flags,
         used model name and acceptance threshold
     '''
-
-    # This check only works if we have two horizontal components in the stream
-    if st.num_horizontal != 2:
-        for tr in st:
-            tr.fail('Stream does not contain two horiztonal components. '
-                    'NNet QA check will not be performed.')
-        return st
-
-    # Also need to check that we don't have data arrays of all zeros, as this
-    # will cause problems
-    all_zeros = False
-    for tr in st:
-        if np.all(tr.data == 0):
-            all_zeros = True
-
-    if all_zeros:
-        for tr in st:
-            tr.fail('The data contains all zeros, so the '
-                    'NNet_QA check is not able to be performed.')
-        return st
-
-    # Check that we have the required trace parameters
-    have_params = True
-    for tr in st:
-        if not {'signal_spectrum', 'noise_spectrum', 'snr'}.issubset(
-                set(tr.getCachedNames())):
-            have_params = False
-
-    if not have_params:
-        for tr in st:
-            tr.fail('One or more traces in the stream does have the required '
-                    'trace parameters to perform the NNet_QA check.')
+    if isinstance(st, StationStream):
+        streams = [st]
+    else:
+        streams = st
+
+    checked_streams = []
+    for stream in streams:
+        # This check only works if we have two horizontal components in the
+        # stream
+        if stream.num_horizontal != 2:
+            for tr in stream:
+                tr.fail('Stream does not contain two horiztonal components. '
+                        'NNet QA check will not be performed.')
+            continue
+
+        # Also need to check that we don't have data arrays of all zeros, as
+        # this will cause problems
+        all_zeros = False
+        for tr in stream:
+            if np.all(tr.data == 0):
+                all_zeros = True
+
+        if all_zeros:
+            for tr in stream:
+                tr.fail('The data contains all zeros, so the '
+                        'NNet_QA check is not able to be performed.')
+            continue
+
+        # Check that we have the required trace parameters
+        have_params = True
+        for tr in stream:
+            if not {'signal_spectrum', 'noise_spectrum', 'snr'}.issubset(
+                    set(tr.getCachedNames())):
+                have_params = False
+
+        if not have_params:
+            for tr in stream:
+                tr.fail('One or more traces in the stream does have the '
+                        'required trace parameters to perform the NNet_QA '
+                        'check.')
+            continue
+
+        checked_streams.append(stream)
+
+    if not len(checked_streams):
         return st
 
-    # Create the path to the NN folder based on model name
-    nn_path = os.path.join('data', 'nn_qa')
-    nn_path = os.path.join(nn_path, model_name)
-    nn_path = pkg_resources.resource_filename('gmprocess', nn_path)
-
-    # Compute the quality metrics
-    qm = computeQualityMetrics(st)
+    # Compute the quality metrics, one row per stream
+    qm = np.array([computeQualityMetrics(stream)
+                   for stream in checked_streams])
 
     # Pre-process the qualtiy metrics
     qm = preprocessQualityMetrics(qm, model_name)
 
-    # Instanciate the NN (based on model_name)
-    NN = neuralNet()
-    NN.loadNN(nn_path)
-
-    # Use NN
-    scores = NN.useNN(qm)[0]
-
-    # Accepted?
-    flag_accept = False
-    if scores[1] >= acceptance_threshold:
-        flag_accept = True
-
-    # Add parameters to Stream (acceptance threshold, model_name, score_lowQ,
-    # score_highQ, highQualityFlag)
-    nnet_dict = {
-        'accept_thres': acceptance_threshold,
-        'model_name': model_name,
-        'score_LQ': scores[0],
-        'score_HQ': scores[1],
-        'pass_QA': flag_accept
-    }
-    st.setStreamParam(
-        'nnet_qa', nnet_dict
-    )
-    if not flag_accept:
-        for tr in st:
-            tr.fail('Failed NNet QA check.')
+    # Use NN (based on model_name)
+    all_scores = loadModel(model_name).useNN(qm)
+
+    for stream, scores in zip(checked_streams, all_scores):
+        # Accepted?
+        flag_accept = False
+        if scores[1] >= acceptance_threshold:
+            flag_accept = True
+
+        # Add parameters to Stream (acceptance threshold, model_name,
+        # score_lowQ, score_highQ, highQualityFlag)
+        nnet_dict = {
+            'accept_thres': acceptance_threshold,
+            'model_name': model_name,
+            'score_LQ': scores[0],
+            'score_HQ': scores[1],
+            'pass_QA': flag_accept
+        }
+        stream.setStreamParam(
+            'nnet_qa', nnet_dict
+        )
+        if not flag_accept:
+            for tr in stream:
+                tr.fail('Failed NNet QA check.')
 
     return st
@@ -1,12 +1,17 @@
 # stdlib imports
 import datetime as dt
 import logging
+import os
+import tempfile
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 
 # third party imports
 import numpy as np
 import pandas as pd
 from scipy.signal import butter, lfilter, hilbert
-from scipy.interpolate import griddata
+from scipy.interpolate import RegularGridInterpolator
 import scipy.linalg as alg
 from obspy.signal.trigger import ar_pick, pk_baer
 from obspy.core.utcdatetime import UTCDateTime
@@ -697,7 +702,8 @@ def _get_statelevel(y, n):
     return levels, histogram, bins
 
 
-def create_travel_time_dataframe(streams, catalog_file, ddepth, ddist, model):
+def create_travel_time_dataframe(streams, catalog_file, ddepth, ddist, model,
+                                 cache_dir=None, processes=None):
     """
     Creates a travel time dataframe, which contains the phase arrrival times
     for each station the StreamCollection, for each event in the catalog.
@@ -718,10 +724,19 @@ def create_travel_time_dataframe(streams, catalog_file, ddepth, ddist, model):
         ddist (float):
             The distance spacing (in decimal degrees) for the interpolation
             grid. Recommend value is 0.1 degrees.
+        model (str):
+            Name of the TauPyModel to use.
+        cache_dir (str):
+            Directory in which the travel time grids are cached (see
+            get_travel_time_grid). Default is ~/.gmprocess/travel_times.
+        processes (int):
+            Number of processes used to compute the travel time grid. Default
+            is the number of CPUs.
 
     Retuns:
         A tuple, containing the travel time dataframe and the catalog
-        (list of ScalarEvent objects).
+        (list of ScalarEvent objects). The arrival times in the dataframe are
+        float timestamps (seconds since 1970-01-01T00:00:00 UTC).
     """
 
     # Read the catalog file and create a catalog (list) of ScalarEvent objects
@@ -730,10 +745,10 @@ def create_travel_time_dataframe(streams, catalog_file, ddepth, ddist, model):
     # Replace any negative depths with 0
     df_catalog['depth'].clip(lower=0, inplace=True)
     catalog = []
-    for idx, row in df_catalog.iterrows():
+    for row in df_catalog.itertuples():
         event = ScalarEvent()
-        event.fromParams(row['id'], row['time'], row['latitude'],
-                         row['longitude'], row['depth'], row['mag'])
+        event.fromParams(row.id, row.time, row.latitude, row.longitude,
+                         row.depth, row.mag)
         catalog.append(event)
 
     # Store the lat, lon, and id for each stream
@@ -743,49 +758,26 @@ def create_travel_time_dataframe(streams, catalog_file, ddepth, ddist, model):
         st_lons.append(st[0].stats.coordinates.longitude)
         st_ids.append(st[0].stats.network + '.' + st[0].stats.station)
 
-    # Calculate the distance for each stream, for each event
+    # Calculate the distance for each event, for each stream
     # Store distances in a matrix
-    distances_matrix = np.zeros((len(streams), len(catalog)))
-    for idx, st in enumerate(streams):
-        distances_matrix[idx] = locations2degrees(
-            np.repeat(st_lats[idx], len(catalog)),
-            np.repeat(st_lons[idx], len(catalog)),
-            df_catalog['latitude'], df_catalog['longitude'])
-    distances_matrix = distances_matrix.T
-
-    # Calculate the minimum depth/distance values for the inteprolation grid
-    # This includes a buffer to avoid interpolating at the endpoints
-    # Make sure that the minimum depth/distance values aren't negative
-    minimum_depth = max([0, min(df_catalog['depth']) - 2 * ddepth])
-    minimum_dist = max([0, distances_matrix.min() - 2 * ddist])
-    depth_grid = np.arange(
-        minimum_depth, max(df_catalog['depth']) + 2 * ddepth, ddepth)
-    distance_grid = np.arange(
-        minimum_dist, distances_matrix.max() + 2 * ddist, ddist)
-
-    # For each distance and each depth, compute the travel time
-    # Store values in the "times" 2D matrix
-    taupy_model = TauPyModel(model)
-    times = np.zeros((len(depth_grid), len(distance_grid)))
-    for i, depth in enumerate(depth_grid):
-        for j, dist in enumerate(distance_grid):
-            arrivals = taupy_model.get_travel_times(
-                depth, dist, ['p', 'P', 'Pn'])
-            if not arrivals:
-                times[i][j] = np.nan
-            else:
-                times[i][j] = arrivals[0].time
-
-    # Use 2D interpolation to interpolate values at the actual points
-    points = np.transpose([np.tile(distance_grid, len(depth_grid)),
-                           np.repeat(depth_grid, len(distance_grid))])
-    new_points = np.vstack(
-        (distances_matrix.flatten(),
-         np.repeat(df_catalog['depth'], len(streams)))).T
-    interpolated_times = griddata(points, times.flatten(), new_points).reshape(
-        (-1, len(streams)))
-    utcdatetimes = np.array([UTCDateTime(time) for time in df_catalog['time']])
-    interpolated_times = utcdatetimes.reshape(-1, 1) + interpolated_times
+    distances_matrix = locations2degrees(
+        df_catalog['latitude'].values[:, np.newaxis],
+        df_catalog['longitude'].values[:, np.newaxis],
+        np.array(st_lats)[np.newaxis, :], np.array(st_lons)[np.newaxis, :])
+    depths_matrix = np.repeat(
+        df_catalog['depth'].values[:, np.newaxis], len(st_ids), axis=1)
+
+    # Get the travel times on a regular depth/distance grid, and interpolate
+    # them at the actual points
+    interpolated_times = interpolate_travel_times(
+        depths_matrix, distances_matrix, model, ddepth, ddist,
+        cache_dir=cache_dir, processes=processes)
+
+    # Origin times as float timestamps
+    origin_times = pd.to_datetime(df_catalog['time'], utc=True)
+    origin_times = origin_times.values.astype('datetime64[ns]').astype(
+        np.int64) / 1e9
+    interpolated_times += origin_times[:, np.newaxis]
 
     # Store travel time information in a DataFrame
     # Column indicies are the station ids, rows are the earthquake ids
@@ -796,3 +788,169 @@ def create_travel_time_dataframe(streams, catalog_file, ddepth, ddist, model):
     # multiple instruments
     df = df.loc[:, ~df.columns.duplicated()]
     return df, catalog
+
+
+def interpolate_travel_times(depths, distances, model, ddepth=5, ddist=0.1,
+                             cache_dir=None, processes=None):
+    """
+    First P-wave arrival times interpolated from a travel time grid.
+
+    Args:
+        depths (ndarray):
+            Source depths (in km).
+        distances (ndarray):
+            Distances (in decimal degrees), with the same shape as depths.
+        model (str):
+            Name of the TauPyModel to use.
+        ddepth (float):
+            The depth spacing (in km) of the grid.
+        ddist (float):
+            The distance spacing (in decimal degrees) of the grid.
+        cache_dir (str):
+            Directory in which the grids are cached (see
+            get_travel_time_grid).
+        processes (int):
+            Number of processes used to compute the grid.
+
+    Returns:
+        ndarray: Travel times (in seconds; NaN where there is no arrival),
+        with the same shape as depths.
+    """
+    depths = np.clip(depths, 0, None)
+    depth_grid, distance_grid, times = get_travel_time_grid(
+        model, ddepth, ddist, np.max(depths), np.max(distances),
+        cache_dir=cache_dir, processes=processes)
+    interpolator = RegularGridInterpolator(
+        (depth_grid, distance_grid), times, bounds_error=False)
+    return interpolator(np.stack(np.broadcast_arrays(depths, distances),
+                                 axis=-1))
+
+
+def get_travel_time_grid(model, ddepth, ddist, max_depth, max_dist,
+                         cache_dir=None, processes=None):
+    """
+    Gets the first P-wave arrival times on a regular depth/distance grid.
+
+    The grid nodes are multiples of ddepth and ddist starting from zero, and
+    the grid extends at least two nodes beyond max_depth and max_dist. Grids
+    are cached on disk per model and grid spacing; a cached grid is only
+    recomputed when a larger extent is needed or cannot be read. The rows of
+    the grid (depths) are computed in parallel.
+
+    Args:
+        model (str):
+            Name of the TauPyModel to use, or path to a model file.
+        ddepth (float):
+            The depth spacing (in km) of the grid.
+        ddist (float):
+            The distance spacing (in decimal degrees) of the grid.
+        max_depth (float):
+            Maximum depth (in km) that must be covered by the grid.
+        max_dist (float):
+            Maximum distance (in decimal degrees) that must be covered by the
+            grid.
+        cache_dir (str):
+            Directory in which the grids are cached. Default is
+            ~/.gmprocess/travel_times.
+        processes (int):
+            Number of processes. Default is the number of CPUs.
+
+    Returns:
+        tuple: Depth grid, distance grid, and 2D array of travel times (in
+        seconds; NaN where there is no arrival).
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(
+            os.path.expanduser('~'), '.gmprocess', 'travel_times')
+    n_depth = int(np.ceil(max_depth / ddepth)) + 3
+    n_dist = int(np.ceil(max_dist / ddist)) + 3
+    cache_file = os.path.join(
+        cache_dir, '%s_%g_%g.npz' % (_travel_time_model_key(model), ddepth,
+                                     ddist))
+
+    times = None
+    if os.path.isfile(cache_file):
+        try:
+            with np.load(cache_file) as cached:
+                times = cached['times']
+        except (OSError, ValueError, zipfile.BadZipFile, KeyError) as e:
+            logging.warning('Could not read cached travel time grid %s, '
+                            'recomputing it: %s' % (cache_file, str(e)))
+    if times is not None:
+        if times.shape[0] >= n_depth and times.shape[1] >= n_dist:
+            depth_grid = np.arange(times.shape[0]) * ddepth
+            distance_grid = np.arange(times.shape[1]) * ddist
+            return depth_grid, distance_grid, times
+        n_depth = max(n_depth, times.shape[0])
+        n_dist = max(n_dist, times.shape[1])
+
+    depth_grid = np.arange(n_depth) * ddepth
+    distance_grid = np.arange(n_dist) * ddist
+    if processes is None:
+        processes = os.cpu_count()
+    if processes > 1 and n_depth > 1:
+        with ProcessPoolExecutor(
+                max_workers=min(processes, n_depth),
+                initializer=_init_taup_worker, initargs=(model,)) as executor:
+            rows = list(executor.map(
+                _travel_time_row, depth_grid,
+                [distance_grid] * n_depth))
+    else:
+        _init_taup_worker(model)
+        rows = [_travel_time_row(depth, distance_grid)
+                for depth in depth_grid]
+    times = np.array(rows)
+
+    # The cache is shared between processes, so the grid is written to a
+    # temporary file that replaces the cached one once it is complete.
+    tmp_file = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(suffix='.npz', dir=cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, times=times)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logging.warning('Could not cache travel time grid: %s' % str(e))
+        if tmp_file is not None and os.path.isfile(tmp_file):
+            os.remove(tmp_file)
+
+    return depth_grid, distance_grid, times
+
+
+def _travel_time_model_key(model):
+    """
+    Name of a model in the travel time grid cache.
+
+    Model files are identified by their name and a checksum of their
+    contents, so that different files with the same name do not share a
+    cached grid.
+    """
+    model = str(model)
+    if not os.path.isfile(model):
+        return model
+    with open(model, 'rb') as f:
+        checksum = zlib.crc32(f.read())
+    name = os.path.splitext(os.path.basename(model))[0]
+    return '%s_%08x' % (name, checksum)
+
+
+_TAUP_MODEL = None
+
+
+def _init_taup_worker(model):
+    global _TAUP_MODEL
+    _TAUP_MODEL = TauPyModel(model)
+
+
+def _travel_time_row(depth, distance_grid):
+    """
+    First P-wave arrival times for one depth of the travel time grid.
+    """
+    times = np.full(len(distance_grid), np.nan)
+    for j, dist in enumerate(distance_grid):
+        arrivals = _TAUP_MODEL.get_travel_times(
+            depth, dist, ['p', 'P', 'Pn'])
+        if arrivals:
+            times[j] = arrivals[0].time
+    return times
@@ -3,6 +3,8 @@ import copy
 import datetime
 import logging
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
@@ -12,8 +14,11 @@ from obspy.core.utcdatetime import UTCDateTime
 from impactutils.colors.cpalette import ColorPalette
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from matplotlib.dates import num2date
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-from gmprocess.metrics.reduction.arias import Arias
+from gmprocess.metrics.reduction.arias import (arias_intensity,
+                                               normalized_arias, arias_index)
 from gmprocess import spectrum
 
 MIN_MAG = 4.0
@@ -27,6 +32,53 @@ AX1_HEIGHT = 0.8
 AX2_WIDTH = 0.1
 AX2_HEIGHT = 1.0
 
+# Number of min/max pairs that time series are decimated to for plotting;
+# this is about the number of pixels across the plots.
+PLOT_BINS = 1500
+
+
+def decimate_minmax(x, y, nbins=PLOT_BINS):
+    """Decimate a time series to the min/max envelope of equal bins.
+
+    Plotting the minimum and maximum of each bin looks the same as plotting
+    every sample when there are about as many bins as pixels, but is much
+    faster for long records.
+
+    Args:
+        x (ndarray):
+            Times (or other monotonic x values).
+        y (ndarray):
+            Values of the time series.
+        nbins (int):
+            Number of bins.
+
+    Returns:
+        tuple: Decimated x and y arrays, with the minimum and maximum of each
+        bin in the order in which they occur; the inputs are returned if they
+        have no more than 2 * nbins points.
+    """
+    npts = len(y)
+    if npts <= 2 * nbins:
+        return x, y
+    starts = np.linspace(0, npts, nbins + 1).astype(int)[:-1]
+    imin = _reduceat_arg(y, starts, np.minimum)
+    imax = _reduceat_arg(y, starts, np.maximum)
+    idx = np.sort(np.stack((imin, imax), axis=1), axis=1).ravel()
+    return x[idx], y[idx]
+
+
+def _reduceat_arg(y, starts, ufunc):
+    """Index of the (first) minimum or maximum of y in each bin.
+    """
+    values = ufunc.reduceat(y, starts)
+    ends = np.append(starts[1:], len(y))
+    bins = np.repeat(np.arange(len(starts)), ends - starts)
+    binvalues = values[bins]
+    hits = np.flatnonzero(
+        (y == binvalues) | (np.isnan(y) & np.isnan(binvalues)))
+    first = np.unique(bins[hits], return_index=True)[1]
+    return hits[first]
+
 
 def plot_regression(event_table, imc, imc_table, imt, filename,
                     distance_metric='EpicentralDistance',
@@ -175,9 +227,6 @@ def plot_arias(stream, axes=None, axis_index=None,
     if len(stream) < 1:
         raise Exception('No traces contained within the provided stream.')
 
-    arias = Arias(stream)
-    Ia = arias.arias_stream
-
     starttime = stream[0].stats.starttime
     if title is None:
         title = ('Event on ' + str(starttime.month) + '/'
@@ -190,29 +239,29 @@ def plot_arias(stream, axes=None, axis_index=None,
     if figsize is None:
         figsize = (6.5, 7.5)
     if axes is None:
-        fig, axs = plt.subplots(len(Ia), 1, figsize=figsize)
-        axis_numbers = np.linspace(0, len(Ia) - 1, len(Ia))
+        fig, axs = plt.subplots(len(stream), 1, figsize=figsize)
+        axis_numbers = np.linspace(0, len(stream) - 1, len(stream))
     elif axis_index is not None:
         axs = axes
         axis_numbers = np.linspace(
-            axis_index, axis_index + len(Ia) - 1, len(Ia))
-    for idx, trace in zip(axis_numbers.astype(int), Ia):
+            axis_index, axis_index + len(stream) - 1, len(stream))
+    for idx, trace in zip(axis_numbers.astype(int), stream):
+        Ia = arias_intensity(trace)
         ax = axs[idx]
         dt = trace.stats['delta']
-        npts = len(trace.data)
+        npts = len(Ia)
         t = np.linspace(0, (npts - 1) * dt, num=npts)
         network = trace.stats['network']
         station = trace.stats['station']
         channel = trace.stats['channel']
         trace_label = network + '.' + station + '.' + channel
         ax.set_title(trace_label, fontsize=minfontsize)
-        ax.plot(t, trace.data)
+        ax.plot(t, Ia)
         if show_maximum:
-            abs_arr = np.abs(trace.data.copy())
-            idx = np.argmax(abs_arr)
-            max_value = abs_arr[idx]
-            ax.plot([t[idx]], [trace.data[idx]], marker='o', color="red")
-            ax.annotate('%.2E' % max_value, (t[idx], trace.data[idx]),
+            idx = np.argmax(Ia)
+            max_value = Ia[idx]
+            ax.plot([t[idx]], [Ia[idx]], marker='o', color="red")
+            ax.annotate('%.2E' % max_value, (t[idx], Ia[idx]),
                         xycoords='data', xytext=(.85, 0.25),
                         textcoords='axes fraction',
                         arrowprops=dict(facecolor='black',
@@ -266,10 +315,6 @@ def plot_durations(stream, durations, axes=None, axis_index=None,
     if len(stream) < 1:
         raise Exception('No traces contained within the provided stream.')
 
-    arias = Arias(stream)
-    Ia = arias.arias_stream
-    NIa = Ia.normalize(False)
-
     starttime = stream[0].stats.starttime
     if title is None:
         title = ('Event on ' + str(starttime.month) + '/'
@@ -282,23 +327,24 @@ def plot_durations(stream, durations, axes=None, axis_index=None,
     if figsize is None:
         figsize = (6.5, 7.5)
     if axes is None:
-        fig, axs = plt.subplots(len(NIa), 1, figsize=figsize)
-        axis_numbers = np.linspace(0, len(NIa) - 1, len(NIa))
+        fig, axs = plt.subplots(len(stream), 1, figsize=figsize)
+        axis_numbers = np.linspace(0, len(stream) - 1, len(stream))
     elif axis_index is not None:
         axs = axes
         axis_numbers = np.linspace(
-            axis_index, axis_index + len(NIa) - 1, len(NIa))
-    for idx, trace in zip(axis_numbers.astype(int), NIa):
+            axis_index, axis_index + len(stream) - 1, len(stream))
+    for idx, trace in zip(axis_numbers.astype(int), stream):
+        NIa = normalized_arias(trace)
         ax = axs[idx]
         dt = trace.stats['delta']
-        npts = len(trace.data)
+        npts = len(NIa)
         t = np.linspace(0, (npts - 1) * dt, num=npts)
         network = trace.stats['network']
         station = trace.stats['station']
         channel = trace.stats['channel']
         trace_label = network + '.' + station + '.' + channel
         ax.set_title(trace_label, fontsize=minfontsize)
-        ax.plot(t, trace.data)
+        ax.plot(t, NIa)
         if xlabel:
             ax.set_xlabel(xlabel)
         if xlabel:
@@ -306,8 +352,8 @@ def plot_durations(stream, durations, axes=None, axis_index=None,
         for i, duration in enumerate(durations):
             first_percentile = duration[0]
             second_percentile = duration[1]
-            t1 = get_time_from_percent(trace.data, first_percentile, dt)
-            t2 = get_time_from_percent(trace.data, second_percentile, dt)
+            t1 = t[arias_index(trace, first_percentile)]
+            t2 = t[arias_index(trace, second_percentile)]
             height = (1 / (len(durations) + 1) * i) + 1 / (len(durations) + 1)
             ax.plot(t1, first_percentile, 'ok')
             ax.plot(t2, second_percentile, 'ok')
@@ -499,6 +545,11 @@ def plot_moveout(streams, epilat, epilon, orientation=None, max_dist=None,
 def summary_plots(st, directory, origin):
     """Stream summary plot.
 
+    The figure is drawn with the Agg canvas directly rather than with pyplot,
+    so that it can be rendered in a worker process (see plot_summaries), and
+    the waveforms are decimated to their min/max envelope at about the
+    resolution of the plot.
+
     Args:
         st (gmprocess.stationtrace.StationStream):
             Stream of data.
@@ -506,36 +557,41 @@ def summary_plots(st, directory, origin):
             Directory for saving plots.
         origin (ScalarEvent):
             Flattened subclass of Obspy Event.
-    """
-    mpl.rcParams['font.size'] = 8
 
+    Returns:
+        str: Name of the plot file (None if running tests).
+    """
     # Check if directory exists, and if not, create it.
     if not os.path.exists(directory):
         os.makedirs(directory)
 
+    with mpl.rc_context({'font.size': 8}):
+        return _summary_plot(st, directory, origin)
+
+
+def _summary_plot(st, directory, origin):
+    """Draw and save the summary plot of a stream (see summary_plots).
+    """
     # Setup figure for stream
     nrows = 4
     ntrace = min(len(st), 3)
-    fig = plt.figure(figsize=(3.9 * ntrace, 10))
+    fig = Figure(figsize=(3.9 * ntrace, 10))
+    FigureCanvasAgg(fig)
     gs = fig.add_gridspec(nrows, ntrace, height_ratios=[1, 1, 2, 2])
-    ax = [plt.subplot(g) for g in gs]
+    ax = [fig.add_subplot(g) for g in gs]
 
     stream_id = st.get_id()
     logging.debug('stream_id: %s' % stream_id)
     logging.debug('passed: %s' % st.passed)
     if st.passed:
-        plt.suptitle("M%s %s | %s (passed)" %
+        fig.suptitle("M%s %s | %s (passed)" %
                      (origin.magnitude, origin.id, stream_id),
                      x=0.5, y=1.02)
     else:
-        plt.suptitle("M%s %s | %s (failed)"
+        fig.suptitle("M%s %s | %s (failed)"
                      % (origin.magnitude, origin.id, stream_id),
                      color='red', x=0.5, y=1.02)
 
-    # Compute velocity
-    st_vel = st.copy()
-    st_vel = st_vel.integrate()
-
     # process channels in preferred sort order (i.e., HN1, HN2, HNZ)
     channels = [tr.stats.channel for tr in st]
     if len(channels) < 3:
@@ -618,7 +674,7 @@ def summary_plots(st, directory, origin):
         ax[j].set_title(trace_title)
         dtimes = np.linspace(
             0, tr.stats.endtime - tr.stats.starttime, tr.stats.npts)
-        ax[j].plot(dtimes, tr.data, 'k', linewidth=0.5)
+        ax[j].plot(*decimate_minmax(dtimes, tr.data), 'k', linewidth=0.5)
 
         # Show signal split as vertical dashed line
         if tr.hasParameter('signal_split'):
@@ -633,11 +689,9 @@ def summary_plots(st, directory, origin):
 
         # ---------------------------------------------------------------------
         # Velocity time series plot
-        tr_vel = st_vel[j]
-        dtimes = np.linspace(
-            0, tr_vel.stats.endtime - tr_vel.stats.starttime, tr_vel.stats.npts
-        )
-        ax[j + ntrace].plot(dtimes, tr_vel.data, 'k', linewidth=0.5)
+        tr_vel = tr.copy().integrate()
+        ax[j + ntrace].plot(*decimate_minmax(dtimes, tr_vel.data),
+                            'k', linewidth=0.5)
 
         # Show signal split as vertical dashed line
         if tr.hasParameter('signal_split'):
@@ -730,17 +784,45 @@ def summary_plots(st, directory, origin):
         ax[j + 3 * ntrace].set_ylabel('SNR')
         ax[j + 3 * ntrace].set_xlabel('Frequency (Hz)')
 
-    stream_id = st.get_id()
-
     # Do not save files if running tests
     file_name = None
     if 'CALLED_FROM_PYTEST' not in os.environ:
-        plt.subplots_adjust(left=0.05, right=0.97, hspace=0.25,
+        fig.subplots_adjust(left=0.05, right=0.97, hspace=0.25,
                             wspace=0.2, top=0.97)
         file_name = os.path.join(
             directory,
             origin.id + '_' + stream_id + '.png')
-        plt.savefig(fname=file_name)
-        plt.close('all')
+        fig.savefig(fname=file_name)
 
     return file_name
+
+
+def plot_summaries(streams, directory, origin, processes=None):
+    """Make the summary plots of a collection of streams in parallel.
+
+    Args:
+        streams (StreamCollection):
+            Sequence of streams.
+        directory (str):
+            Directory for saving plots.
+        origin (ScalarEvent):
+            Flattened subclass of Obspy Event.
+        processes (int):
+            Number of processes used to render the plots. Default is the
+            number of CPUs.
+
+    Returns:
+        list: Names of the plot files, in the order of the streams.
+    """
+    streams = list(streams)
+    if processes is None:
+        processes = os.cpu_count()
+    if processes > 1 and len(streams) > 1:
+        # Create the directory once rather than in each worker
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with ProcessPoolExecutor(
+                max_workers=min(processes, len(streams))) as executor:
+            return list(executor.map(
+                summary_plots, streams, repeat(directory), repeat(origin)))
+    return [summary_plots(st, directory, origin) for st in streams]
@@ -3,19 +3,29 @@
 Processing methods.
 """
 
-import numpy as np
+import hashlib
 import logging
+import pickle
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
 
 from obspy.taup import TauPyModel
-from scipy.optimize import curve_fit
+from obspy.core.inventory import PolynomialResponseStage
+from obspy.signal.invsim import (cosine_taper, cosine_sac_taper,
+                                 invert_spectrum)
+from obspy.signal.util import _npts2nfft
 from scipy.integrate import cumtrapz
 
 from gmprocess.stationtrace import PROCESS_LEVELS
 from gmprocess.streamcollection import StreamCollection
 from gmprocess.config import get_config
-from gmprocess.windows import signal_split, signal_end, window_checks
+from gmprocess.windows import (
+    signal_split, signal_end, window_checks, get_predicted_pga_dataframe)
 from gmprocess.phase import create_travel_time_dataframe
 from gmprocess import corner_frequencies
+from gmprocess.timing import StepTimer
 
 # -----------------------------------------------------------------------------
 # Note: no QA on following imports because they need to be in namespace to be
@@ -40,6 +50,10 @@ M_TO_CM = 100.0
 # besides the arguments in the conf file.
 REQ_ORIGIN = ['fit_spectra', 'trim_multiple_events']
 
+# List of processing steps that are applied to the whole StreamCollection at
+# once rather than to each stream.
+COLLECTION_STEPS = ['NNet_QA']
+
 
 TAPER_TYPES = {
     'cosine': 'Cosine',
@@ -66,8 +80,12 @@ ABBREV_UNITS = {'ACC': 'cm/s^2',
                 'VEL': 'cm/s',
                 'DISP': 'cm'}
 
+# Maximum number of inverse instrument responses kept by _remove_response.
+RESPONSE_CACHE_SIZE = 32
+_RESPONSE_CACHE = OrderedDict()
 
-def process_streams(streams, origin, config=None):
+
+def process_streams(streams, origin, config=None, timer=None):
     """
     Run processing steps from the config file.
 
@@ -84,6 +102,9 @@ def process_streams(streams, origin, config=None):
             ScalarEvent object.
         config (dict):
             Configuration dictionary (or None). See get_config().
+        timer (StepTimer):
+            Optional StepTimer that records the time and memory used by each
+            step for each stream, under the 'processing' stage.
 
     Returns:
         A StreamCollection object.
@@ -94,6 +115,8 @@ def process_streams(streams, origin, config=None):
 
     if config is None:
         config = get_config()
+    if timer is None:
+        timer = StepTimer()
 
     logging.info('Processing streams...')
 
@@ -103,10 +126,19 @@ def process_streams(streams, origin, config=None):
 
     # -------------------------------------------------------------------------
     # Compute a travel-time matrix for interpolation later in the
-    # trim_multiple events step
-    if any('trim_multiple_events' in dict for dict in config['processing']):
-        travel_time_df, catalog = create_travel_time_dataframe(
-            streams, **config['travel_time'])
+    # trim_multiple_events step, along with the PGA predicted by the GMPE for
+    # every station and event
+    trim_steps = [step['trim_multiple_events'] for step
+                  in config['processing'] if 'trim_multiple_events' in step]
+    if len(trim_steps):
+        with timer.time('processing', '', 'travel_times'):
+            travel_time_df, catalog = create_travel_time_dataframe(
+                streams, **config['travel_time'])
+        trim_conf = trim_steps[0]
+        with timer.time('processing', '', 'predicted_pga'):
+            predicted_pga_df = get_predicted_pga_dataframe(
+                streams, catalog, trim_conf['gmpe'],
+                trim_conf['site_parameters'], trim_conf['rupture_parameters'])
     # -------------------------------------------------------------------------
     # Begin noise/signal window steps
 
@@ -115,77 +147,94 @@ def process_streams(streams, origin, config=None):
     model = TauPyModel(config['pickers']['travel_time']['model'])
 
     for st in streams:
-        logging.info('Checking stream %s...' % st.get_id())
+        stream_id = st.get_id()
+        logging.info('Checking stream %s...' % stream_id)
         # Estimate noise/signal split time
-        st = signal_split(
-            st,
-            origin,
-            model,
-            picker_config=config['pickers'],
-            config=config)
+        with timer.time('processing', stream_id, 'signal_split'):
+            st = signal_split(
+                st,
+                origin,
+                model,
+                picker_config=config['pickers'],
+                config=config)
 
         # Estimate end of signal
         end_conf = window_conf['signal_end']
         event_mag = origin.magnitude
-        st = signal_end(
-            st,
-            event_time=event_time,
-            event_lon=event_lon,
-            event_lat=event_lat,
-            event_mag=event_mag,
-            **end_conf
-        )
-        wcheck_conf = window_conf['window_checks']
-        if wcheck_conf['do_check']:
-            st = window_checks(
+        with timer.time('processing', stream_id, 'signal_end'):
+            st = signal_end(
                 st,
-                min_noise_duration=wcheck_conf['min_noise_duration'],
-                min_signal_duration=wcheck_conf['min_signal_duration']
+                event_time=event_time,
+                event_lon=event_lon,
+                event_lat=event_lat,
+                event_mag=event_mag,
+                **end_conf
             )
+        wcheck_conf = window_conf['window_checks']
+        if wcheck_conf['do_check']:
+            with timer.time('processing', stream_id, 'window_checks'):
+                st = window_checks(
+                    st,
+                    min_noise_duration=wcheck_conf['min_noise_duration'],
+                    min_signal_duration=wcheck_conf['min_signal_duration']
+                )
 
     # -------------------------------------------------------------------------
     # Begin processing steps
     logging.info('Starting processing...')
     processing_steps = config['processing']
 
-    # Loop over streams
-    for stream in streams:
-        logging.info('Stream: %s' % stream.get_id())
-        for processing_step_dict in processing_steps:
-
-            key_list = list(processing_step_dict.keys())
-            if len(key_list) != 1:
-                raise ValueError(
-                    'Each processing step must contain exactly one key.')
-            step_name = key_list[0]
-
-            logging.info('Processing step: %s' % step_name)
-            step_args = processing_step_dict[step_name]
-            # Using globals doesn't seem like a great solution here, but it
-            # works.
-            if step_name not in globals():
-                raise ValueError(
-                    'Processing step %s is not valid.' % step_name)
-
-            # Origin is required by some steps and has to be handled specially.
-            # There must be a better solution for this...
-            if step_name in REQ_ORIGIN:
-                step_args['origin'] = origin
-            if step_name == 'trim_multiple_events':
-                step_args['catalog'] = catalog
-                step_args['travel_time_df'] = travel_time_df
-            if step_name == 'compute_snr':
-                step_args['mag'] = origin.magnitude
-
-            if step_args is None:
-                stream = globals()[step_name](stream)
+    for processing_step_dict in processing_steps:
+
+        key_list = list(processing_step_dict.keys())
+        if len(key_list) != 1:
+            raise ValueError(
+                'Each processing step must contain exactly one key.')
+        step_name = key_list[0]
+
+        logging.info('Processing step: %s' % step_name)
+        step_args = processing_step_dict[step_name]
+        # Using globals doesn't seem like a great solution here, but it
+        # works.
+        if step_name not in globals():
+            raise ValueError(
+                'Processing step %s is not valid.' % step_name)
+
+        # Origin is required by some steps and has to be handled specially.
+        # There must be a better solution for this...
+        if step_name in REQ_ORIGIN:
+            step_args['origin'] = origin
+        if step_name == 'trim_multiple_events':
+            step_args['catalog'] = catalog
+            step_args['travel_time_df'] = travel_time_df
+            if step_args is trim_conf:
+                step_args['predicted_pga_df'] = predicted_pga_df
+        if step_name == 'compute_snr':
+            step_args['mag'] = origin.magnitude
+
+        # Steps are applied to each stream in turn, except for those that
+        # handle all of the streams at once
+        if step_name in COLLECTION_STEPS:
+            step_streams = [streams]
+        else:
+            step_streams = streams
+        for stream in step_streams:
+            if step_name in COLLECTION_STEPS:
+                stream_id = ''
             else:
-                stream = globals()[step_name](stream, **step_args)
+                stream_id = stream.get_id()
+                logging.info('Stream: %s' % stream_id)
+            with timer.time('processing', stream_id, step_name):
+                if step_args is None:
+                    stream = globals()[step_name](stream)
+                else:
+                    stream = globals()[step_name](stream, **step_args)
 
     # -------------------------------------------------------------------------
     # Begin colocated instrument selection
     colocated_conf = config['colocated']
-    streams.select_colocated(**colocated_conf)
+    with timer.time('processing', '', 'select_colocated'):
+        streams.select_colocated(**colocated_conf)
 
     for st in streams:
         for tr in st:
@@ -254,8 +303,8 @@ def remove_response(st, f1, f2, f3=None, f4=None, water_level=None,
                 # Attempting to remove instrument response can cause a variety
                 # errors due to bad response metadata
                 try:
-                    tr.remove_response(
-                        inventory=inv, output=output, water_level=water_level,
+                    _remove_response(
+                        tr, inv, output=output, water_level=water_level,
                         pre_filt=(f1, f2, f3, f4))
                     tr.stats.standard.units = output.lower()
                     tr.stats.standard.process_level = PROCESS_LEVELS['V1']
@@ -300,8 +349,8 @@ def remove_response(st, f1, f2, f3=None, f4=None, water_level=None,
                             }
                         )
                     else:
-                        tr.remove_response(
-                                inventory=inv, output=output, water_level=water_level
+                        _remove_response(
+                                tr, inv, output=output, water_level=water_level
                                 )
                         tr.data *= M_TO_CM  # Convert from m to cm
                         tr.stats.standard.units = output.lower()
@@ -344,6 +393,105 @@ def remove_response(st, f1, f2, f3=None, f4=None, water_level=None,
     return st
 
 
+def _remove_response(tr, inv, output='ACC', water_level=None,
+                     pre_filt=None):
+    """
+    Deconvolve the instrument response from a trace.
+
+    This is equivalent to obspy's Trace.remove_response with the default
+    zero mean and taper options, but the inverse response (including the
+    pre-filter taper and water level) is kept in an LRU cache. Traces that
+    share a response chain, sampling rate, and length only need one FFT, one
+    multiplication, and one inverse FFT.
+
+    Args:
+        tr (StationTrace):
+            Trace of data in counts.
+        inv (obspy.core.inventory.inventory):
+            Obspy inventory object containing response information.
+        output (str):
+            Outuput units. Must be 'ACC', 'VEL', or 'DISP'.
+        water_level (float):
+            Water level for deconvolution.
+        pre_filt (tuple):
+            Four corner frequencies of the frequency domain pre-filter.
+
+    Returns:
+        StationTrace: Trace with the response removed (in SI units).
+    """
+    response = tr._get_response(inv)
+
+    # Polynomial responses are not evaluated in the frequency domain
+    if not response.response_stages or \
+            isinstance(response.response_stages[0], PolynomialResponseStage):
+        tr.remove_response(inventory=inv, output=output,
+                           water_level=water_level, pre_filt=pre_filt)
+        return tr
+
+    data = tr.data.astype(np.float64)
+    npts = len(data)
+    data -= data.mean()
+    data *= cosine_taper(npts, 0.05, sactaper=True, halfcosine=False)
+    nfft = _npts2nfft(npts)
+
+    inv_response = _get_inverse_response(
+        response, tr.stats.delta, nfft, output, water_level, pre_filt)
+    spec = np.fft.rfft(data, n=nfft) * inv_response
+    spec[-1] = abs(spec[-1]) + 0.0j
+    tr.data = np.fft.irfft(spec)[0:npts]
+    return tr
+
+
+def _get_inverse_response(response, delta, nfft, output, water_level,
+                          pre_filt):
+    """
+    Get the inverse instrument response, evaluating it only if it is not
+    already cached.
+
+    Args:
+        response (obspy.core.inventory.response.Response):
+            Instrument response.
+        delta (float):
+            Sample spacing (sec).
+        nfft (int):
+            Number of points in the FFT.
+        output (str):
+            Outuput units. Must be 'ACC', 'VEL', or 'DISP'.
+        water_level (float):
+            Water level for deconvolution.
+        pre_filt (tuple):
+            Four corner frequencies of the frequency domain pre-filter.
+
+    Returns:
+        ndarray: Complex inverse response at the nfft rfft frequencies.
+    """
+    stages = hashlib.sha1(pickle.dumps(
+        (response.response_stages, response.instrument_sensitivity))
+    ).hexdigest()
+    if pre_filt is not None:
+        pre_filt = tuple(pre_filt)
+    key = (stages, delta, nfft, output, water_level, pre_filt)
+    if key in _RESPONSE_CACHE:
+        _RESPONSE_CACHE.move_to_end(key)
+        return _RESPONSE_CACHE[key]
+
+    freq_response, freqs = response.get_evalresp_response(
+        delta, nfft, output=output)
+    if water_level is None:
+        freq_response[0] = 0.0
+        freq_response[1:] = 1.0 / freq_response[1:]
+    else:
+        invert_spectrum(freq_response, water_level)
+    if pre_filt:
+        freq_response *= cosine_sac_taper(freqs, flimit=pre_filt)
+    freq_response.flags.writeable = False
+
+    _RESPONSE_CACHE[key] = freq_response
+    if len(_RESPONSE_CACHE) > RESPONSE_CACHE_SIZE:
+        _RESPONSE_CACHE.popitem(last=False)
+    return freq_response
+
+
 def lowpass_max_frequency(st, fn_fac=0.9):
     """
     Cap lowpass corner as a fraction of the Nyquist.
@@ -417,10 +565,16 @@ def detrend(st, detrending_method=None):
     if not st.passed:
         return st
 
+    if detrending_method == 'baseline_sixth_order':
+        groups = {}
+        for tr in st:
+            key = (tr.stats.npts, tr.stats.delta)
+            groups.setdefault(key, []).append(tr)
+        for traces in groups.values():
+            _correct_baseline(traces)
+
     for tr in st:
-        if detrending_method == 'baseline_sixth_order':
-            tr = _correct_baseline(tr)
-        else:
+        if detrending_method != 'baseline_sixth_order':
             tr = tr.detrend(detrending_method)
 
         tr.setProvenance(
@@ -578,45 +732,71 @@ def max_traces(st, n_max=3):
     return st
 
 
-def _correct_baseline(trace):
+def _correct_baseline(traces):
     """
     Performs a baseline correction following the method of Ancheta
     et al. (2013). This removes low-frequency, non-physical trends
     that remain in the time series following filtering.
 
+    The polynomial is linear in its coefficients, so it is fit to the
+    displacement of all of the traces at once by linear least squares.
+
     Args:
-        trace (obspy.core.trace.Trace):
-            Trace of strong motion data.
+        traces (list):
+            List of traces of strong motion data with the same number of
+            points and sample spacing.
 
     Returns:
-        trace: Baseline-corrected trace.
+        list: Baseline-corrected traces.
     """
+    npts = traces[0].stats.npts
+    delta = traces[0].stats.delta
 
     # Integrate twice to get the displacement time series
-    disp_data = cumtrapz(cumtrapz(trace.data, dx=trace.stats.delta, initial=0),
-                         dx=trace.stats.delta, initial=0)
+    data = np.array([trace.data for trace in traces], dtype=np.float64)
+    disp_data = cumtrapz(cumtrapz(data, dx=delta, initial=0),
+                         dx=delta, initial=0)
 
     # Fit a sixth order polynomial to displacement time series, requiring
     # that the 1st and 0th order coefficients are zero
-    time_values = np.linspace(0, trace.stats.npts - 1, trace.stats.npts)
-    poly_cofs = list(curve_fit(_poly_func, time_values, disp_data)[0])
-    poly_cofs += [0, 0]
+    time_values = np.linspace(0, npts - 1, npts)
+    q, r, scale = _baseline_basis(npts)
+    all_cofs = np.linalg.solve(r, q.T @ disp_data.T).T / scale
 
-    # Construct a polynomial from the coefficients and compute
-    # the second derivative
-    polynomial = np.poly1d(poly_cofs)
-    polynomial_second_derivative = np.polyder(polynomial, 2)
+    for trace, cofs in zip(traces, all_cofs):
+        poly_cofs = list(cofs) + [0, 0]
 
-    # Subtract the second derivative of the polynomial from the
-    # acceleration trace
-    trace.data -= polynomial_second_derivative(time_values)
-    trace.setParameter('baseline', {'polynomial_coefs': poly_cofs})
+        # Construct a polynomial from the coefficients and compute
+        # the second derivative
+        polynomial = np.poly1d(poly_cofs)
+        polynomial_second_derivative = np.polyder(polynomial, 2)
 
-    return trace
+        # Subtract the second derivative of the polynomial from the
+        # acceleration trace
+        trace.data -= polynomial_second_derivative(time_values)
+        trace.setParameter('baseline', {'polynomial_coefs': poly_cofs})
 
+    return traces
 
-def _poly_func(x, a, b, c, d, e):
+
+@lru_cache(maxsize=16)
+def _baseline_basis(npts):
     """
-    Model polynomial function for polynomial baseline correction.
+    QR factorization of the polynomial basis used by _correct_baseline.
+
+    The basis is x**6, ..., x**2 for the sample indices x. It is evaluated
+    on x / (npts - 1) so that the columns are well conditioned.
+
+    Args:
+        npts (int):
+            Number of points.
+
+    Returns:
+        tuple: Q and R factors, and the factors that convert the scaled
+        coefficients to coefficients of x.
     """
-    return a * x**6 + b * x**5 + c * x**4 + d * x**3 + e * x**2
+    powers = np.arange(6, 1, -1)
+    scale = float(max(npts - 1, 1)) ** powers
+    basis = np.linspace(0, 1, npts)[:, np.newaxis] ** powers
+    q, r = np.linalg.qr(basis)
+    return q, r, scale
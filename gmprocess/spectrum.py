@@ -59,13 +59,37 @@ def fit_spectra(st, origin, kappa=0.035,
     Returns:
         StationStream with fitted spectra parameters.
     """
+    event_mag = origin.magnitude
+    event_lon = origin.longitude
+    event_lat = origin.latitude
+
+    # -------------------------------------------------------------------------
+    # INITIAL VALUES
+    # Need an approximate stress drop as initial guess
+    stress_0 = np.sqrt(min_stress*max_stress)
+    moment_0 = moment_from_magnitude(event_mag)
+
+    # Array of initial values
+    x0 = (np.log(moment_0), np.log(stress_0))
+
+    # Bounds
+    stress_bounds = (
+        np.log(min_stress),
+        np.log(max_stress)
+    )
+
+    # multiplicative factor for moment bounds
+    moment_bounds = (
+        x0[0] - np.log(moment_factor),
+        x0[0] + np.log(moment_factor)
+    )
+
+    bounds = (moment_bounds, stress_bounds)
+
     for tr in st:
         # Only do this for horizontal channels for which the smoothed spectra
         # has been computed.
         if tr.hasCached('smooth_signal_spectrum') and tr.hasParameter('corner_frequencies'):
-            event_mag = origin.magnitude
-            event_lon = origin.longitude
-            event_lat = origin.latitude
             dist = gps2dist_azimuth(
                 lat1=event_lat,
                 lon1=event_lon,
@@ -78,29 +102,6 @@ def fit_spectra(st, origin, kappa=0.035,
             freq = np.array(smooth_signal_dict['freq'])
             obs_spec = np.array(smooth_signal_dict['spec'])
 
-            # -----------------------------------------------------------------
-            # INITIAL VALUES
-            # Need an approximate stress drop as initial guess
-            stress_0 = np.sqrt(min_stress*max_stress)
-            moment_0 = moment_from_magnitude(event_mag)
-
-            # Array of initial values
-            x0 = (np.log(moment_0), np.log(stress_0))
-
-            # Bounds
-            stress_bounds = (
-                np.log(min_stress),
-                np.log(max_stress)
-            )
-
-            # multiplicative factor for moment bounds
-            moment_bounds = (
-                x0[0] - np.log(moment_factor),
-                x0[0] + np.log(moment_factor)
-            )
-
-            bounds = (moment_bounds, stress_bounds)
-
             # Frequency limits for cost function
             freq_dict = tr.getParameter('corner_frequencies')
             fmin = freq_dict['highpass']
@@ -108,27 +109,27 @@ def fit_spectra(st, origin, kappa=0.035,
 
             # -----------------------------------------------------------------
             # CONSTANT ARGUMENTS
+            # The path and site terms (and the constant part of the source
+            # term) do not depend on moment or stress drop, so they are
+            # evaluated once for the trace rather than in each iteration.
+            fixed_spec = fixed_model(
+                freq, dist, kappa, RP, VHC, FSE, shear_vel, density, R0)
+
+            # Remove non-positive values of obs_spec and apply corner
+            # frequency constraints
+            keep = (obs_spec > 0) & (freq >= fmin) & (freq <= fmax)
 
             cargs = (
-                freq,
-                obs_spec,
-                fmin,
-                fmax,
-                dist,
-                kappa,
-                RP,
-                VHC,
-                FSE,
-                shear_vel,
-                density,
-                R0
+                freq[keep],
+                np.log(obs_spec[keep]) - np.log(fixed_spec[keep]),
+                shear_vel
             )
 
             result = minimize(
-                spectrum_cost, x0,
+                log_spectrum_misfit, x0,
                 args=cargs,
                 method='L-BFGS-B',
-                jac=False,
+                jac=True,
                 bounds=bounds,
                 tol=1e-4,
                 options={'disp': False}
@@ -158,8 +159,8 @@ def fit_spectra(st, origin, kappa=0.035,
 
             # Get the fitted spectrum and then calculate the goodness-of-fit
             # metrics
-            fit_spec = model(
-                (moment_fit, stress_drop_fit), freq, dist, kappa)
+            fit_spec = fixed_spec * brune_shape(
+                freq, moment_fit, stress_drop_fit, shear_vel)
             mean_squared_error = np.mean((obs_spec - fit_spec)**2)
 
             # R^2 (Coefficient of Determination) is defined as 1 minus the
@@ -169,6 +170,11 @@ def fit_spectra(st, origin, kappa=0.035,
             sst = np.sum((obs_spec - np.mean(obs_spec))**2)
             r_squared = 1 - (ssr / sst)
 
+            # Older versions of scipy return the message as bytes
+            message = result.message
+            if isinstance(message, bytes):
+                message = message.decode()
+
             fit_spectra_dict = {
                 'stress_drop': stress_drop_fit,
                 'stress_drop_lnsd': sd[1],
@@ -178,7 +184,7 @@ def fit_spectra(st, origin, kappa=0.035,
                 'moment_lnsd': sd[0],
                 'magnitude': magnitude_fit,
                 'f0': f0_fit,
-                'minimize_message': result.message.decode(),
+                'minimize_message': message,
                 'minimize_success': result.success,
                 'mean_squared_error': mean_squared_error,
                 'R2': r_squared
@@ -188,6 +194,50 @@ def fit_spectra(st, origin, kappa=0.035,
     return st
 
 
+def log_spectrum_misfit(x, freq, log_target, shear_vel=3.7):
+    """
+    Sum of squared log residuals and its gradient for optimization.
+
+    The residuals are computed relative to the moment and stress drop
+    dependent part of the Brune source spectrum (see brune_shape), so the
+    path, site, and constant source terms must already be removed from the
+    target (see fixed_model).
+
+    Args:
+        x (tuple):
+            Tuple of the natural log of moment (dyne-cm) and the natural log
+            of stress drop (bars).
+        freq (array):
+            Numpy array of frequencies (Hz).
+        log_target (array):
+            Numpy array of the natural log of the observed Fourier spectral
+            amplitudes divided by the fixed part of the model.
+        shear_vel (float):
+            Shear-wave velocity at source (km/s).
+
+    Returns:
+        tuple: Sum of squared logarithmic residuals, and array of its
+        derivatives with respect to the elements of x.
+    """
+    moment = np.exp(x[0])
+    f0 = brune_f0(moment, np.exp(x[1]), shear_vel)
+    u = (freq / f0)**2
+    log_residuals = log_target - x[0] + np.log1p(u)
+
+    # Derivatives of the log model with respect to log moment and log
+    # stress drop, through the dependence of f0 on (stress_drop/moment)^1/3
+    dlogs_dlogf0 = 2.0 * u / (1.0 + u)
+    dmod_dx0 = 1.0 - dlogs_dlogf0 / 3.0
+    dmod_dx1 = dlogs_dlogf0 / 3.0
+
+    cost = np.sum(log_residuals**2)
+    grad = np.array([
+        -2.0 * np.sum(log_residuals * dmod_dx0),
+        -2.0 * np.sum(log_residuals * dmod_dx1)
+    ])
+    return cost, grad
+
+
 def spectrum_cost(x,
                   freq,
                   obs_spec,
@@ -358,6 +408,61 @@ def model(x,
     return source_mod * path_mod * site_mod
 
 
+def fixed_model(freq,
+                dist,
+                kappa,
+                RP=0.55,
+                VHC=0.7071068,
+                FSE=2.0,
+                shear_vel=3.7,
+                density=2.8,
+                R0=1.0,
+                gs_mod="REA99",
+                q_mod="REA99",
+                crust_mod="BT15"):
+    """
+    Part of the spectrum model that does not depend on moment or stress drop.
+
+    This is the model (see model) divided by brune_shape, i.e., the path and
+    site terms along with the constant and frequency dependent parts of the
+    (acceleration) Brune source spectrum.
+
+    Args:
+        freq (array):
+            Numpy array of frequencies for computing spectra (Hz).
+        dist (float):
+            Distance (km).
+        kappa (float):
+            Site diminution factor (sec).
+        RP (float):
+            Partition of shear-wave energy into horizontal components.
+        VHC (float):
+            Partition of shear-wave energy into horizontal components
+            1 / np.sqrt(2.0).
+        FSE (float):
+            Free surface effect.
+        shear_vel (float):
+            Shear-wave velocity at source (km/s).
+        density (float):
+            Density at source (gm/cc).
+        R0 (float):
+            Reference distance (km).
+        gs_model (str):
+            Name of model for geometric attenuation (see path).
+        q_model (str):
+            Name of model for anelastic attenuation (see path).
+        crust_mod (str):
+            Name of model for crustal amplification (see site).
+
+    Returns:
+        Array of the fixed part of the spectra model.
+    """
+    C = brune_constant(RP, VHC, FSE, shear_vel, density, R0)
+    path_mod = path(freq, dist, gs_mod, q_mod)
+    site_mod = site(freq, kappa, crust_mod)
+    return C * (2 * np.pi * freq)**2 * path_mod * site_mod
+
+
 def brune(freq,
           moment,
           stress_drop=150,
@@ -404,9 +509,7 @@ def brune(freq,
     if output_units not in OUTPUT_UNITS:
         raise ValueError("Unsupported value for output_units.")
 
-    f0 = brune_f0(moment, stress_drop, shear_vel)
-    S = 1 / (1 + (freq / f0)**2)
-    C = RP * VHC * FSE / (4 * np.pi * density * shear_vel**3 * R0) * 1e-20
+    C = brune_constant(RP, VHC, FSE, shear_vel, density, R0)
 
     if output_units == "ACC":
         fpow = 2.0
@@ -415,11 +518,62 @@ def brune(freq,
     elif output_units == "DISP":
         fpow = 0.0
 
-    displacement = C * moment * S
+    displacement = C * brune_shape(freq, moment, stress_drop, shear_vel)
 
     return (2 * np.pi * freq)**fpow * displacement
 
 
+def brune_shape(freq, moment, stress_drop, shear_vel=3.7):
+    """
+    Moment and stress drop dependent part of the Brune source spectrum.
+
+    Args:
+        freq (array):
+            Numpy array of frequencies for computing spectra (Hz).
+        moment (float):
+            Earthquake moment (dyne-cm).
+        stress_drop (float):
+            Earthquake stress drop (bars).
+        shear_vel (float):
+            Shear-wave velocity at source (km/s).
+
+    Returns:
+        Array of moment times the Brune spectral shape.
+    """
+    f0 = brune_f0(moment, stress_drop, shear_vel)
+    return moment / (1 + (freq / f0)**2)
+
+
+def brune_constant(RP=0.55,
+                   VHC=0.7071068,
+                   FSE=2.0,
+                   shear_vel=3.7,
+                   density=2.8,
+                   R0=1.0):
+    """
+    Constant factor of the Brune source spectrum.
+
+    Args:
+        RP (float):
+            Partition of shear-wave energy into horizontal components.
+        VHC (float):
+            Partition of shear-wave energy into horizontal components
+            1 / np.sqrt(2.0).
+        FSE (float):
+            Free surface effect.
+        shear_vel (float):
+            Shear-wave velocity at source (km/s).
+        density (float):
+            Density at source (gm/cc).
+        R0 (float):
+            Reference distance (km).
+
+    Returns:
+        float: Constant factor.
+    """
+    return RP * VHC * FSE / (4 * np.pi * density * shear_vel**3 * R0) * 1e-20
+
+
 def brune_f0(moment, stress_drop, shear_vel=3.7):
     """
     Compute Brune's corner frequency.
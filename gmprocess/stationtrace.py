@@ -1,6 +1,5 @@
 # stdlib imports
 import json
-import copy
 import logging
 from datetime import datetime
 import getpass
@@ -13,7 +12,6 @@ from obspy.core.trace import Trace
 import prov
 import prov.model
 from obspy.core.utcdatetime import UTCDateTime
-import pandas as pd
 
 # local imports
 from gmprocess._version import get_versions
@@ -303,11 +301,7 @@ class StationTrace(Trace):
                 'points in the data.'
             )
 
-        if 'remove_response' not in self.getProvenanceKeys():
-            self.stats.standard.units = 'raw counts'
-        else:
-            self.stats.standard.units = REVERSE_UNITS[
-                self.getProvenance('remove_response')[0]['output_units']]
+        self._update_units()
 
         # are all of the defined standard keys in the standard dictionary?
         req_keys = set(STANDARD_KEYS.keys())
@@ -350,6 +344,15 @@ class StationTrace(Trace):
         if len(error_msg.strip()):
             raise KeyError(error_msg)
 
+    def _update_units(self):
+        """Set the units in the standard dictionary from the provenance.
+        """
+        if 'remove_response' not in self.getProvenanceKeys():
+            self.stats.standard.units = 'raw counts'
+        else:
+            self.stats.standard.units = REVERSE_UNITS[
+                self.getProvenance('remove_response')[0]['output_units']]
+
     def getProvenanceKeys(self):
         """Get a list of all available provenance keys.
 
@@ -387,6 +390,9 @@ class StationTrace(Trace):
     def setProvenance(self, prov_id, prov_attributes):
         """Update a trace's provenance information.
 
+        The provenance is kept as a list of records; the SEIS-PROV document
+        is only built when it is requested (see getProvenanceDocument).
+
         Args:
             trace (obspy.core.trace.Trace):
                 Trace of strong motion dataself.
@@ -398,7 +404,10 @@ class StationTrace(Trace):
         provdict = {'prov_id': prov_id,
                     'prov_attributes': prov_attributes}
         self.provenance.append(provdict)
-        self.validate()
+        # The units are the only part of the header that depends on the
+        # provenance
+        if prov_id == 'remove_response':
+            self._update_units()
 
     def getAllProvenance(self):
         """Get internal list of processing history.
@@ -419,7 +428,10 @@ class StationTrace(Trace):
             pr = _get_software_agent(pr)
             pr = _get_waveform_entity(self, pr)
         else:
-            pr = _get_waveform_entity(self, copy.deepcopy(base_prov))
+            pr = prov.model.ProvDocument()
+            pr.add_namespace(*NS_SEIS)
+            pr.update(base_prov)
+            pr = _get_waveform_entity(self, pr)
         sequence = 1
         for provdict in self.getAllProvenance():
             provid = provdict['prov_id']
@@ -433,27 +445,14 @@ class StationTrace(Trace):
         return pr
 
     def setProvenanceDocument(self, provdoc):
-        software = {}
-        person = {}
+        software, person = get_agent_parameters(provdoc)
         for record in provdoc.get_records():
             ident = record.identifier.localpart
             parts = ident.split('_')
             sptype = parts[1]
             # hashid = '_'.join(parts[2:])
             # sp, sptype, hashid = ident.split('_')
-            if sptype == 'sa':
-                for attr_key, attr_val in record.attributes:
-                    key = attr_key.localpart
-                    if isinstance(attr_val, prov.identifier.Identifier):
-                        attr_val = attr_val.uri
-                    software[key] = attr_val
-            elif sptype == 'pp':
-                for attr_key, attr_val in record.attributes:
-                    key = attr_key.localpart
-                    if isinstance(attr_val, prov.identifier.Identifier):
-                        attr_val = attr_val.uri
-                    person[key] = attr_val
-            elif sptype == 'wf':  # waveform tag
+            if sptype in ['sa', 'pp', 'wf']:  # agents and waveform tag
                 continue
             else:  # these are processing steps
                 params = {}
@@ -472,6 +471,37 @@ class StationTrace(Trace):
             self.setParameter('software', software)
             self.setParameter('user', person)
 
+    def getProvenanceJSON(self):
+        """Get the processing history in a compact JSON form.
+
+        UTCDateTime values are stored as in the JSON serialization of
+        SEIS-PROV documents, i.e., {"$": time string, "type": "xsd:dateTime"}.
+
+        Returns:
+            str: JSON array of [prov_id, prov_attributes] pairs.
+        """
+        records = []
+        for provdict in self.provenance:
+            attributes = provdict['prov_attributes']
+            if isinstance(attributes, dict):
+                attributes = {
+                    key: _encode_prov_value(value)
+                    for key, value in attributes.items()}
+            records.append([provdict['prov_id'], attributes])
+        return json.dumps(records, default=_json_default)
+
+    def setProvenanceJSON(self, jsonstr):
+        """Append processing history from its compact JSON form.
+
+        Args:
+            jsonstr (str):
+                JSON array of [prov_id, prov_attributes] pairs (see
+                getProvenanceJSON).
+        """
+        for prov_id, attributes in json.loads(
+                jsonstr, object_hook=_decode_prov_value):
+            self.setProvenance(prov_id, attributes)
+
     def hasParameter(self, param_id):
         """Check to see if Trace contains a given parameter.
 
@@ -555,6 +585,9 @@ class StationTrace(Trace):
         return self.parameters[param_id]
 
     def getProvDataFrame(self):
+        # pandas is only needed for the provenance tables, so the readers
+        # do not pay for importing it
+        import pandas as pd
         columns = ['Process Step', 'Process Attribute', 'Process Value']
         df = pd.DataFrame(columns=columns)
         values = []
@@ -596,6 +629,7 @@ class StationTrace(Trace):
                 Pandas Series (see above).
 
         """
+        import pandas as pd
         tpl = (self.stats.network, self.stats.station, self.stats.channel)
         recstr = '%s.%s.%s' % tpl
         values = []
@@ -759,6 +793,55 @@ def _stats_from_inventory(data, inventory, channelid):
     return (response, standard, coords, format_specific)
 
 
+def get_agent_parameters(provdoc):
+    '''Get the software and user information from a SEIS-PROV document.
+
+    Args:
+        provdoc (prov.model.ProvDocument):
+            Provenance document with software and person agents.
+
+    Returns:
+        tuple: Dictionaries of the software and user (person) attributes,
+        as set in the "software" and "user" trace parameters.
+    '''
+    software = {}
+    person = {}
+    for record in provdoc.get_records():
+        sptype = record.identifier.localpart.split('_')[1]
+        if sptype == 'sa':
+            agent = software
+        elif sptype == 'pp':
+            agent = person
+        else:
+            continue
+        for attr_key, attr_val in record.attributes:
+            if isinstance(attr_val, prov.identifier.Identifier):
+                attr_val = attr_val.uri
+            agent[attr_key.localpart] = attr_val
+    return software, person
+
+
+def _encode_prov_value(value):
+    if isinstance(value, UTCDateTime):
+        return {'$': value.strftime(TIMEFMT_MS), 'type': 'xsd:dateTime'}
+    return value
+
+
+def _decode_prov_value(value):
+    if set(value.keys()) == {'$', 'type'} and value['type'] == 'xsd:dateTime':
+        return UTCDateTime(value['$'])
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('Object of type %s is not JSON serializable'
+                    % type(value).__name__)
+
+
 def _get_software_agent(pr):
     '''Get the seis-prov entity for the gmprocess software.
 
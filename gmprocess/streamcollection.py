@@ -13,10 +13,8 @@ import fnmatch
 from obspy import UTCDateTime
 from obspy.core.event import Origin
 from obspy.geodetics import gps2dist_azimuth
-import pandas as pd
 
 from gmprocess.exception import GMProcessException
-from gmprocess.metrics.station_summary import StationSummary
 from gmprocess.stationtrace import REV_PROCESS_LEVELS
 from gmprocess.stationstream import StationStream
 from gmprocess.io.read_directory import directory_to_streams
@@ -92,6 +90,7 @@ class StreamCollection(object):
                 newstreams.append(s)
 
         self.streams = newstreams
+        self.__index = None
         if handle_duplicates:
             if len(self.streams):
                 self.__handle_duplicates(
@@ -158,31 +157,12 @@ class StreamCollection(object):
                 List of strings indicating preferred instrument types.
         """
 
-        # Create a list of streams with matching id (combo of net and station).
-        all_matches = []
-        match_list = []
-        for idx1, stream1 in enumerate(self):
-            if idx1 in all_matches:
-                continue
-            matches = [idx1]
-            net_sta = stream1.get_net_sta()
-            for idx2, stream2 in enumerate(self):
-                if idx1 != idx2 and idx1 not in all_matches:
-                    if (net_sta == stream2.get_net_sta()):
-                        matches.append(idx2)
-            if len(matches) > 1:
-                match_list.append(matches)
-                all_matches.extend(matches)
-            else:
-                if matches[0] not in all_matches:
-                    match_list.append(matches)
-                    all_matches.extend(matches)
-
-        for group in match_list:
+        # Group the streams with matching id (combo of net and station).
+        for group in self.__get_index().values():
             # Are there colocated instruments for this group?
             if len(group) > 1:
                 # If so, loop over list of preferred instruments
-                group_insts = [self[g].get_inst() for g in group]
+                group_insts = [st.get_inst() for st in group]
 
                 # Loop over preferred instruments
                 no_match = True
@@ -199,11 +179,9 @@ class StreamCollection(object):
                         # Label all non-selected streams in the group as failed
                         to_fail = group_insts
                         to_fail.remove(keep)
-                        for tf in to_fail:
-                            for st in self.select(
-                                    network=self[group[0]][0].stats.network,
-                                    station=self[group[0]][0].stats.station,
-                                    instrument=tf):
+                        to_fail = set(tf.upper() for tf in to_fail)
+                        for st in group:
+                            if st.get_inst().upper() in to_fail:
                                 for tr in st:
                                     tr.fail(
                                         'Colocated with %s instrument.' % keep
@@ -212,8 +190,8 @@ class StreamCollection(object):
                         break
                 if no_match:
                     # Fail all Streams in group
-                    for g in group:
-                        for tr in self[g]:
+                    for st in group:
+                        for tr in st:
                             tr.fail(
                                 'No instruments match entries in the '
                                 'colocated instrument preference list for '
@@ -340,6 +318,10 @@ class StreamCollection(object):
         else:
             station_summary_imts = imts
 
+        # The metrics pull in the hazard and rupture libraries, which reading
+        # and writing collections does not need.
+        import pandas as pd
+        from gmprocess.metrics.station_summary import StationSummary
         subdfs = []
         for stream in streams:
             if not stream.passed:
@@ -408,6 +390,7 @@ class StreamCollection(object):
         __setitem__ method.
         """
         self.streams.__setitem__(index, stream)
+        self.__index = None
 
     def __getitem__(self, index):
         """
@@ -422,6 +405,7 @@ class StreamCollection(object):
         """
         __delitem__ method.
         """
+        self.__index = None
         return self.streams.__delitem__(index)
 
     def __getslice__(self, i, j, k=1):
@@ -450,6 +434,7 @@ class StreamCollection(object):
         Remove and return the StationStream object specified by index from
         the StreamCollection.
         """
+        self.__index = None
         return self.streams.pop(index)
 
     def copy(self):
@@ -474,8 +459,16 @@ class StreamCollection(object):
                 Instrument code; i.e., the first two characters of the
                 channel.
         """
+        if network is not None and station is not None and \
+                not _has_wildcard(network) and not _has_wildcard(station):
+            # Exact network and station codes are looked up in the index
+            candidates = self.__get_index(upper=True).get(
+                (network.upper(), station.upper()), [])
+        else:
+            candidates = self.streams
+
         sel = []
-        for st in self:
+        for st in candidates:
             inst = st.get_inst()
             net_sta = st.get_net_sta()
             net = net_sta.split('.')[0]
@@ -492,6 +485,33 @@ class StreamCollection(object):
             sel.append(st)
         return self.__class__(sel)
 
+    def __get_index(self, upper=False):
+        """
+        Index of the StationStreams by network and station, in order of first
+        appearance.
+
+        The index is built when it is first needed and is reset when the
+        StationStreams of the collection change.
+
+        Args:
+            upper (bool):
+                If True, the keys are (network, station) tuples in upper case;
+                otherwise they are the "net.sta" strings from get_net_sta.
+
+        Returns:
+            dict: Lists of StationStreams keyed by network and station.
+        """
+        if self.__index is None:
+            index = {}
+            upper_index = {}
+            for st in self.streams:
+                net_sta = st.get_net_sta()
+                index.setdefault(net_sta, []).append(st)
+                net, sta = net_sta.upper().split('.')
+                upper_index.setdefault((net, sta), []).append(st)
+            self.__index = (index, upper_index)
+        return self.__index[1] if upper else self.__index[0]
+
     def __group_by_net_sta_inst(self):
 
         trace_list = []
@@ -500,42 +520,17 @@ class StreamCollection(object):
             for tr in st:
                 trace_list.append(tr)
 
-        # Create a list of traces with matching net, sta.
-        all_matches = []
-        match_list = []
-        for idx1, trace1 in enumerate(trace_list):
-            if idx1 in all_matches:
-                continue
-            matches = [idx1]
-            network = trace1.stats['network']
-            station = trace1.stats['station']
-            free_field = trace1.free_field
+        # Group the traces with matching net, sta, instrument, and free field
+        # status, in order of first appearance.
+        match_dict = {}
+        for trace in trace_list:
             # For instrument, use first two characters of the channel
-            inst = trace1.stats['channel'][0:2]
-            for idx2, trace2 in enumerate(trace_list):
-                if idx1 != idx2 and idx1 not in all_matches:
-                    if (
-                        network == trace2.stats['network'] and
-                        station == trace2.stats['station'] and
-                        inst == trace2.stats['channel'][0:2] and
-                        free_field == trace2.free_field
-                    ):
-                        matches.append(idx2)
-            if len(matches) > 1:
-                match_list.append(matches)
-                all_matches.extend(matches)
-            else:
-                if matches[0] not in all_matches:
-                    match_list.append(matches)
-                    all_matches.extend(matches)
+            key = (trace.stats['network'], trace.stats['station'],
+                   trace.stats['channel'][0:2], trace.free_field)
+            match_dict.setdefault(key, []).append(trace)
 
         grouped_streams = []
-        for groups in match_list:
-            grouped_trace_list = []
-            for i in groups:
-                grouped_trace_list.append(
-                    trace_list[i]
-                )
+        for grouped_trace_list in match_dict.values():
             # some networks (e.g., Bureau of Reclamation, at the time of this
             # writing) use the location field to indicate different sensors at
             # (roughly) the same location. If we know this (as in the case of
@@ -548,6 +543,7 @@ class StreamCollection(object):
                 grouped_streams.append(st)
 
         self.streams = grouped_streams
+        self.__index = None
 
     def __handle_duplicates(self, max_dist_tolerance,
                             process_level_preference, format_preference):
@@ -589,11 +585,17 @@ class StreamCollection(object):
         for st in self.streams:
             for tr in st:
                 traces.append(tr)
-        preferred_traces = []
 
+        # Duplicates always have the same station, location, instrument, and
+        # orientation, so each trace is only compared with the preferred
+        # traces in its bucket. The buckets and the (insertion ordered)
+        # preferred_traces dict keep the order in which traces were added.
+        preferred_traces = {}
+        buckets = {}
         for tr_to_add in traces:
+            bucket = buckets.setdefault(_duplicate_key(tr_to_add), [])
             is_duplicate = False
-            for tr_pref in preferred_traces:
+            for tr_pref in bucket:
                 if are_duplicates(tr_to_add, tr_pref,
                                   preferences['max_dist_tolerance']):
                     is_duplicate = True
@@ -604,12 +606,14 @@ class StreamCollection(object):
                         tr_to_add, tr_pref,
                         preferences['process_level_preference'],
                         preferences['format_preference']) == tr_to_add:
-                    preferred_traces.remove(tr_pref)
+                    del preferred_traces[id(tr_pref)]
+                    bucket.remove(tr_pref)
                     logging.info('Trace %s (%s) is a duplicate and '
                                  'has been removed from the StreamCollection.'
                                  % (tr_pref.id,
                                     tr_pref.stats.standard.source_file))
-                    preferred_traces.append(tr_to_add)
+                    preferred_traces[id(tr_to_add)] = tr_to_add
+                    bucket.append(tr_to_add)
                 else:
                     logging.info('Trace %s (%s) is a duplicate and '
                                  'has been removed from the StreamCollection.'
@@ -617,11 +621,13 @@ class StreamCollection(object):
                                     tr_to_add.stats.standard.source_file))
 
             else:
-                preferred_traces.append(tr_to_add)
+                preferred_traces[id(tr_to_add)] = tr_to_add
+                bucket.append(tr_to_add)
 
-        streams = [StationStream([tr]) for tr in preferred_traces]
+        streams = [StationStream([tr]) for tr in preferred_traces.values()]
         streams = insert_stream_parameters(streams, stream_params)
         self.streams = streams
+        self.__index = None
 
     def get_status(self, status):
         """
@@ -646,6 +652,7 @@ class StreamCollection(object):
             If status='net': pandas.DataFrame
             If status='short' or status='long': pandas.Series
         """
+        import pandas as pd
 
         if status == 'short':
             failure_reasons = pd.Series(
@@ -743,6 +750,10 @@ def insert_stream_parameters(streams, stream_params):
     return streams
 
 
+def _has_wildcard(pattern):
+    return any(c in pattern for c in '*?[')
+
+
 def split_station(grouped_trace_list):
     if grouped_trace_list[0].stats.network in NETWORKS_USING_LOCATION:
         streams_dict = {}
@@ -758,6 +769,24 @@ def split_station(grouped_trace_list):
     return streams
 
 
+def _orientation_class(tr):
+    if tr.stats.channel[2] in ['1', 'N']:
+        return '1'
+    elif tr.stats.channel[2] in ['2', 'E']:
+        return '2'
+    else:
+        return 'Z'
+
+
+def _duplicate_key(tr):
+    """
+    Key shared by all traces that can be duplicates of each other (see
+    are_duplicates).
+    """
+    return (tr.stats.station, tr.stats.location, tr.stats.channel[:2],
+            _orientation_class(tr))
+
+
 def are_duplicates(tr1, tr2, max_dist_tolerance):
     """
     Determines whether two StationTraces are duplicates by checking the
@@ -776,14 +805,8 @@ def are_duplicates(tr1, tr2, max_dist_tolerance):
         bool. True if traces are duplicates, False otherwise.
     """
 
-    orientation_codes = set()
-    for tr in [tr1, tr2]:
-        if tr.stats.channel[2] in ['1', 'N']:
-            orientation_codes.add('1')
-        elif tr.stats.channel[2] in ['2', 'E']:
-            orientation_codes.add('2')
-        else:
-            orientation_codes.add('Z')
+    orientation_codes = set(
+        [_orientation_class(tr1), _orientation_class(tr2)])
 
     # First, check if the ids match (net.sta.loc.cha)
     if (tr1.id[:-1] == tr2.id[:-1] and len(orientation_codes) == 1):
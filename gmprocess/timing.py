@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Timing and memory instrumentation for the processing and metrics steps.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak memory is reported as NaN there.
+    resource = None
+
+TIMING_COLUMNS = ['Stage', 'Station', 'Step', 'WallTime', 'CPUTime',
+                  'PeakRSSDelta']
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+RSS_TO_MB = 1.0 / 1024**2 if sys.platform == 'darwin' else 1.0 / 1024
+
+
+def get_peak_rss():
+    """Peak resident set size of the current process.
+
+    Returns:
+        float: Peak RSS (MB), or NaN if it cannot be determined.
+    """
+    if resource is None:
+        return np.nan
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_TO_MB
+
+
+class StepTimer(object):
+    """Collects the wall time, CPU time, and peak memory growth of steps.
+
+    Each record is keyed by the stage (e.g., 'processing' or 'metrics'), the
+    station (stream ID), and the step name. The peak RSS delta is the amount
+    by which the peak resident set size of the process grew during the step,
+    so it is zero for steps that do not need more memory than has already
+    been used.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    @contextmanager
+    def time(self, stage, station, step):
+        """Context manager that records the time and memory used by a step.
+
+        Args:
+            stage (str):
+                Name of the stage that the step belongs to.
+            station (str):
+                ID of the stream that the step is applied to.
+            step (str):
+                Name of the step.
+        """
+        rss = get_peak_rss()
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append([
+                stage, station, step,
+                time.perf_counter() - wall,
+                time.process_time() - cpu,
+                get_peak_rss() - rss])
+
+    def to_dataframe(self):
+        """All of the step records.
+
+        Returns:
+            DataFrame: Columns are Stage, Station, Step, WallTime (s),
+            CPUTime (s), and PeakRSSDelta (MB).
+        """
+        return pd.DataFrame(self.records, columns=TIMING_COLUMNS)
+
+    def summarize(self):
+        """Aggregate the step records over stations.
+
+        Returns:
+            DataFrame: One row per stage and step, in the order in which the
+            steps were first run, with the number of calls, the total and
+            maximum wall time, the total CPU time, and the maximum peak RSS
+            delta.
+        """
+        return summarize_timings(self.to_dataframe())
+
+
+def summarize_timings(df):
+    """Aggregate a table of step records (see StepTimer.to_dataframe).
+
+    Args:
+        df (DataFrame):
+            Step records.
+
+    Returns:
+        DataFrame: Summary table (see StepTimer.summarize).
+    """
+    grouped = df.groupby(['Stage', 'Step'], sort=False)
+    summary = pd.DataFrame({
+        'Count': grouped['WallTime'].count(),
+        'WallTime': grouped['WallTime'].sum(),
+        'MaxWallTime': grouped['WallTime'].max(),
+        'CPUTime': grouped['CPUTime'].sum(),
+        'PeakRSSDelta': grouped['PeakRSSDelta'].max()
+    })
+    return summary.reset_index()
@@ -12,7 +12,9 @@ from openquake.hazardlib.gsim.base import RuptureContext
 from openquake.hazardlib.gsim.base import DistancesContext
 from openquake.hazardlib import const
 from openquake.hazardlib import imt
+from openquake.hazardlib.geo.geodetic import geodetic_distance
 
+from obspy.core.utcdatetime import UTCDateTime
 from obspy.geodetics.base import gps2dist_azimuth
 
 from gmprocess.phase import (
@@ -315,7 +317,7 @@ def signal_end(st, event_time, event_lon, event_lat, event_mag,
 
 def trim_multiple_events(st, origin, catalog, travel_time_df, pga_factor,
                          pct_window_reject, gmpe, site_parameters,
-                         rupture_parameters):
+                         rupture_parameters, predicted_pga_df=None):
     """
     Uses a catalog (list of ScalarEvents) to handle cases where a trace might
     contain signals from multiple events. The catalog should contain events
@@ -344,7 +346,7 @@ def trim_multiple_events(st, origin, catalog, travel_time_df, pga_factor,
             A pandas DataFrame that contains the travel time information
             (obtained using gmprocess.phase.create_travel_time_dataframe).
             The columns in the DataFrame are the station ids and the indices
-            are the earthquake ids.
+            are the earthquake ids. The arrival times are float timestamps.
         pga_factor (float):
             A decimal factor used to determine whether the predicted PGA
             from an event arrival is significant enough that it should be
@@ -362,6 +364,10 @@ def trim_multiple_events(st, origin, catalog, travel_time_df, pga_factor,
             Dictionary of site parameters to input to the GMPE.
         rupture_parameters:
             Dictionary of rupture parameters to input to the GMPE.
+        predicted_pga_df (DataFrame):
+            A pandas DataFrame of the predicted PGA (obtained using
+            get_predicted_pga_dataframe), with the same layout as
+            travel_time_df. If None, it is computed for this stream.
 
     Returns:
         StationStream: Processed stream.
@@ -382,8 +388,8 @@ def trim_multiple_events(st, origin, catalog, travel_time_df, pga_factor,
 
     # Filter by any arrival times that appear in the signal window
     arrivals = arrivals[
-        (arrivals > signal_window_starttime) &
-        (arrivals < st[0].stats.endtime)]
+        (arrivals > signal_window_starttime.timestamp) &
+        (arrivals < st[0].stats.endtime.timestamp)]
 
     # Make sure we remove the arrival that corresponds to the event of interest
     if origin.id in arrivals.index:
@@ -396,6 +402,79 @@ def trim_multiple_events(st, origin, catalog, travel_time_df, pga_factor,
     stasum = StationSummary.from_stream(st, ['ROTD(50.0)'], ['PGA'])
     recorded_pga = stasum.get_pgm('PGA', 'ROTD(50.0)')
 
+    # Filter by arrivals that have significant expected PGA using GMPE
+    if predicted_pga_df is None:
+        catalog_index = {event.id: event for event in catalog}
+        predicted_pga_df = get_predicted_pga_dataframe(
+            [st], [catalog_index[eqid] for eqid in arrivals.index], gmpe,
+            site_parameters, rupture_parameters)
+    sta_id = st[0].stats.network + '.' + st[0].stats.station
+    predicted_pga = predicted_pga_df.loc[arrivals.index, sta_id]
+    is_significant = (predicted_pga > (pga_factor * recorded_pga)).values
+
+    significant_arrivals = arrivals[is_significant]
+    if significant_arrivals.empty:
+        return st
+
+    # Check if any of the significant arrivals occur within the
+    signal_length = st[0].stats.endtime - signal_window_starttime
+    cutoff_time = signal_window_starttime + pct_window_reject * (signal_length)
+    if (significant_arrivals < cutoff_time.timestamp).any():
+        for tr in st:
+            tr.fail('A significant arrival from another event occurs within '
+                    'the first %s percent of the signal window' %
+                    (100 * pct_window_reject))
+
+    # Otherwise, trim the stream at the first significant arrival
+    else:
+        for tr in st:
+            signal_end = tr.getParameter('signal_end')
+            signal_end['end_time'] = UTCDateTime(significant_arrivals.iloc[0])
+            signal_end['method'] = ('Trimming before right another event')
+            tr.setParameter('signal_end', signal_end)
+        cut(st)
+
+    return st
+
+
+def get_predicted_pga_dataframe(streams, catalog, gmpe, site_parameters,
+                                rupture_parameters):
+    """
+    Computes the PGA predicted by a GMPE at each station for each event in the
+    catalog, for use in trim_multiple_events.
+
+    The GMPE is evaluated once per event for all of the stations. As in
+    OpenQuake, the epicentral distances are computed on a sphere, and the
+    Joyner-Boore and rupture distances are approximated by the epicentral
+    and hypocentral distances.
+
+    Args:
+        streams (StreamCollection):
+            Streams to calculate the predicted PGA for.
+        catalog (list):
+            List of ScalarEvent objects.
+        gmpe (str):
+            Short name of the GMPE to use. Must be defined in the modules file.
+        site_parameters (dict):
+            Dictionary of site parameters to input to the GMPE.
+        rupture_parameters:
+            Dictionary of rupture parameters to input to the GMPE.
+
+    Returns:
+        DataFrame: Predicted PGA (in %g). The columns are the station ids
+        (network.station) and the indices are the earthquake ids.
+    """
+    # Store the lat and lon for each station
+    st_coords = {}
+    for st in streams:
+        st_id = st[0].stats.network + '.' + st[0].stats.station
+        if st_id not in st_coords:
+            st_coords[st_id] = (st[0].stats.coordinates.latitude,
+                                st[0].stats.coordinates.longitude)
+    st_ids = list(st_coords.keys())
+    st_lats = np.array([st_coords[st_id][0] for st_id in st_ids])
+    st_lons = np.array([st_coords[st_id][1] for st_id in st_ids])
+
     # Load the GMPE model
     gmpe = load_model(gmpe)
 
@@ -405,14 +484,11 @@ def trim_multiple_events(st, origin, catalog, travel_time_df, pga_factor,
     # Make sure that site parameter values are converted to numpy arrays
     site_parameters_copy = site_parameters.copy()
     for k, v in site_parameters_copy.items():
-        site_parameters_copy[k] = np.array([site_parameters_copy[k]])
+        site_parameters_copy[k] = np.full(len(st_ids), v)
     sx.__dict__.update(site_parameters_copy)
 
-    # Filter by arrivals that have significant expected PGA using GMPE
-    is_significant = []
-    for eqid, arrival_time in arrivals.items():
-        event = next(event for event in catalog if event.id == eqid)
-
+    predicted_pga = np.zeros((len(catalog), len(st_ids)))
+    for i, event in enumerate(catalog):
         # Set rupture parameters
         rx = RuptureContext()
         rx.__dict__.update(rupture_parameters)
@@ -421,11 +497,8 @@ def trim_multiple_events(st, origin, catalog, travel_time_df, pga_factor,
         # TODO: distances should be calculated when we refactor to be
         # able to import distance calculations
         dx = DistancesContext()
-        dx.repi = np.array([
-            gps2dist_azimuth(
-                st[0].stats.coordinates.latitude,
-                st[0].stats.coordinates.longitude,
-                event.latitude, event.longitude)[0] / 1000])
+        dx.repi = geodetic_distance(
+            st_lons, st_lats, event.longitude, event.latitude)
         dx.rjb = dx.repi
         dx.rhypo = np.sqrt(dx.repi**2 + event.depth_km**2)
         dx.rrup = dx.rhypo
@@ -433,32 +506,7 @@ def trim_multiple_events(st, origin, catalog, travel_time_df, pga_factor,
         pga, sd = gmpe.get_mean_and_stddevs(sx, rx, dx, imt.PGA(), [])
 
         # Convert from ln(g) to %g
-        predicted_pga = 100 * np.exp(pga[0])
-        if predicted_pga > (pga_factor * recorded_pga):
-            is_significant.append(True)
-        else:
-            is_significant.append(False)
-
-    significant_arrivals = arrivals[is_significant]
-    if significant_arrivals.empty:
-        return st
-
-    # Check if any of the significant arrivals occur within the
-    signal_length = st[0].stats.endtime - signal_window_starttime
-    cutoff_time = signal_window_starttime + pct_window_reject * (signal_length)
-    if (significant_arrivals < cutoff_time).any():
-        for tr in st:
-            tr.fail('A significant arrival from another event occurs within '
-                    'the first %s percent of the signal window' %
-                    (100 * pct_window_reject))
-
-    # Otherwise, trim the stream at the first significant arrival
-    else:
-        for tr in st:
-            signal_end = tr.getParameter('signal_end')
-            signal_end['end_time'] = significant_arrivals[0]
-            signal_end['method'] = ('Trimming before right another event')
-            tr.setParameter('signal_end', signal_end)
-        cut(st)
+        predicted_pga[i] = 100 * np.exp(pga)
 
-    return st
+    return pd.DataFrame(predicted_pga, index=[event.id for event in catalog],
+                        columns=st_ids)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+# stdlib imports
+import json
+import os
+import subprocess
+import sys
+import time
+
+# third party imports
+import pkg_resources
+
+# Subsystems that the command line programs should only import once the
+# step that needs them runs.
+HEAVY_MODULES = ['matplotlib', 'cartopy', 'pyasdf', 'h5py',
+                 'openquake.hazardlib', 'impactutils.mapping', 'libcomcat',
+                 'pandas', 'obspy']
+
+# Wall time budget (in seconds) for printing the help of a program.
+HELP_BUDGET = 1.0
+
+# Print the modules that were imported by running a program or code.
+RUN_PROGRAM = '''
+import json, runpy, sys
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name='__main__')
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)))
+'''
+RUN_READER = '''
+import json, sys
+from gmprocess.io.read import read_data
+read_data(sys.argv[1])
+print(json.dumps(sorted(sys.modules)))
+'''
+
+
+def _imported(modules):
+    return [name for name in HEAVY_MODULES if name in modules]
+
+
+def test_help_imports():
+    for program in ['gmprocess', 'gmconvert', 'gmbench', 'gminfo']:
+        script = pkg_resources.resource_filename(
+            'gmprocess', os.path.join('..', 'bin', program))
+        output = subprocess.check_output(
+            [sys.executable, '-c', RUN_PROGRAM, script, '--help'])
+        modules = json.loads(output.decode().splitlines()[-1])
+        assert _imported(modules) == [], program
+
+        # Best of three, to be robust to a busy machine
+        elapsed = []
+        for _ in range(3):
+            start = time.time()
+            subprocess.check_output([sys.executable, script, '--help'])
+            elapsed.append(time.time() - start)
+        assert min(elapsed) < HELP_BUDGET, program
+
+
+def test_reader_imports():
+    datafile = pkg_resources.resource_filename(
+        'gmprocess', os.path.join('data', 'testdata', 'knet', 'us2000cnnl',
+                                  'AOM0011801241951.EW'))
+    output = subprocess.check_output(
+        [sys.executable, '-c', RUN_READER, datafile])
+    modules = json.loads(output.decode().splitlines()[-1])
+    # Format detection loads every reader, including the ASDF reader that
+    # checks files with h5py, but not the workspace or metrics.
+    assert _imported(modules) == ['h5py', 'obspy']
+
+
+if __name__ == '__main__':
+    os.environ['CALLED_FROM_PYTEST'] = 'True'
+    test_help_imports()
+    test_reader_imports()
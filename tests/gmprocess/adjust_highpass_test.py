@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+# stdlib imports
+import os
+
+# third party imports
+import numpy as np
+
+# local imports
+from gmprocess.io.read import read_data
+from gmprocess.io.test_utils import read_data_dir
+from gmprocess.filtering import lowpass_filter_trace, highpass_filter_trace
+from gmprocess.adjust_highpass import (
+    adjust_highpass_corner, _DisplacementSpectrum)
+
+
+def _get_stream():
+    data_files, origin = read_data_dir('geonet', 'us1000778i', '*.V1A')
+    st = read_data(data_files[0])[0]
+    for tr in st:
+        tr.detrend('demean')
+        tr.setParameter('corner_frequencies',
+                        {'highpass': 0.01, 'lowpass': 20.0})
+    return st
+
+
+def test_displacement_spectrum():
+    st = _get_stream()
+    for tr in st:
+        spec = _DisplacementSpectrum(tr, 20.0)
+        for f_hp in [0.05, 0.1, 0.3]:
+            # Time domain filtering and integration
+            trdis = tr.copy()
+            trdis.getParameter('corner_frequencies')['highpass'] = f_hp
+            trdis = lowpass_filter_trace(trdis)
+            trdis = highpass_filter_trace(trdis)
+            trdis.integrate()
+            trdis.integrate()
+
+            disp = spec.displacement(f_hp)
+            np.testing.assert_allclose(
+                disp, trdis.data, rtol=0,
+                atol=1e-7 * np.max(np.abs(trdis.data)))
+
+
+def test_displacement_spectrum_short_record():
+    # The response of a low highpass corner lasts longer than a short record,
+    # which must not wrap around onto it
+    st = _get_stream()
+    tr = st[2]
+    tr.trim(tr.stats.starttime, tr.stats.starttime + 60)
+    spec = _DisplacementSpectrum(tr, 20.0)
+    for f_hp in [0.01, 0.02]:
+        trdis = tr.copy()
+        trdis.getParameter('corner_frequencies')['highpass'] = f_hp
+        trdis = lowpass_filter_trace(trdis)
+        trdis = highpass_filter_trace(trdis)
+        trdis.integrate()
+        trdis.integrate()
+
+        disp = spec.displacement(f_hp)
+        np.testing.assert_allclose(
+            disp, trdis.data, rtol=0,
+            atol=1e-7 * np.max(np.abs(trdis.data)))
+        np.testing.assert_allclose(
+            np.abs(disp[-1]) / np.max(np.abs(disp)),
+            np.abs(trdis.data[-1]) / np.max(np.abs(trdis.data)),
+            rtol=1e-6)
+
+
+def test_adjust_highpass_corner():
+    st = _get_stream()
+    st = adjust_highpass_corner(st, step_factor=1.3, maximum_freq=0.9,
+                                max_final_displacement=0.025,
+                                max_displacment_ratio=0.2)
+    f_hp = [tr.getParameter('corner_frequencies')['highpass'] for tr in st]
+    np.testing.assert_allclose(
+        f_hp, [0.8650415919381343, 0.6654166091831802, 0.08157307210000003])
+
+    # The first trace cannot meet the criteria below maximum_freq
+    failed = [tr.hasParameter('failure') for tr in st]
+    assert failed == [True, False, False]
+
+
+if __name__ == '__main__':
+    os.environ['CALLED_FROM_PYTEST'] = 'True'
+    test_displacement_spectrum()
+    test_displacement_spectrum_short_record()
+    test_adjust_highpass_corner()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+# stdlib imports
+import os
+import shutil
+import tempfile
+
+# third party imports
+import numpy as np
+
+# local imports
+from gmprocess.benchmark import (
+    synthetic_event, synthetic_streams, benchmark_config, run_benchmarks,
+    write_results, read_results, compare_results, SIZE_KEYS, RESULT_KEYS)
+from gmprocess.processing import process_streams
+
+
+def test_synthetic_streams():
+    event = synthetic_event()
+    sc = synthetic_streams(event, stations=3, npts=6000, sampling_rate=50.0)
+    assert len(sc) == 3
+    for st in sc:
+        assert len(st) == 3
+        for tr in st:
+            assert tr.stats.npts == 6000
+            assert tr.stats.sampling_rate == 50.0
+            assert tr.stats.standard.process_level == 'raw counts'
+
+    # The same seed gives the same records
+    sc2 = synthetic_streams(event, stations=3, npts=6000, sampling_rate=50.0)
+    np.testing.assert_array_equal(sc[0][0].data, sc2[0][0].data)
+
+    # The synthetic records pass the processing checks
+    config = benchmark_config(periods=3, imcs=['channels'])
+    sc = process_streams(sc, event, config=config)
+    assert all(st.passed for st in sc)
+    for tr in sc[0]:
+        assert tr.stats.standard.units == 'acc'
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(stations=[2], npts=[4000], periods=[2, 3],
+                             imcs=[['channels']], readers=False)
+    names = ['process_streams', 'compute_snr', 'MetricsController',
+             'addStreams', 'getStreams', 'calcMetrics', 'getTables']
+    assert [r['benchmark'] for r in results] == names * 2
+    assert [r['periods'] for r in results] == [2] * 7 + [3] * 7
+    for result in results:
+        assert result['imcs'] == 'channels'
+        assert result['wall_time'] > 0
+
+    tdir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(tdir, 'benchmarks.json')
+        write_results(results, filename)
+        metadata, df = read_results(filename)
+        assert 'commit' in metadata
+        assert list(df.columns) == (
+            ['benchmark'] + SIZE_KEYS + ['repeat'] + RESULT_KEYS)
+        assert len(df) == 14
+
+        # Comparing results with themselves
+        comparison = compare_results(df, df)
+        assert len(comparison) == 14
+        np.testing.assert_allclose(comparison['ratio'], 1.0)
+    finally:
+        shutil.rmtree(tdir)
+
+
+if __name__ == '__main__':
+    os.environ['CALLED_FROM_PYTEST'] = 'True'
+    test_synthetic_streams()
+    test_run_benchmarks()
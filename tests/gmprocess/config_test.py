@@ -3,9 +3,10 @@
 # stdlib imports
 import os
 import json
+import shutil
+import tempfile
 
-
-from gmprocess.config import merge_dicts
+from gmprocess.config import merge_dicts, read_config, get_config
 
 
 def test_merge_dicts():
@@ -88,6 +89,43 @@ def test_merge_dicts():
     assert(dump_expected == dump_result)
 
 
+def test_read_config():
+    tdir = tempfile.mkdtemp()
+    try:
+        config_file = os.path.join(tdir, 'config.yml')
+        with open(config_file, 'w') as f:
+            f.write('a:\n  b: 1\n')
+        config = read_config(config_file)
+        assert config == {'a': {'b': 1}}
+
+        # Each call returns a copy that can be modified
+        config['a']['b'] = 2
+        assert read_config(config_file) == {'a': {'b': 1}}
+
+        # The file is parsed again when it changes
+        with open(config_file, 'w') as f:
+            f.write('a:\n  b: 3\n  c: 4\n')
+        assert read_config(config_file) == {'a': {'b': 3, 'c': 4}}
+
+        # Invalid config files
+        with open(config_file, 'w') as f:
+            f.write('- a\n- b\n')
+        try:
+            read_config(config_file)
+            success = True
+        except ValueError:
+            success = False
+        assert success is False
+    finally:
+        shutil.rmtree(tdir)
+
+    config = get_config()
+    config['processing'] = None
+    assert get_config()['processing'] is not None
+    assert get_config(section='pickers') == config['pickers']
+
+
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_merge_dicts()
+    test_read_config()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+# stdlib imports
+import os
+
+# third party imports
+import numpy as np
+
+# local imports
+from gmprocess.io.read import read_data
+from gmprocess.io.test_utils import read_data_dir
+from gmprocess.filtering import (
+    highpass_filter, lowpass_filter, highpass_filter_trace, butter_sos)
+
+
+def _get_stream():
+    data_files, origin = read_data_dir('geonet', 'us1000778i', '*.V1A')
+    st = read_data(data_files[0])[0]
+    for tr in st:
+        tr.detrend('demean')
+        tr.setParameter('corner_frequencies',
+                        {'highpass': 0.05, 'lowpass': 20.0})
+    return st
+
+
+def test_filter_stream():
+    st = _get_stream()
+    # One trace has a different corner, so it is filtered on its own
+    st[1].setParameter('corner_frequencies',
+                       {'highpass': 0.1, 'lowpass': 20.0})
+    target = st.copy()
+    for tr in target:
+        freq = tr.getParameter('corner_frequencies')
+        tr.filter('highpass', freq=freq['highpass'], corners=5,
+                  zerophase=True)
+        tr.filter('lowpass', freq=freq['lowpass'], corners=4,
+                  zerophase=False)
+
+    butter_sos.cache_clear()
+    st = highpass_filter(st)
+    st = lowpass_filter(st, filter_order=4, number_of_passes=1)
+    assert butter_sos.cache_info().currsize == 3
+    for tr, trtarget in zip(st, target):
+        np.testing.assert_allclose(tr.data, trtarget.data, rtol=0,
+                                   atol=1e-12 * np.max(np.abs(tr.data)))
+        hp = tr.getProvenance('highpass_filter')[0]
+        assert hp['corner_frequency'] == \
+            tr.getParameter('corner_frequencies')['highpass']
+        assert hp['number_of_passes'] == 2
+        lp = tr.getProvenance('lowpass_filter')[0]
+        assert lp['filter_order'] == 4
+        assert lp['number_of_passes'] == 1
+
+
+def test_filter_failure():
+    st = _get_stream()
+    tr = st[0]
+    tr.setParameter('corner_frequencies',
+                    {'highpass': 1000.0, 'lowpass': 20.0})
+    tr = highpass_filter_trace(tr)
+    failure = tr.getParameter('failure')
+    assert failure['module'] == 'highpass_filter_trace'
+    assert failure['reason'].endswith('above Nyquist.')
+
+
+if __name__ == '__main__':
+    os.environ['CALLED_FROM_PYTEST'] = 'True'
+    test_filter_stream()
+    test_filter_failure()
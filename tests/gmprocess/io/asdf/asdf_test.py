@@ -8,6 +8,8 @@ from gmprocess.io.read import read_data
 from gmprocess.io.test_utils import read_data_dir
 import tempfile
 
+import pyasdf
+
 
 def test_asdf():
     eventid = 'us1000778i'
@@ -37,6 +39,39 @@ def test_asdf():
         shutil.rmtree(tdir)
 
 
+def test_write_asdf_provenance():
+    eventid = 'us1000778i'
+    datafiles, event = read_data_dir(
+        'geonet', eventid, '20161113_110259_WTMC_20.V1A')
+    tdir = tempfile.mkdtemp()
+    try:
+        tfile = os.path.join(tdir, 'test.hdf')
+        streams = read_data(datafiles[0])
+        for tr in streams[0]:
+            tr.setProvenance('detrend', {'detrending_method': 'demean'})
+        write_asdf(tfile, streams, event, label='processed')
+
+        # exported files keep the SEIS-PROV documents for other ASDF tools
+        ds = pyasdf.ASDFDataSet(tfile, mode='r')
+        provnames = ds.provenance.list()
+        assert len(provnames) == len(streams[0])
+        for name in provnames:
+            provdoc = ds.provenance[name]
+            activities = [str(rec.get_asserted_types().pop())
+                          for rec in provdoc.get_records()
+                          if rec.get_type().localpart == 'Activity']
+            assert activities == ['seis_prov:remove_response',
+                                  'seis_prov:detrend']
+        del ds
+
+        outstreams = read_asdf(tfile, label='processed')
+        for tr1, tr2 in zip(outstreams[0], streams[0]):
+            assert tr1.getAllProvenance() == tr2.getAllProvenance()
+    finally:
+        shutil.rmtree(tdir)
+
+
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_asdf()
+    test_write_asdf_provenance()
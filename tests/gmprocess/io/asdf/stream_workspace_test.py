@@ -90,6 +90,43 @@ def test_stream_params():
         shutil.rmtree(tdir)
 
 
+def test_seis_prov():
+    eventid = 'us1000778i'
+    datafiles, event = read_data_dir(
+        'geonet',
+        eventid,
+        '20161113_110259_WTMC_20.V1A'
+    )
+    tdir = tempfile.mkdtemp()
+    try:
+        streams = read_data(datafiles[0])
+        for tr in streams[0]:
+            tr.setProvenance('detrend', {'detrending_method': 'demean'})
+        tfile = os.path.join(tdir, 'test.hdf')
+        workspace = StreamWorkspace(tfile)
+        workspace.addStreams(event, streams, label='compact')
+        workspace.addStreams(event, streams, label='seisprov', seis_prov=True)
+
+        # SEIS-PROV documents are only written when requested
+        provnames = workspace.dataset.provenance.list()
+        assert len(provnames) == 3
+        assert all(name.endswith('seisprov') for name in provnames)
+
+        compact = workspace.getStreams(eventid, labels=['compact'])[0]
+        seisprov = workspace.getStreams(eventid, labels=['seisprov'])[0]
+        for tr1, tr2, tr in zip(compact, seisprov, streams[0]):
+            assert tr1.getAllProvenance() == tr.getAllProvenance()
+            assert tr1.getParameter('software')['software_name'] == \
+                'gmprocess'
+            assert tr1.getParameter('user') == tr2.getParameter('user')
+
+        summary = workspace.summarizeLabels()
+        assert sorted(summary['Label']) == ['compact', 'seisprov']
+        workspace.close()
+    finally:
+        shutil.rmtree(tdir)
+
+
 def test_workspace():
     eventid = 'us1000778i'
     datafiles, event = read_data_dir('geonet', eventid, '*.V1A')
@@ -420,6 +457,7 @@ def add_processing(config, keys):
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_stream_params()
+    test_seis_prov()
     test_workspace()
     test_metrics2()
     test_metrics()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+# stdlib imports
+import os
+import shutil
+import tempfile
+
+# third party imports
+import pkg_resources
+
+# local imports
+from gmprocess.event import ScalarEvent
+from gmprocess.streamcollection import StreamCollection
+from gmprocess.io.fetch_utils import plot_raw
+
+
+def test_plot_raw():
+    datapath = os.path.join('data', 'testdata', 'demo', 'ci38457511', 'raw')
+    datadir = pkg_resources.resource_filename('gmprocess', datapath)
+    sc = StreamCollection.from_directory(datadir)
+    event = ScalarEvent()
+    event.fromParams('ci38457511', '2019-07-06T03:19:53.040', 35.7695,
+                     -117.5993, 8.0, 7.1)
+
+    tdir = tempfile.mkdtemp()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        plot_raw(tdir, sc, event, processes=2, cache_dir=cache_dir)
+        pngfiles = sorted(os.listdir(tdir))
+        assert pngfiles == sorted(['%s.png' % st.get_id() for st in sc])
+
+        # Serial rendering gives the same files
+        shutil.rmtree(tdir)
+        os.makedirs(tdir)
+        plot_raw(tdir, sc, event, processes=1, cache_dir=cache_dir)
+        assert sorted(os.listdir(tdir)) == pngfiles
+
+        # The travel time grid is cached in the given directory
+        assert sorted(os.listdir(cache_dir)) == ['iasp91_5_0.1.npz']
+    finally:
+        shutil.rmtree(tdir)
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    os.environ['CALLED_FROM_PYTEST'] = 'True'
+    test_plot_raw()
@@ -1,8 +1,15 @@
 #!/usr/bin/env python
 
-from gmprocess.io.global_fetcher import fetch_data
+from gmprocess.io import global_fetcher
+from gmprocess.io.global_fetcher import fetch_data, find_fetchers
+from gmprocess.io.fetcher import DataFetcher
+from gmprocess.io.read import read_data
+from gmprocess.io.test_utils import read_data_dir
+from gmprocess.streamcollection import StreamCollection
 from datetime import datetime
 import os
+import threading
+import time
 
 
 def geonet():
@@ -61,8 +68,96 @@ def fdsn():
     assert len(stream_collection) == 15
 
 
+class _TestFetcher(DataFetcher):
+    # Fetcher that retrieves a stream from the test data after a delay
+    DELAY = 0.0
+    FILE = None
+
+    def __init__(self, time, lat, lon, depth, magnitude, config=None,
+                 rawdir=None, drop_non_free=True):
+        self.BOUNDS = [-180, 180, -90, 90]
+
+    def getMatchingEvents(self, solve=True):
+        return [{}]
+
+    def retrieveData(self, event):
+        time.sleep(self.DELAY)
+        return StreamCollection(read_data(self.FILE))
+
+
+_RELEASE = threading.Event()
+_HUNG_THREADS = []
+
+
+def test_concurrent_fetchers():
+    datafiles, _ = read_data_dir('knet', 'us2000cnnl')
+    datafiles = sorted(datafiles)
+
+    class SlowFetcher1(_TestFetcher):
+        DELAY = 0.5
+        FILE = datafiles[0]
+
+    class SlowFetcher2(_TestFetcher):
+        DELAY = 0.5
+        FILE = datafiles[3]
+
+    class FailingFetcher(_TestFetcher):
+        def retrieveData(self, event):
+            raise Exception('Service unavailable')
+
+    class HangingFetcher(_TestFetcher):
+        def retrieveData(self, event):
+            _HUNG_THREADS.append(threading.current_thread())
+            _RELEASE.wait(30)
+            return StreamCollection(read_data(datafiles[6]))
+
+    class DistantFetcher(_TestFetcher):
+        def __init__(self, *args, **kwargs):
+            self.BOUNDS = [0, 10, 0, 10]
+
+        def retrieveData(self, event):
+            raise Exception('Should not be called')
+
+    # The registry is only built once
+    registry = find_fetchers(0.0, 0.0)
+    assert global_fetcher._FETCHERS is not None
+    assert find_fetchers(0.0, 0.0) == registry
+
+    fetchers = [SlowFetcher1, SlowFetcher2, FailingFetcher, HangingFetcher,
+                DistantFetcher]
+    global_fetcher._FETCHERS = {f.__name__: f for f in fetchers}
+    config = {'fetchers': {'HangingFetcher': {'timeout': 1.5}}}
+    try:
+        start = time.time()
+        streams, errors = fetch_data(
+            datetime(2018, 1, 24, 10, 51, 0), 40.0, 142.0, 10.0, 6.2,
+            config=config)
+        elapsed = time.time() - start
+    finally:
+        _RELEASE.set()
+        global_fetcher._FETCHERS = registry
+
+    # The fetchers run concurrently and the one that hangs is skipped once
+    # its timeout has passed.
+    assert elapsed < 2.5
+    assert len(streams) == 2
+    stations = sorted(st[0].stats.station for st in streams)
+    assert stations == sorted(
+        st[0].stats.station for f in [datafiles[0], datafiles[3]]
+        for st in read_data(f))
+    assert len(errors) == 2
+    assert 'FailingFetcher' in errors[0]
+    assert 'Service unavailable' in errors[0]
+    assert 'HangingFetcher' in errors[1]
+
+    # The fetcher that hangs does not keep the interpreter from exiting
+    assert len(_HUNG_THREADS) == 1
+    assert _HUNG_THREADS[0].daemon
+
+
 if __name__ == '__main__':
     # os.environ['CALLED_FROM_PYTEST'] = 'True'
+    test_concurrent_fetchers()
     fdsn()
     knet()
     turkey()
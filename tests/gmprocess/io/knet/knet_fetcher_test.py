@@ -1,9 +1,17 @@
 #!/usr/bin/env python
 
 import sys
-from gmprocess.io.knet.knet_fetcher import KNETFetcher, JST_OFFSET
+import io
+import shutil
+import tarfile
+import tempfile
+from gmprocess.io.knet.knet_fetcher import (KNETFetcher, JST_OFFSET,
+                                            read_archive)
+from gmprocess.io.knet.core import read_knet
+from gmprocess.io.test_utils import read_data_dir
 from datetime import datetime, timedelta
 import os.path
+import numpy as np
 
 
 def fetcher_test(user, passwd):
@@ -35,7 +43,69 @@ def fetcher_test(user, passwd):
     assert len(stream_collection) == 78
 
 
+class _Unseekable(io.RawIOBase):
+    # Download stream, which can only be read sequentially
+    def __init__(self, data):
+        self.buffer = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self.buffer.readinto(b)
+
+
+def _make_archive(knet_files, kiknet_files):
+    # Archive with the layout of the NIED downloads
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w') as tar:
+        for name, files in [('20180124195100.knt.tar.gz', knet_files),
+                            ('20180124195100.kik.tar.gz', kiknet_files)]:
+            tarball = io.BytesIO()
+            with tarfile.open(fileobj=tarball, mode='w:gz') as subtar:
+                for dfile in files:
+                    subtar.add(dfile, arcname=os.path.basename(dfile))
+            info = tarfile.TarInfo(name)
+            info.size = tarball.tell()
+            tarball.seek(0)
+            tar.addfile(info, tarball)
+        info = tarfile.TarInfo('20180124195100.img.png')
+        info.size = 3
+        tar.addfile(info, io.BytesIO(b'png'))
+    return archive.getvalue()
+
+
+def test_read_archive():
+    knet_files, _ = read_data_dir('knet', 'us2000cnnl')
+    kiknet_files, _ = read_data_dir('kiknet', 'usp000a1b0')
+    knet_files = sorted(knet_files)[:6]
+    kiknet_files = sorted(f for f in kiknet_files if '.json' not in f)
+    archive = _make_archive(knet_files, kiknet_files)
+
+    streams = read_archive(_Unseekable(archive))
+    assert len(streams) == len(knet_files) + len(kiknet_files)
+    for stream, dfile in zip(streams, knet_files + kiknet_files):
+        expected = read_knet(dfile)[0]
+        np.testing.assert_array_equal(stream[0].data, expected[0].data)
+        assert stream[0].stats == expected[0].stats
+
+    tdir = tempfile.mkdtemp()
+    try:
+        streams = read_archive(_Unseekable(archive), rawdir=tdir)
+        assert len(streams) == len(knet_files) + len(kiknet_files)
+        assert sorted(os.listdir(tdir)) == ['kiknet', 'knet']
+        for subdir, files in [('knet', knet_files),
+                              ('kiknet', kiknet_files)]:
+            for dfile in files:
+                saved = os.path.join(tdir, subdir, os.path.basename(dfile))
+                with open(saved, 'rb') as f1, open(dfile, 'rb') as f2:
+                    assert f1.read() == f2.read()
+    finally:
+        shutil.rmtree(tdir)
+
+
 if __name__ == '__main__':
+    test_read_archive()
     username = sys.argv[1]
     passwd = sys.argv[2]
     fetcher_test(username, passwd)
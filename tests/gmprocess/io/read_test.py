@@ -1,8 +1,12 @@
 #!/usr/bin/env python
 
 # stdlib imports
+import io
 import os
 
+# third party imports
+import numpy as np
+
 from gmprocess.io.read import read_data, _get_format, _validate_format
 from gmprocess.exception import GMProcessException
 from gmprocess.io.test_utils import read_data_dir
@@ -63,6 +67,49 @@ def test_read():
     assert success == False
 
 
+def test_read_buffer():
+    datafiles = [
+        ('bhrc', 'usp000jq5p', '5520-1.V1'),
+        ('cosmos', 'ci14155260', 'Cosmos12TimeSeriesTest.v1'),
+        ('cwb', 'us1000chhc', '1-EAS.dat'),
+        ('dmg', 'nc71734741', 'CE89146.V2'),
+        ('esm', 'us60004wsq', 'HI.ARS1..HNE.D.20190728.160908.C.ACC.ASC'),
+        ('geonet', 'us1000778i', '20161113_110259_WTMC_20.V1A'),
+        ('knet', 'us2000cnnl', 'AOM0011801241951.EW'),
+        ('nsmn', 'us20009ynd', '20170720223109_0921.txt'),
+        ('smc', 'nc216859', '0111a.smc'),
+    ]
+    for file_format, eventid, fname in datafiles:
+        datafile = read_data_dir(file_format, eventid, fname)[0][0]
+        stream = read_data(datafile)[0]
+        with open(datafile, 'rb') as f:
+            contents = f.read()
+
+        # The same records are read from the contents of the file, whether
+        # they are given as bytes or as a file object
+        for source in [contents, memoryview(contents), io.BytesIO(contents)]:
+            assert _get_format(source) == file_format
+            buffer_stream = read_data(source)[0]
+            assert len(buffer_stream) == len(stream)
+            for trace, buffer_trace in zip(stream, buffer_stream):
+                assert trace.get_id() == buffer_trace.get_id()
+                assert trace.stats.starttime == buffer_trace.stats.starttime
+                np.testing.assert_array_equal(trace.data, buffer_trace.data)
+                standard = buffer_trace.stats.standard
+                assert (standard['source_format'] ==
+                        trace.stats.standard['source_format'])
+                assert standard['source_file'] == ''
+
+    # Buffers that are not strong motion data are rejected
+    try:
+        read_data(b'not strong motion data')
+        success = True
+    except GMProcessException:
+        success = False
+    assert success == False
+
+
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_read()
+    test_read_buffer()
@@ -16,15 +16,14 @@ from gmprocess.metrics.station_summary import StationSummary
 from gmprocess.metrics.exception import PGMException
 from gmprocess.stationstream import StationStream
 from gmprocess.stationtrace import StationTrace
+from gmprocess.metrics.reduction.arias import arias_intensity
 
 
 ddir = os.path.join('data', 'testdata', 'fdsnfetch')
 datadir = pkg_resources.resource_filename('gmprocess', ddir)
 
 
-def test_radial_transverse():
-
-    origin = Origin(latitude=47.149, longitude=-122.7266667)
+def _get_stream():
     st = read(os.path.join(datadir, 'resp_cor', 'UW.ALCT.--.*.MSEED'))
 
     st[0].stats.standard = {}
@@ -60,15 +59,10 @@ def test_radial_transverse():
                                      'units_type': 'acc',
                                      'instrument_sensitivity': np.nan,
                                      'instrument_damping': np.nan})
-    baz = gps2dist_azimuth(stalat, stalon,
-                           origin.latitude, origin.longitude)[1]
+    return st, inv
 
-    st1 = st.copy()
-    st1[0].stats.channel = st1[0].stats.channel[:-1] + 'N'
-    st1[1].stats.channel = st1[1].stats.channel[:-1] + 'E'
-    st1.rotate(method='NE->RT', back_azimuth=baz)
-    pgms = np.abs(st1.max())
 
+def _get_station_stream(st):
     st2 = StationStream([])
     for t in st:
         st2.append(StationTrace(t.data, t.stats))
@@ -76,6 +70,25 @@ def test_radial_transverse():
     for tr in st2:
         response = {'input_units': 'counts', 'output_units': 'cm/s^2'}
         tr.setProvenance('remove_response', response)
+    return st2
+
+
+def test_radial_transverse():
+
+    origin = Origin(latitude=47.149, longitude=-122.7266667)
+    st, inv = _get_stream()
+    stalat = st[0].stats.coordinates.latitude
+    stalon = st[0].stats.coordinates.longitude
+    baz = gps2dist_azimuth(stalat, stalon,
+                           origin.latitude, origin.longitude)[1]
+
+    st1 = st.copy()
+    st1[0].stats.channel = st1[0].stats.channel[:-1] + 'N'
+    st1[1].stats.channel = st1[1].stats.channel[:-1] + 'E'
+    st1.rotate(method='NE->RT', back_azimuth=baz)
+    pgms = np.abs(st1.max())
+
+    st2 = _get_station_stream(st)
 
     summary = StationSummary.from_stream(
         st2, ['radial_transverse'], ['pga'], origin)
@@ -149,5 +162,29 @@ def test_radial_transverse():
     assert np.isnan(pgms.loc['PGA', 'HNT'].Result)
 
 
+def test_radial_transverse_cached():
+    # The rotated traces are copies of the horizontal traces with new data,
+    # so the Arias intensity cached on the horizontals must not be reused
+    origin = Origin(latitude=47.149, longitude=-122.7266667)
+    st, _ = _get_stream()
+    imts = ['arias', 'duration']
+    target = StationSummary.from_stream(
+        _get_station_stream(st), ['radial_transverse'], imts, origin).pgms
+
+    st2 = _get_station_stream(st)
+    for tr in st2:
+        arias_intensity(tr)
+    pgms = StationSummary.from_stream(
+        st2, ['radial_transverse'], imts, origin).pgms
+    for imt in ['ARIAS', 'DURATION']:
+        for imc in ['HNR', 'HNT']:
+            np.testing.assert_allclose(pgms.loc[imt, imc].Result,
+                                       target.loc[imt, imc].Result)
+    assert (pgms.loc['ARIAS', 'HNR'].Result !=
+            pgms.loc['ARIAS', 'HNT'].Result)
+
+
 if __name__ == '__main__':
+    os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_radial_transverse()
+    test_radial_transverse_cached()
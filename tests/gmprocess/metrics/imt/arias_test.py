@@ -3,6 +3,8 @@
 # stdlib imports
 import os.path
 import json
+import shutil
+import tempfile
 
 # third party imports
 import numpy as np
@@ -10,10 +12,14 @@ import pkg_resources
 
 # local imports
 from gmprocess.io.read import read_data
+from gmprocess.io.asdf.stream_workspace import StreamWorkspace
 from gmprocess.io.test_utils import read_data_dir
 from gmprocess.metrics.station_summary import StationSummary
 from gmprocess.stationstream import StationStream
 from gmprocess.stationtrace import StationTrace
+from gmprocess.metrics.reduction.arias import (
+    Arias, ARIAS_CACHE, arias_intensity, arias_duration)
+from gmprocess.metrics.reduction.duration import Duration
 
 
 def test_arias():
@@ -87,5 +93,49 @@ def test_arias():
     assert stream.pgms.Result.tolist() == []
 
 
+def test_arias_cache():
+    data_files, event = read_data_dir('geonet', 'us1000778i',
+                                      '20161113_110259_WTMC_20.V1A')
+    stream = read_data(data_files[0])[0]
+    trace = stream[0]
+    assert not trace.hasCached(ARIAS_CACHE)
+
+    # The curve is cached and shared by the reductions
+    intensity = arias_intensity(trace)
+    assert intensity[0] == 0
+    assert len(intensity) == trace.stats.npts
+    assert trace.getCached(ARIAS_CACHE)['intensity'] is intensity
+    assert arias_intensity(trace) is intensity
+    channel = trace.stats.channel
+    assert Arias(stream).result[channel] == intensity[-1]
+    np.testing.assert_allclose(Duration(stream).result[channel],
+                               arias_duration(trace, 0.05, 0.95))
+    assert (arias_duration(trace, 0.05, 0.75)
+            < arias_duration(trace, 0.05, 0.95))
+
+    # The curve is recomputed after processing
+    trace.data = trace.data * 2
+    trace.setProvenance('detrend', {'detrending_method': 'demean'})
+    np.testing.assert_allclose(arias_intensity(trace), 4 * intensity)
+
+    # and it is saved with the workspace
+    intensity = arias_intensity(trace)
+    tdir = tempfile.mkdtemp()
+    try:
+        workspace = StreamWorkspace(os.path.join(tdir, 'test.hdf'))
+        workspace.addEvent(event)
+        workspace.addStreams(event, [stream], label='cache')
+        outstream = workspace.getStreams(event.id, labels=['cache'])[0]
+        workspace.close()
+        outtrace = outstream.select(channel=channel)[0]
+        cached = outtrace.getCached(ARIAS_CACHE)['intensity']
+        np.testing.assert_allclose(cached, intensity)
+        assert arias_intensity(outtrace) is cached
+    finally:
+        shutil.rmtree(tdir)
+
+
 if __name__ == '__main__':
+    os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_arias()
+    test_arias_cache()
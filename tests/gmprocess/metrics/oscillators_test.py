@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # stdlib imports
+import gc
 import os
 
 # third party imports
@@ -8,7 +9,9 @@ import numpy as np
 # local imports
 from gmprocess.constants import GAL_TO_PCTG
 from gmprocess.io.read import read_data
+from gmprocess.metrics import oscillators
 from gmprocess.metrics.oscillators import get_acceleration, get_spectral, get_velocity
+from gmprocess.metrics.oscillators import calculate_spectrals
 from gmprocess.io.test_utils import read_data_dir
 
 
@@ -42,6 +45,36 @@ def test_spectral():
     get_spectral(1.0, acc, 0.05)
 
 
+def test_upsampled_cache():
+    datafiles, _ = read_data_dir(
+        'geonet', 'us1000778i', '20161113_110259_WTMC_20.V2A')
+    acc_file = datafiles[0]
+    trace = read_data(acc_file)[0][0]
+
+    # Periods with the same resample factor share the upsampled data
+    for period in [0.02, 0.021, 0.015, 0.02]:
+        cached = calculate_spectrals(trace, period, 0.05)
+        uncached = calculate_spectrals(trace, period, 0.05, cache=False)
+        assert cached[3] > trace.stats.npts
+        for idx in range(3):
+            np.testing.assert_array_equal(cached[idx], uncached[idx])
+
+    # Changing the data invalidates the cache
+    trace.data = trace.data * 2
+    cached = calculate_spectrals(trace, 0.02, 0.05)
+    np.testing.assert_allclose(cached[0], 2 * uncached[0])
+    trace.data *= 0.5
+    cached = calculate_spectrals(trace, 0.02, 0.05)
+    np.testing.assert_allclose(cached[0], uncached[0])
+
+    # The cache does not keep the trace alive
+    key = id(trace)
+    assert key in oscillators._upsampled
+    del trace
+    gc.collect()
+    assert key not in oscillators._upsampled
+
+
 def test_velocity():
     datafiles, _ = read_data_dir(
         'geonet', 'us1000778i', '20161113_110259_WTMC_20.V2A')
@@ -55,4 +88,5 @@ def test_velocity():
 if __name__ == '__main__':
     test_acceleration()
     test_spectral()
+    test_upsampled_cache()
     test_velocity()
@@ -6,6 +6,7 @@ import numpy as np
 import pkg_resources
 
 # local imports
+from gmprocess.metrics.rotation import rotation
 from gmprocess.metrics.rotation.rotation import Rotation
 from gmprocess.metrics.station_summary import StationSummary
 from gmprocess.stationstream import StationStream
@@ -134,5 +135,28 @@ def test_rotation():
     assert success is False
 
 
+def test_rotated_maxima():
+    osc1 = np.genfromtxt(datadir + '/ALCTENE.UW..sac.acc.final.txt').T[1]
+    osc2 = np.genfromtxt(datadir + '/ALCTENN.UW..sac.acc.final.txt').T[1]
+    rotation_class = Rotation(StationStream([]))
+
+    rot = rotation_class.rotate(osc1, osc2, combine=True)
+    rot1, rot2 = rotation_class.rotate(osc1, osc2, combine=False)
+    block_size = rotation.ROTATION_BLOCK_SIZE
+    try:
+        # The whole record, blocks of angles, and blocks of samples
+        for size in [block_size, 10 * len(osc1), len(osc1) // 7]:
+            rotation.ROTATION_BLOCK_SIZE = size
+            maxima = rotation_class.rotated_maxima(osc1, osc2, combine=True)
+            np.testing.assert_array_equal(maxima, np.amax(np.abs(rot), 1))
+            max1, max2 = rotation_class.rotated_maxima(
+                osc1, osc2, combine=False, absolute=False)
+            np.testing.assert_array_equal(max1, np.amax(rot1, 1))
+            np.testing.assert_array_equal(max2, np.amax(rot2, 1))
+    finally:
+        rotation.ROTATION_BLOCK_SIZE = block_size
+
+
 if __name__ == '__main__':
     test_rotation()
+    test_rotated_maxima()
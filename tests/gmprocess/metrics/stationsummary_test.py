@@ -13,11 +13,15 @@ from obspy.core.event import Origin
 
 # local imports
 from gmprocess.io.geonet.core import read_geonet
-from gmprocess.metrics.station_summary import StationSummary
+from gmprocess.metrics.station_summary import (
+    StationSummary, compute_event_station_metrics)
 from gmprocess.io.test_utils import read_data_dir
 from gmprocess.streamcollection import StreamCollection
 from gmprocess.processing import process_streams
 from gmprocess.io.fetch_utils import read_event_json_files
+from gmprocess.io.fetch_utils import get_rupture_file
+from impactutils.rupture.factory import get_rupture
+from impactutils.rupture.origin import Origin as RuptureOrigin
 
 
 def cmp_dicts(adict, bdict):
@@ -172,6 +176,50 @@ def test_allow_nans():
     assert ~np.isnan(ss.pgms.Result).all()
 
 
+def test_event_station_metrics():
+    datafiles, event = read_data_dir('fdsn', 'ci38457511', '*')
+    datadir = os.path.split(datafiles[0])[0]
+    stream = StreamCollection.from_directory(datadir)[0]
+    origin = RuptureOrigin({
+        'id': event.id, 'netid': '', 'network': '',
+        'lat': event.latitude, 'lon': event.longitude,
+        'depth': event.depth_km, 'locstring': '',
+        'mag': event.magnitude, 'time': event.time})
+    quad_rupture = get_rupture(origin, get_rupture_file(datadir))
+    point_rupture = get_rupture(origin)
+
+    # Move the station around the rupture
+    streams = []
+    offsets = [(0.0, 0.0), (0.3, -0.2), (-0.4, 0.1), (0.05, 0.5)]
+    for dlat, dlon in offsets:
+        st = stream.copy()
+        for tr, tr0 in zip(st, stream):
+            coords = tr0.stats.coordinates
+            tr.stats.coordinates = {
+                'latitude': coords['latitude'] + dlat,
+                'longitude': coords['longitude'] + dlon,
+                'elevation': coords['elevation']}
+        streams.append(st)
+
+    # Metrics for all stations at once are the same as for each station
+    for rupture in [quad_rupture, point_rupture]:
+        summaries = [StationSummary.from_config(
+            st, event=event, calc_waveform_metrics=False,
+            calc_station_metrics=False) for st in streams]
+        compute_event_station_metrics(summaries, event=event,
+                                      rupture=rupture)
+        for st, summary in zip(streams, summaries):
+            target = StationSummary.from_config(
+                st, event=event, calc_waveform_metrics=False,
+                rupture=rupture)
+            assert summary.distances.keys() == target.distances.keys()
+            for key, value in target.distances.items():
+                np.testing.assert_allclose(summary.distances[key], value)
+            np.testing.assert_allclose(summary._back_azimuth,
+                                       target._back_azimuth)
+
+
 if __name__ == '__main__':
     test_stationsummary()
     test_allow_nans()
+    test_event_station_metrics()
@@ -15,6 +15,8 @@ from gmprocess.processing import process_streams
 from gmprocess.logging import setup_logger
 from gmprocess.io.test_utils import read_data_dir
 from gmprocess.config import get_config, update_dict
+from gmprocess.nn_quality_assurance import (
+    loadModel, preprocessQualityMetrics, getClassificationMetrics)
 
 # homedir = os.path.dirname(os.path.abspath(__file__))
 # datadir = os.path.join(homedir, '..', 'data', 'testdata')
@@ -58,6 +60,63 @@ def test_nnet():
         nnet_dict['score_HQ'], 0.99321798811740059, rtol=1e-3)
 
 
+def test_nnet_batch():
+    # The model is only loaded once
+    assert loadModel('CantWell') is loadModel('CantWell')
+    assert loadModel('Cant') is not loadModel('CantWell')
+
+    # Quality metrics of several records are evaluated at once, with the
+    # same result as one record at a time
+    np.random.seed(1)
+    qm = np.random.uniform(0.5, 2.0, size=(5, 20))
+    for model_name in ['Cant', 'CantWell']:
+        NN = loadModel(model_name)
+        scores = NN.useNN(preprocessQualityMetrics(qm, model_name))
+        assert scores.shape == (5, 2)
+        for i in range(len(qm)):
+            score = NN.useNN(preprocessQualityMetrics(
+                list(qm[i]), model_name))[0]
+            np.testing.assert_allclose(scores[i], score)
+
+
+def test_classification_metrics():
+    # Synthetic record: a noisy pre-event window followed by a decaying
+    # sinusoid on each horizontal component
+    np.random.seed(2)
+    dt = 0.01
+    t = np.arange(6000) * dt
+    freq = np.linspace(0.05, 30, 300)
+    tr = {'snr1_freq': freq, 'smooth_ft1_freq': freq}
+    for i, f0 in [(1, 1.0), (2, 1.5)]:
+        acc = 0.01 * np.random.randn(len(t))
+        acc[1000:] += 100 * np.sin(2 * np.pi * f0 * t[1000:]) * \
+            np.exp(-0.1 * t[:5000])
+        tr['acc_comp%i' % i] = acc
+        tr['smooth_ft%i' % i] = 1.0 / (1.0 + (freq / f0)**2)
+        tr['smooth_ft%i_pe' % i] = 0.01 * np.ones_like(freq)
+    qm = getClassificationMetrics(tr, 10.0, dt)
+    assert len(qm) == 20
+
+    # Compare some of the metrics with straightforward computations
+    abs_acc = [np.abs(tr['acc_comp%i' % i]) for i in [1, 2]]
+    pga = [np.max(a) for a in abs_acc]
+    pn = [np.max(a[:1000]) for a in abs_acc]
+    np.testing.assert_allclose(qm[16], np.sqrt(pn[0] * pn[1] /
+                                               (pga[0] * pga[1])))
+    brackets = []
+    for fraction in [0.1, 0.2]:
+        durations = []
+        for a, p in zip(abs_acc, pga):
+            idx = [i for i, x in enumerate(a) if x >= fraction * p]
+            durations.append((max(idx) - min(idx)) * dt)
+        brackets.append(np.sqrt(durations[0] * durations[1]))
+    np.testing.assert_allclose(qm[17], brackets[0] / brackets[1])
+    snr = np.sqrt(tr['smooth_ft1'] * tr['smooth_ft2']) / 0.01
+    np.testing.assert_allclose(qm[3], np.max(snr))
+
+
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_nnet()
+    test_nnet_batch()
+    test_classification_metrics()
@@ -2,7 +2,8 @@
 from gmprocess.phase import (PowerPicker, pphase_pick, pick_ar,
                              pick_kalkan, pick_power, pick_baer,
                              pick_yeck, pick_travel,
-                             create_travel_time_dataframe)
+                             create_travel_time_dataframe,
+                             get_travel_time_grid)
 from gmprocess.io.read import read_data
 from gmprocess.io.test_utils import read_data_dir
 from gmprocess.exception import GMProcessException
@@ -18,6 +19,9 @@ import numpy as np
 import os
 import pkg_resources
 import pandas as pd
+import tempfile
+import shutil
+import obspy.taup
 
 
 def test_p_pick():
@@ -159,12 +163,16 @@ def test_get_travel_time_df():
         os.path.join(datadir, 'ci38461735'))
     scs = [sc1, sc2]
 
-    df1, catalog = create_travel_time_dataframe(
-        sc1, os.path.join(datadir, 'catalog_test_traveltimes.csv'),
-        5, 0.1, 'iasp91')
-    df2, catalog = create_travel_time_dataframe(
-        sc2, os.path.join(datadir, 'catalog_test_traveltimes.csv'),
-        5, 0.1, 'iasp91')
+    cache_dir = tempfile.mkdtemp()
+    try:
+        df1, catalog = create_travel_time_dataframe(
+            sc1, os.path.join(datadir, 'catalog_test_traveltimes.csv'),
+            5, 0.1, 'iasp91', cache_dir=cache_dir)
+        df2, catalog = create_travel_time_dataframe(
+            sc2, os.path.join(datadir, 'catalog_test_traveltimes.csv'),
+            5, 0.1, 'iasp91', cache_dir=cache_dir)
+    finally:
+        shutil.rmtree(cache_dir)
 
     model = TauPyModel('iasp91')
     for dfidx, df in enumerate([df1, df2]):
@@ -182,7 +190,72 @@ def test_get_travel_time_df():
                 travel_time = model.get_travel_times(
                     depth, dist, ['p', 'P', 'Pn'])[0].time
                 abs_time = event.time + travel_time
-                np.testing.assert_almost_equal(abs_time, time, decimal=1)
+                np.testing.assert_almost_equal(
+                    abs_time.timestamp, time, decimal=1)
+
+
+def test_travel_time_grid():
+    cache_dir = tempfile.mkdtemp()
+    try:
+        depths, dists, times = get_travel_time_grid(
+            'iasp91', 5, 0.5, 12, 2, cache_dir=cache_dir, processes=1)
+        np.testing.assert_allclose(depths, [0, 5, 10, 15, 20, 25])
+        np.testing.assert_allclose(dists, np.arange(7) * 0.5)
+        assert os.path.isfile(os.path.join(cache_dir, 'iasp91_5_0.5.npz'))
+
+        model = TauPyModel('iasp91')
+        arrival = model.get_travel_times(10, 1.5, ['p', 'P', 'Pn'])[0]
+        np.testing.assert_allclose(times[2, 3], arrival.time)
+
+        # A smaller grid is read from the cache
+        depths2, dists2, times2 = get_travel_time_grid(
+            'iasp91', 5, 0.5, 5, 1, cache_dir=cache_dir, processes=1)
+        np.testing.assert_array_equal(times2, times)
+
+        # A larger grid extends the cached one, computed in parallel
+        depths3, dists3, times3 = get_travel_time_grid(
+            'iasp91', 5, 0.5, 12, 3, cache_dir=cache_dir, processes=2)
+        assert times3.shape == (6, 9)
+        np.testing.assert_allclose(times3[:, :7], times)
+
+        # A cached grid that cannot be read is recomputed and replaced
+        cache_file = os.path.join(cache_dir, 'iasp91_5_0.5.npz')
+        with open(cache_file, 'wb') as f:
+            f.write(b'PK\x03\x04 truncated')
+        depths4, dists4, times4 = get_travel_time_grid(
+            'iasp91', 5, 0.5, 12, 2, cache_dir=cache_dir, processes=1)
+        np.testing.assert_allclose(times4, times)
+        assert sorted(os.listdir(cache_dir)) == ['iasp91_5_0.5.npz']
+        with np.load(cache_file) as cached:
+            np.testing.assert_allclose(cached['times'], times)
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_travel_time_grid_model_files():
+    cache_dir = tempfile.mkdtemp()
+    model_dir = tempfile.mkdtemp()
+    try:
+        # Different model files with the same name are cached separately
+        taup_data = os.path.join(os.path.dirname(obspy.taup.__file__), 'data')
+        times = []
+        for name in ['iasp91', 'prem']:
+            os.makedirs(os.path.join(model_dir, name))
+            model_file = os.path.join(model_dir, name, 'custom.npz')
+            shutil.copy(os.path.join(taup_data, '%s.npz' % name), model_file)
+            times.append(get_travel_time_grid(
+                model_file, 5, 0.5, 12, 2, cache_dir=cache_dir,
+                processes=1)[2])
+            expected = get_travel_time_grid(
+                name, 5, 0.5, 12, 2, cache_dir=cache_dir, processes=1)[2]
+            np.testing.assert_allclose(times[-1], expected)
+        assert not np.allclose(times[0], times[1])
+        cache_files = [f for f in os.listdir(cache_dir)
+                       if f.startswith('custom_')]
+        assert len(cache_files) == 2
+    finally:
+        shutil.rmtree(cache_dir)
+        shutil.rmtree(model_dir)
 
 
 if __name__ == '__main__':
@@ -192,3 +265,5 @@ if __name__ == '__main__':
     test_p_pick()
     test_travel_time()
     test_get_travel_time_df()
+    test_travel_time_grid()
+    test_travel_time_grid_model_files()
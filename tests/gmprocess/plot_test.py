@@ -7,9 +7,14 @@ import tempfile
 import shutil
 
 # third party imports
+import numpy as np
 from gmprocess.io.read import read_data
 from gmprocess.plot import (plot_arias, plot_durations,
-                            plot_moveout, plot_regression)
+                            plot_moveout, plot_regression, decimate_minmax,
+                            plot_summaries)
+from gmprocess.benchmark import (synthetic_event, synthetic_streams,
+                                 benchmark_config)
+from gmprocess.processing import process_streams
 import pandas as pd
 from gmprocess.io.test_utils import read_data_dir
 import pkg_resources
@@ -83,7 +88,52 @@ def test_plot():
                  normalize=True, factor=0.1)
 
 
+def test_decimate_minmax():
+    datafiles, _ = read_data_dir('cwb', 'us1000chhc')
+    trace = read_data(datafiles[0])[0][0]
+    times = trace.times()
+    x, y = decimate_minmax(times, trace.data, nbins=500)
+    assert len(x) == len(y) == 1000
+    assert np.all(np.diff(x) >= 0)
+
+    # The envelope of each bin is kept
+    starts = np.linspace(0, len(times), 501).astype(int)
+    for i in [0, 100, 499]:
+        chunk = trace.data[starts[i]:starts[i + 1]]
+        np.testing.assert_array_equal(
+            np.sort(y[2 * i:2 * i + 2]), [chunk.min(), chunk.max()])
+
+    # Short records are not decimated
+    x, y = decimate_minmax(times[:1000], trace.data[:1000], nbins=500)
+    assert len(y) == 1000
+
+
+def test_plot_summaries():
+    event = synthetic_event()
+    sc = synthetic_streams(event, stations=2, npts=6000, sampling_rate=50.0)
+    sc = process_streams(
+        sc, event, config=benchmark_config(periods=3, imcs=['channels']))
+
+    tdir = tempfile.mkdtemp()
+    called_from_pytest = os.environ.pop('CALLED_FROM_PYTEST', None)
+    try:
+        for processes in [1, 2]:
+            plot_dir = os.path.join(tdir, 'plots%i' % processes)
+            files = plot_summaries(sc, plot_dir, event, processes=processes)
+            assert files == [
+                os.path.join(plot_dir, 'synthetic_%s.png' % st.get_id())
+                for st in sc]
+            for filename in files:
+                assert os.path.isfile(filename)
+    finally:
+        if called_from_pytest is not None:
+            os.environ['CALLED_FROM_PYTEST'] = called_from_pytest
+        shutil.rmtree(tdir)
+
+
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_regression()
     test_plot()
+    test_decimate_minmax()
+    test_plot_summaries()
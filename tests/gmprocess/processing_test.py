@@ -7,11 +7,18 @@ import logging
 # third party imports
 import numpy as np
 import pkg_resources
+import obspy
+from obspy import read_inventory
+from scipy.integrate import cumtrapz
+from scipy.optimize import curve_fit
 
 # local imports
 from gmprocess.streamcollection import StreamCollection
 from gmprocess.io.read import read_data
-from gmprocess.processing import process_streams
+from gmprocess import processing
+from gmprocess.processing import process_streams, remove_response, detrend
+from gmprocess.stationtrace import StationTrace
+from gmprocess.stationstream import StationStream
 from gmprocess.logging import setup_logger
 from gmprocess.io.test_utils import read_data_dir
 from gmprocess.io.fetch_utils import update_config
@@ -85,7 +92,77 @@ def test_free_field():
             assert reason == 'Failed free field sensor check.'
 
 
+def test_remove_response_cache():
+    # Obspy example data; all three channels share the same response chain
+    inv = read_inventory().select(station='RJOB')
+    raw = obspy.read()
+    traces = []
+    for tr in raw:
+        header = {key: tr.stats[key] for key in
+                  ['network', 'station', 'location', 'channel',
+                   'starttime', 'sampling_rate']}
+        traces.append(StationTrace(data=tr.data.astype(float),
+                                   header=header, inventory=inv))
+    st = StationStream(traces, inventory=inv)
+
+    processing._RESPONSE_CACHE.clear()
+    pre_filt = (0.1, 0.2, 45.0, 50.0)
+    st = remove_response(st, *pre_filt, water_level=60)
+    assert len(processing._RESPONSE_CACHE) == 1
+
+    raw.remove_response(inventory=inv, output='ACC', water_level=60,
+                        pre_filt=pre_filt)
+    for tr, rawtr in zip(st, raw):
+        assert tr.stats.standard.units == 'acc'
+        np.testing.assert_allclose(
+            tr.data, rawtr.data * processing.M_TO_CM, rtol=0,
+            atol=1e-10 * np.max(np.abs(tr.data)))
+
+    # Least recently used responses are evicted
+    cache_size = processing.RESPONSE_CACHE_SIZE
+    try:
+        processing.RESPONSE_CACHE_SIZE = 2
+        response = raw[0]._get_response(inv)
+        for water_level in [10, 20, 30]:
+            processing._get_inverse_response(
+                response, 0.01, 4096, 'ACC', water_level, None)
+        keys = list(processing._RESPONSE_CACHE.keys())
+        assert [key[4] for key in keys] == [20, 30]
+    finally:
+        processing.RESPONSE_CACHE_SIZE = cache_size
+
+
+def test_detrend_baseline():
+    data_files, origin = read_data_dir('geonet', 'us1000778i', '*.V1A')
+    st = read_data(data_files[0])[0]
+    st.detrend('demean')
+    raw = st.copy()
+    st = detrend(st, 'baseline_sixth_order')
+
+    def poly(x, a, b, c, d, e):
+        return a * x**6 + b * x**5 + c * x**4 + d * x**3 + e * x**2
+
+    for tr, rawtr in zip(st, raw):
+        # Same coefficients as a nonlinear fit of the polynomial
+        dt = rawtr.stats.delta
+        disp = cumtrapz(cumtrapz(rawtr.data, dx=dt, initial=0),
+                        dx=dt, initial=0)
+        x = np.arange(rawtr.stats.npts, dtype=float)
+        target = curve_fit(poly, x, disp)[0]
+        cofs = tr.getParameter('baseline')['polynomial_coefs']
+        assert len(cofs) == 7
+        assert cofs[-2:] == [0, 0]
+        np.testing.assert_allclose(cofs[:5], target, rtol=1e-5)
+
+        second_derivative = np.polyder(np.poly1d(cofs), 2)(x)
+        np.testing.assert_allclose(tr.data, rawtr.data - second_derivative)
+        assert tr.getProvenance('detrend')[0]['detrending_method'] == \
+            'baseline_sixth_order'
+
+
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_process_streams()
     test_free_field()
+    test_remove_response_cache()
+    test_detrend_baseline()
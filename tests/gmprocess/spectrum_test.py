@@ -53,6 +53,32 @@ def test_spectrum():
     np.testing.assert_allclose(mod[-1], 0.0032295, atol=1e-5)
 
 
+def test_log_spectrum_misfit():
+    freq = np.logspace(-2, 2, 101)
+    moment = spectrum.moment_from_magnitude(6.7)
+    obs_spec = spectrum.model((moment, 150), freq, 10, kappa=0.035)
+    obs_spec *= np.exp(0.2 * np.sin(freq))
+    x = np.array([np.log(moment) + 0.5, np.log(50.0)])
+
+    # Same cost as spectrum_cost for the frequencies that are kept
+    cost = spectrum.spectrum_cost(x, freq, obs_spec, 0.1, 20.0, 10, 0.035,
+                                  0.55)
+    keep = (freq >= 0.1) & (freq <= 20.0)
+    fixed_spec = spectrum.fixed_model(freq, 10, 0.035)
+    log_target = np.log(obs_spec[keep]) - np.log(fixed_spec[keep])
+    misfit, grad = spectrum.log_spectrum_misfit(x, freq[keep], log_target)
+    np.testing.assert_allclose(misfit, cost, rtol=1e-10)
+
+    # Analytic gradient matches finite differences
+    step = 1e-6
+    for i in range(len(x)):
+        dx = np.zeros_like(x)
+        dx[i] = step
+        fd = (spectrum.log_spectrum_misfit(x + dx, freq[keep], log_target)[0] -
+              spectrum.log_spectrum_misfit(x - dx, freq[keep], log_target)[0])
+        np.testing.assert_allclose(grad[i], fd / (2 * step), rtol=1e-6)
+
+
 def test_fff():
     mags = np.linspace(3, 8, 51)
     h = [spectrum.finite_fault_factor(m) for m in mags]
@@ -65,4 +91,5 @@ if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_fit_spectra()
     test_spectrum()
+    test_log_spectrum_misfit()
     test_fff()
@@ -34,6 +34,39 @@ def test_trace():
     assert invtrace.getParameter('metadata') == {'name': 'Fred'}
 
 
+def test_provenance_json():
+    data = np.random.rand(1000)
+    header = {'sampling_rate': 1,
+              'npts': len(data),
+              'network': 'US',
+              'location': '11',
+              'station': 'ABCD',
+              'channel': 'HN1',
+              'starttime': UTCDateTime(2010, 1, 1, 0, 0, 0)}
+    inventory = get_inventory()
+    trace = StationTrace(data=data, header=header, inventory=inventory)
+    assert trace.stats.standard.units == 'raw counts'
+    trace.setProvenance('remove_response', {'input_units': 'counts',
+                                            'output_units': 'cm/s^2'})
+    assert trace.stats.standard.units == 'acc'
+    trace.setProvenance('cut', {
+        'new_start_time': UTCDateTime(2010, 1, 1, 0, 0, 1, 250000),
+        'new_end_time': UTCDateTime(2010, 1, 1, 0, 10, 0)})
+    trace.setProvenance('highpass_filter', {
+        'filter_type': 'Butterworth',
+        'filter_order': np.int64(5),
+        'number_of_passes': 2,
+        'corner_frequency': np.float32(0.125)})
+
+    newtrace = StationTrace(data=data, header=header, inventory=inventory)
+    newtrace.setProvenanceJSON(trace.getProvenanceJSON())
+    assert newtrace.getAllProvenance() == trace.getAllProvenance()
+    assert isinstance(
+        newtrace.getProvenance('cut')[0]['new_start_time'], UTCDateTime)
+    assert newtrace.stats.standard.units == 'acc'
+
+
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_trace()
+    test_provenance_json()
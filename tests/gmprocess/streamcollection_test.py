@@ -204,6 +204,26 @@ def test_duplicates():
     assert sc.select(station='23837')[0][0].stats.network == 'CE'
 
 
+def test_duplicates_from_other_stations():
+    datapath = os.path.join('data', 'testdata', 'duplicate_records')
+    datadir = pkg_resources.resource_filename('gmprocess', datapath)
+    streams = directory_to_streams(datadir)[0]
+    datapath = os.path.join('data', 'testdata', 'colocated_instruments')
+    datadir = pkg_resources.resource_filename('gmprocess', datapath)
+    other_streams = directory_to_streams(datadir)[0]
+
+    # Duplicates are still found among traces from many other stations, and
+    # adding the same records twice does not change the result
+    sc = StreamCollection(streams=streams + other_streams,
+                          handle_duplicates=True)
+    sc_twice = StreamCollection(
+        streams=streams + other_streams + [st.copy() for st in streams],
+        handle_duplicates=True)
+    assert len(sc) == len(sc_twice) == 12
+    assert [st.get_id() for st in sc] == [st.get_id() for st in sc_twice]
+    assert sc.select(station='23837')[0][0].stats.network == 'CE'
+
+
 def test_get_status():
     dpath = os.path.join('data', 'testdata', 'status')
     directory = pkg_resources.resource_filename('gmprocess', dpath)
@@ -237,8 +257,48 @@ def test_get_status():
     assert net.at['PG', 'number failed'] == 1
 
 
+def test_grouping_and_select():
+    dpath = os.path.join('data', 'testdata', 'colocated_instruments')
+    directory = pkg_resources.resource_filename('gmprocess', dpath)
+    streams, _, _ = directory_to_streams(directory)
+
+    # Streams are regrouped in order of first appearance of each
+    # network/station/instrument
+    traces = [tr for st in streams for tr in st]
+    sc = StreamCollection([st.copy() for st in streams[::-1]],
+                          handle_duplicates=False)
+    first_seen = []
+    for tr in traces[::-1]:
+        sid = '%s.%s.%s' % (tr.stats.network, tr.stats.station,
+                            tr.stats.channel[0:2])
+        if sid not in first_seen:
+            first_seen.append(sid)
+    assert [st.get_id() for st in sc] == first_seen
+    assert len(sc) == 11
+
+    # Index lookups give the same result as wildcard scans
+    for st in sc:
+        net, sta = st.get_net_sta().split('.')
+        sel = sc.select(network=net.lower(), station=sta)
+        sel_wild = sc.select(network=net + '*', station=sta + '*')
+        assert [s.get_id() for s in sel] == \
+            [s.get_id() for s in sel_wild if s.get_net_sta() == net + '.' + sta]
+        assert st.get_id() in [s.get_id() for s in sel]
+        sel = sc.select(network=net, station=sta, instrument=st.get_inst())
+        assert [s.get_id() for s in sel] == [st.get_id()]
+    assert len(sc.select(network='XX', station='NONE')) == 0
+
+    # The index follows changes to the collection
+    removed = sc.pop(0)
+    net, sta = removed.get_net_sta().split('.')
+    sel = sc.select(network=net, station=sta, instrument=removed.get_inst())
+    assert len(sel) == 0
+
+
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_StreamCollection()
     test_duplicates()
+    test_duplicates_from_other_stations()
     test_get_status()
+    test_grouping_and_select()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+# stdlib imports
+import os
+import shutil
+import tempfile
+
+# third party imports
+import numpy as np
+import pkg_resources
+
+# local imports
+from gmprocess.streamcollection import StreamCollection
+from gmprocess.io.read import read_data
+from gmprocess.io.test_utils import read_data_dir
+from gmprocess.io.fetch_utils import update_config
+from gmprocess.io.asdf.stream_workspace import StreamWorkspace
+from gmprocess.processing import process_streams
+from gmprocess.timing import StepTimer, TIMING_COLUMNS
+
+datapath = os.path.join('data', 'testdata')
+datadir = pkg_resources.resource_filename('gmprocess', datapath)
+
+
+def test_step_timer():
+    timer = StepTimer()
+    for station in ['NZ.HSES.HN', 'NZ.WTMC.HN']:
+        with timer.time('processing', station, 'detrend'):
+            np.cumsum(np.ones(100000))
+        with timer.time('processing', station, 'taper'):
+            pass
+    df = timer.to_dataframe()
+    assert list(df.columns) == TIMING_COLUMNS
+    assert len(df) == 4
+    assert np.all(df['WallTime'] >= 0)
+    assert np.all(df['CPUTime'] >= 0)
+
+    summary = timer.summarize()
+    assert list(summary['Step']) == ['detrend', 'taper']
+    assert list(summary['Count']) == [2, 2]
+    np.testing.assert_allclose(
+        summary['WallTime'].iloc[0],
+        df['WallTime'][df['Step'] == 'detrend'].sum())
+
+    # Records are kept when a step raises
+    try:
+        with timer.time('processing', '', 'bad_step'):
+            raise ValueError('bad step')
+    except ValueError:
+        pass
+    assert timer.records[-1][2] == 'bad_step'
+
+
+def test_processing_timings():
+    data_files, origin = read_data_dir('geonet', 'us1000778i', '*.V1A')
+    streams = []
+    for f in data_files:
+        streams += read_data(f)
+    sc = StreamCollection(streams)
+    config = update_config(os.path.join(datadir, 'config_min_freq_0p2.yml'))
+
+    timer = StepTimer()
+    process_streams(sc, origin, config=config, timer=timer)
+    df = timer.to_dataframe()
+    steps = [list(step.keys())[0] for step in config['processing']]
+    for step in steps:
+        assert step in set(df['Step'])
+    detrend = df[df['Step'] == 'detrend']
+    assert set(detrend['Station']) == set(st.get_id() for st in sc)
+
+    tdir = tempfile.mkdtemp()
+    try:
+        workspace = StreamWorkspace(os.path.join(tdir, 'workspace.h5'))
+        workspace.addEvent(origin)
+        workspace.addStreams(origin, sc, label='processed')
+        workspace.calcMetrics(origin.id, labels=['processed'], config=config,
+                              streams=sc, stream_label='processed',
+                              timer=timer)
+        assert 'metrics' in set(timer.to_dataframe()['Stage'])
+
+        assert workspace.getStepTimings(origin.id) is None
+        workspace.setStepTimings(origin.id, timer)
+        workspace.setStepTimings(origin.id, timer)
+        df = workspace.getStepTimings(origin.id)
+        assert df.equals(timer.to_dataframe())
+        summary = workspace.getStepTimings(origin.id, summarize=True)
+        assert summary.equals(timer.summarize())
+        workspace.close()
+    finally:
+        shutil.rmtree(tdir)
+
+
+if __name__ == '__main__':
+    os.environ['CALLED_FROM_PYTEST'] = 'True'
+    test_step_timer()
+    test_processing_timings()
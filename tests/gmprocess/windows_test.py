@@ -2,7 +2,8 @@
 
 from gmprocess.io.read import read_data
 from gmprocess.windows import (signal_split, signal_end,
-                               trim_multiple_events, cut)
+                               trim_multiple_events, cut,
+                               get_predicted_pga_dataframe)
 import pkg_resources
 import os
 import numpy as np
@@ -16,6 +17,11 @@ from gmprocess.event import get_event_object
 from gmprocess.phase import create_travel_time_dataframe
 from gmprocess import corner_frequencies
 from gmprocess.filtering import lowpass_filter, highpass_filter
+from gmprocess.models import load_model
+from openquake.hazardlib.gsim.base import (
+    SitesContext, RuptureContext, DistancesContext)
+from openquake.hazardlib import imt
+from obspy.geodetics.base import gps2dist_azimuth
 
 PICKER_CONFIG = get_config(section='pickers')
 
@@ -173,8 +179,46 @@ def test_trim_multiple_events():
             UTCDateTime('2019-07-06T03:20:38.7983Z'))
 
 
+def test_predicted_pga():
+    datapath = os.path.join('data', 'testdata', 'multiple_events')
+    datadir = pkg_resources.resource_filename('gmprocess', datapath)
+    sc = StreamCollection.from_directory(
+        os.path.join(datadir, 'ci38457511'))
+    df, catalog = create_travel_time_dataframe(
+        sc, os.path.join(datadir, 'catalog.csv'), 5, 0.1, 'iasp91')
+    pga_df = get_predicted_pga_dataframe(
+        sc, catalog, 'B14', {'vs30': 760}, {'rake': 0})
+    assert pga_df.shape == (len(catalog), len(sc))
+    assert list(pga_df.index) == [event.id for event in catalog]
+    assert set(pga_df.columns) == set(df.columns)
+
+    # Compare with the GMPE evaluated for single station/event pairs
+    gmpe = load_model('B14')
+    sx = SitesContext()
+    sx.vs30 = np.array([760])
+    for st in list(sc)[0:3]:
+        coords = st[0].stats.coordinates
+        sta_id = st[0].stats.network + '.' + st[0].stats.station
+        for event in catalog[0:3] + catalog[-3:]:
+            rx = RuptureContext()
+            rx.rake = 0
+            rx.mag = event.magnitude
+            dx = DistancesContext()
+            dx.repi = np.array([gps2dist_azimuth(
+                coords.latitude, coords.longitude,
+                event.latitude, event.longitude)[0] / 1000])
+            dx.rjb = dx.repi
+            dx.rhypo = np.sqrt(dx.repi**2 + event.depth_km**2)
+            dx.rrup = dx.rhypo
+            pga, sd = gmpe.get_mean_and_stddevs(sx, rx, dx, imt.PGA(), [])
+            np.testing.assert_allclose(
+                pga_df.loc[event.id, sta_id], 100 * np.exp(pga[0]),
+                rtol=0.01)
+
+
 if __name__ == '__main__':
     os.environ['CALLED_FROM_PYTEST'] = 'True'
     test_signal_split2()
     test_signal_end()
     test_trim_multiple_events()
+    test_predicted_pga()